@@ -0,0 +1,13 @@
+"""
+GEOPOLIS - Point d'entrée ASGI
+
+    uvicorn asgi:application --workers 4 --host 0.0.0.0 --port 5000
+
+L'application Flask (WSGI) est exécutée dans un pool de threads par asgiref.
+"""
+
+from asgiref.wsgi import WsgiToAsgi
+
+from wsgi import application as wsgi_application
+
+application = WsgiToAsgi(wsgi_application)
@@ -0,0 +1,551 @@
+"""
+Couche fournisseurs d'IA (LLM) : lots, concurrence, budget de tokens, cache
+
+    from backend.core.ai_manager import get_ai_manager
+    ai = get_ai_manager()
+    ai.analyze_texts(texts)                      # N textes -> ceil(N / AI_BATCH_SIZE) requêtes parallèles
+    ai.complete(prompt, provider='anthropic')
+
+Fournisseurs : `local` (stand-in déterministe, sans réseau, pour le
+développement et les tests hors ligne), `openai` et `anthropic` (API HTTP via
+requests). Les clés viennent de `config/plugins.json` (`api_keys`, rechargé à
+chaud) ou des variables d'environnement `OPENAI_API_KEY` / `ANTHROPIC_API_KEY` ;
+`ai_settings` choisit le fournisseur et les modèles par défaut.
+
+Chaque appel passe par :
+- le cache, indexé par l'empreinte (fournisseur, modèle, consignes, prompt) ;
+- le budget de tokens de la fenêtre courante (réservation estimée, puis
+  imputation de l'usage réel renvoyé par l'API) ;
+- un sémaphore limitant les appels simultanés au fournisseur.
+
+Plusieurs textes sont regroupés dans un même prompt (`AI_BATCH_SIZE` au plus,
+borné en tokens) et les lots partent en parallèle.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from .runtime import on_fork
+from .settings import get_store
+
+logger = logging.getLogger(__name__)
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
+DEFAULTS = {
+    'provider': 'local',
+    'max_concurrency': 4,
+    'batch_size': 10,
+    # Tokens (entrée + sortie) autorisés par fenêtre ; 0 = illimité
+    'token_budget': 200_000,
+    'budget_window': 3600,
+    'cache_ttl': 24 * 3600,
+    'cache_entries': 2048,
+    'timeout': 60
+}
+
+# Texte soumis tronqué au-delà (≈ 1000 tokens)
+MAX_TEXT_CHARS = 4000
+# Taille maximale estimée d'un prompt de lot
+MAX_BATCH_TOKENS = 12_000
+# Thèmes proposés si l'appelant n'en fournit pas
+DEFAULT_THEMES = ('geopolitique', 'economie', 'social', 'environnement', 'technologie', 'general')
+# Tokens de réponse réservés par texte d'un lot
+OUTPUT_TOKENS_PER_TEXT = 150
+
+ANALYSIS_SYSTEM = "Tu es un analyste en géopolitique. Tu réponds uniquement en JSON valide, sans texte autour."
+
+ANALYSIS_PROMPT = """Analyse chacun des textes numérotés ci-dessous. Réponds par un tableau JSON contenant,
+pour chaque texte, un objet :
+{{"index": <numéro>, "theme": "{themes}",
+"sentiment": {{"label": "positif|négatif|neutre", "score": 0-100}}, "risk_level": "low|medium|high",
+"keywords": ["..."], "summary": "une phrase"}}
+
+{items}"""
+
+CODE_REVIEW_PROMPT = """Voici un code Python et les problèmes détectés par l'analyse statique.
+Explique en français, brièvement, les corrections prioritaires et les améliorations de conception.
+
+Problèmes détectés :
+{findings}
+
+Code :
+```python
+{code}
+```"""
+
+ITEM_MARKER = re.compile(r'^### (\d+)\n(.*?)(?=^### \d+\n|\Z)', re.MULTILINE | re.DOTALL)
+WORD = re.compile(r'\w{5,}')
+SENTENCE_END = re.compile(r'(?<=[.!?])\s')
+
+
+def estimate_tokens(text):
+    """Estimation grossière (≈ 4 caractères par token), suffisante pour le budget"""
+    return len(text) // 4 + 1
+
+
+class ProviderError(Exception):
+    """Appel au fournisseur impossible ou refusé"""
+
+
+class BudgetExceeded(ProviderError):
+    """Budget de tokens de la fenêtre courante épuisé"""
+
+
+# ============================================
+# FOURNISSEURS
+# ============================================
+
+class Provider:
+    name = None
+    label = None
+
+    def __init__(self, model=None, api_key=None, timeout=DEFAULTS['timeout']):
+        self.model = model
+        self.api_key = api_key
+        self.timeout = timeout
+
+    @property
+    def available(self):
+        return bool(self.api_key) and requests is not None
+
+    def complete(self, prompt, system=None, max_tokens=1024):
+        """Retourne `{'text', 'input_tokens', 'output_tokens'}`"""
+        raise NotImplementedError
+
+    def _post(self, url, headers, body):
+        if not self.available:
+            raise ProviderError(f"{self.label} non configuré (clé API manquante)")
+        try:
+            response = requests.post(url, headers=headers, json=body, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            raise ProviderError(f"{self.label}: {e}")
+        if response.status_code != 200:
+            raise ProviderError(f"{self.label}: HTTP {response.status_code} {response.text[:200]}")
+        return response.json()
+
+
+class LocalProvider(Provider):
+    """
+    Stand-in déterministe : même prompt, même réponse, sans réseau. Les lots
+    d'analyse reçoivent un tableau JSON au format attendu (résumé extractif et
+    mots fréquents), les autres prompts un résumé de leur début.
+    """
+    name = 'local'
+    label = 'Analyse Locale'
+
+    def __init__(self, **kwargs):
+        super().__init__(model='stub', **kwargs)
+
+    @property
+    def available(self):
+        return True
+
+    @staticmethod
+    def _summary(text):
+        return SENTENCE_END.split(text.strip(), 1)[0][:200]
+
+    def complete(self, prompt, system=None, max_tokens=1024):
+        items = ITEM_MARKER.findall(prompt)
+        if items:
+            text = json.dumps([
+                {
+                    'index': int(index),
+                    'summary': self._summary(body),
+                    'keywords': [word for word, _ in Counter(WORD.findall(body.lower())).most_common(5)]
+                }
+                for index, body in items
+            ], ensure_ascii=False)
+        else:
+            text = f"[local] {self._summary(prompt)}"
+        return {'text': text, 'input_tokens': estimate_tokens(prompt), 'output_tokens': estimate_tokens(text)}
+
+
+class OpenAIProvider(Provider):
+    name = 'openai'
+    label = 'OpenAI'
+    url = 'https://api.openai.com/v1/chat/completions'
+
+    def complete(self, prompt, system=None, max_tokens=1024):
+        messages = ([{'role': 'system', 'content': system}] if system else []) + [{'role': 'user', 'content': prompt}]
+        data = self._post(
+            self.url,
+            {'Authorization': f"Bearer {self.api_key}"},
+            {'model': self.model, 'messages': messages, 'max_tokens': max_tokens, 'temperature': 0}
+        )
+        usage = data.get('usage', {})
+        return {
+            'text': data['choices'][0]['message']['content'],
+            'input_tokens': usage.get('prompt_tokens', estimate_tokens(prompt)),
+            'output_tokens': usage.get('completion_tokens', 0)
+        }
+
+
+class AnthropicProvider(Provider):
+    name = 'anthropic'
+    label = 'Anthropic'
+    url = 'https://api.anthropic.com/v1/messages'
+
+    def complete(self, prompt, system=None, max_tokens=1024):
+        body = {'model': self.model, 'max_tokens': max_tokens, 'messages': [{'role': 'user', 'content': prompt}]}
+        if system:
+            body['system'] = system
+        data = self._post(
+            self.url,
+            {'x-api-key': self.api_key, 'anthropic-version': '2023-06-01'},
+            body
+        )
+        usage = data.get('usage', {})
+        return {
+            'text': ''.join(block.get('text', '') for block in data.get('content', []) if block.get('type') == 'text'),
+            'input_tokens': usage.get('input_tokens', estimate_tokens(prompt)),
+            'output_tokens': usage.get('output_tokens', 0)
+        }
+
+
+# (classe, variable d'environnement de la clé, modèle par défaut)
+PROVIDERS = {
+    'local': (LocalProvider, None, None),
+    'openai': (OpenAIProvider, 'OPENAI_API_KEY', 'gpt-4o-mini'),
+    'anthropic': (AnthropicProvider, 'ANTHROPIC_API_KEY', 'claude-3-5-haiku-latest')
+}
+
+
+# ============================================
+# BUDGET ET CACHE
+# ============================================
+
+class TokenBudget:
+    """Tokens consommés par fenêtre fixe ; les appels en vol sont réservés d'avance"""
+
+    def __init__(self, limit, window):
+        self.limit = limit
+        self.window = window
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self.used = 0
+        self.reserved = 0
+
+    def _roll(self):
+        if time.monotonic() - self._window_start >= self.window:
+            self._window_start = time.monotonic()
+            self.used = 0
+
+    def reserve(self, tokens):
+        with self._lock:
+            self._roll()
+            if self.limit and self.used + self.reserved + tokens > self.limit:
+                raise BudgetExceeded(
+                    f"Budget de tokens épuisé ({self.used}/{self.limit}, "
+                    f"renouvelé dans {int(self.window - (time.monotonic() - self._window_start))} s)"
+                )
+            self.reserved += tokens
+
+    def commit(self, reserved, used):
+        with self._lock:
+            self.reserved -= reserved
+            self._roll()
+            self.used += used
+
+    def stats(self):
+        with self._lock:
+            self._roll()
+            return {'limit': self.limit, 'used': self.used, 'reserved': self.reserved, 'window': self.window}
+
+    def reset(self):
+        self._lock = threading.Lock()
+        self.reserved = 0
+
+
+class PromptCache:
+    """LRU à expiration des réponses, indexé par empreinte de prompt"""
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def make_key(provider, model, system, max_tokens, prompt):
+        raw = json.dumps([provider, model, system, max_tokens, prompt], ensure_ascii=False)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries)}
+
+    def reset(self):
+        self._lock = threading.Lock()
+
+
+# ============================================
+# GESTIONNAIRE
+# ============================================
+
+class AIManager:
+    """Point d'entrée unique des appels LLM du processus"""
+
+    def __init__(self, options=None, settings_store=None):
+        self.options = dict(DEFAULTS, **(options or {}))
+        self.budget = TokenBudget(self.options['token_budget'], self.options['budget_window'])
+        self.cache = PromptCache(self.options['cache_entries'], self.options['cache_ttl'])
+        self._store = settings_store
+        self._providers = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        self._semaphore = threading.BoundedSemaphore(self.options['max_concurrency'])
+        self.counters = {'requests': 0, 'cache_hits': 0, 'errors': 0, 'batches': 0, 'input_tokens': 0, 'output_tokens': 0}
+        if settings_store is not None:
+            settings_store.subscribe(lambda settings: self._reset_providers())
+
+    # --- fournisseurs ---
+
+    def _settings(self):
+        return self._store.get() if self._store is not None else {}
+
+    def _reset_providers(self):
+        # Clés ou modèles modifiés dans config/plugins.json
+        with self._lock:
+            self._providers = {}
+
+    def _build_provider(self, name):
+        cls, key_env, default_model = PROVIDERS[name]
+        if name == 'local':
+            return cls(timeout=self.options['timeout'])
+        settings = self._settings()
+        ai_settings = settings.get('ai_settings', {})
+        api_key = (settings.get('api_keys') or {}).get(name) or os.environ.get(key_env)
+        # `model` (réglage historique) s'applique au fournisseur par défaut
+        model = (
+            ai_settings.get(f"{name}_model")
+            or (ai_settings.get('model') if ai_settings.get('provider') == name else None)
+            or os.environ.get(f"{name.upper()}_MODEL")
+            or default_model
+        )
+        return cls(model=model, api_key=api_key, timeout=self.options['timeout'])
+
+    def get_provider(self, name=None):
+        name = name or self.default_provider
+        if name not in PROVIDERS:
+            raise ProviderError(f"Fournisseur inconnu: {name}")
+        provider = self._providers.get(name)
+        if provider is None:
+            with self._lock:
+                provider = self._providers.setdefault(name, self._build_provider(name))
+        return provider
+
+    @property
+    def default_provider(self):
+        return self._settings().get('ai_settings', {}).get('provider') or self.options['provider']
+
+    def providers(self):
+        """État des fournisseurs (sans les clés)"""
+        result = {}
+        for name in PROVIDERS:
+            provider = self.get_provider(name)
+            result[name] = {'name': provider.label, 'available': provider.available, 'model': provider.model}
+        return result
+
+    # --- appels ---
+
+    def complete(self, prompt, provider=None, system=None, max_tokens=1024):
+        """Texte de la réponse ; cache, budget et limite de concurrence appliqués"""
+        provider = self.get_provider(provider)
+        key = self.cache.make_key(provider.name, provider.model, system, max_tokens, prompt)
+        cached = self.cache.get(key)
+        if cached is not None:
+            with self._lock:
+                self.counters['cache_hits'] += 1
+            return cached
+
+        # Le stand-in local ne consomme pas de budget
+        estimate = 0 if provider.name == 'local' else estimate_tokens((system or '') + prompt) + max_tokens
+        self.budget.reserve(estimate)
+        used = 0
+        try:
+            with self._semaphore:
+                completion = provider.complete(prompt, system=system, max_tokens=max_tokens)
+            if provider.name != 'local':
+                used = completion['input_tokens'] + completion['output_tokens']
+            with self._lock:
+                self.counters['requests'] += 1
+                self.counters['input_tokens'] += completion['input_tokens']
+                self.counters['output_tokens'] += completion['output_tokens']
+        except Exception:
+            with self._lock:
+                self.counters['errors'] += 1
+            raise
+        finally:
+            self.budget.commit(estimate, used)
+
+        self.cache.set(key, completion['text'])
+        return completion['text']
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.options['max_concurrency'], thread_name_prefix='ai')
+        return self._executor
+
+    def complete_many(self, prompts, provider=None, system=None, max_tokens=1024):
+        """Réponses dans l'ordre des prompts, envoyées en parallèle ; une erreur donne l'exception à sa place"""
+        if len(prompts) == 1:
+            futures = None
+            calls = [lambda: self.complete(prompts[0], provider, system, max_tokens)]
+        else:
+            executor = self._get_executor()
+            futures = [executor.submit(self.complete, prompt, provider, system, max_tokens) for prompt in prompts]
+            calls = [future.result for future in futures]
+        results = []
+        for call in calls:
+            try:
+                results.append(call())
+            except Exception as e:
+                results.append(e)
+        return results
+
+    # --- analyses ---
+
+    def _batches(self, texts):
+        """Indices des textes groupés par lot (nombre et taille estimée bornés)"""
+        batch, tokens = [], 0
+        for index, text in enumerate(texts):
+            size = estimate_tokens(text)
+            if batch and (len(batch) >= self.options['batch_size'] or tokens + size > MAX_BATCH_TOKENS):
+                yield batch
+                batch, tokens = [], 0
+            batch.append(index)
+            tokens += size
+        if batch:
+            yield batch
+
+    def analyze_texts(self, texts, provider=None, themes=DEFAULT_THEMES):
+        """
+        Analyse IA de plusieurs textes ; retourne une liste alignée sur `texts`
+        (dict par texte, None si le lot a échoué ou si la réponse est illisible)
+        """
+        texts = [(text or '')[:MAX_TEXT_CHARS] for text in texts]
+        batches = list(self._batches(texts))
+        prompts = [
+            ANALYSIS_PROMPT.format(themes='|'.join(themes), items='\n\n'.join(f"### {position}\n{texts[index]}" for position, index in enumerate(batch, 1)))
+            for batch in batches
+        ]
+        with self._lock:
+            self.counters['batches'] += len(batches)
+
+        replies = self.complete_many(
+            prompts, provider=provider, system=ANALYSIS_SYSTEM,
+            max_tokens=max(256, OUTPUT_TOKENS_PER_TEXT * self.options['batch_size'])
+        )
+        results = [None] * len(texts)
+        for batch, reply in zip(batches, replies):
+            if isinstance(reply, Exception):
+                logger.warning(f"[!] Lot IA en echec ({len(batch)} textes): {reply}")
+                continue
+            for item in _parse_items(reply):
+                position = item.pop('index', None)
+                if isinstance(position, int) and 1 <= position <= len(batch):
+                    results[batch[position - 1]] = item
+        return results
+
+    def analyze_text(self, text, provider=None, themes=DEFAULT_THEMES):
+        return self.analyze_texts([text], provider, themes)[0]
+
+    def review_code(self, code, findings, provider=None):
+        """Commentaire rédigé par le fournisseur sur un code déjà analysé localement"""
+        lines = '\n'.join(f"- ligne {issue['line']} : {issue['message']}" for issue in findings[:50]) or '- aucun'
+        return self.complete(CODE_REVIEW_PROMPT.format(findings=lines, code=code[:MAX_TEXT_CHARS * 3]), provider=provider, max_tokens=800)
+
+    def status(self):
+        with self._lock:
+            counters = dict(self.counters)
+        return {
+            'default_provider': self.default_provider,
+            'providers': self.providers(),
+            'budget': self.budget.stats(),
+            'cache': self.cache.stats(),
+            'counters': counters
+        }
+
+    def reset(self):
+        # Après fork : threads, verrous et sémaphore ne sont pas hérités utilisables
+        self._lock = threading.Lock()
+        self._executor = None
+        self._semaphore = threading.BoundedSemaphore(self.options['max_concurrency'])
+        self.budget.reset()
+        self.cache.reset()
+
+
+def _parse_items(reply):
+    """Objets du tableau JSON de la réponse (tolère le texte ou les balises autour)"""
+    start, end = reply.find('['), reply.rfind(']')
+    if start < 0 or end <= start:
+        return []
+    try:
+        items = json.loads(reply[start:end + 1])
+    except ValueError:
+        return []
+    return [item for item in items if isinstance(item, dict)]
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_ai_manager(config=None):
+    """Gestionnaire partagé du processus (options `AI_*` de la configuration de l'app)"""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                if config is None:
+                    try:
+                        from flask import current_app
+                        config = dict(current_app.config)
+                    except RuntimeError:
+                        config = {}
+                options = {
+                    key: config[f"AI_{key.upper()}"] for key in DEFAULTS
+                    if config.get(f"AI_{key.upper()}") is not None
+                }
+                _manager = AIManager(options, get_store())
+    return _manager
+
+
+@on_fork
+def _reset_after_fork():
+    global _manager_lock
+    _manager_lock = threading.Lock()
+    if _manager is not None:
+        _manager.reset()
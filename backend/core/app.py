@@ -1,86 +1,75 @@
-# === GEOPOLIS PLUGIN MONITOR AUTOSTART ===
-try:
-    from plugin_monitor import start_plugin_monitor_delayed
-    import threading, os, json
-    repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..'))
-    cfg_path = os.path.join(repo_root, 'services.json')
-    try:
-        with open(cfg_path, 'r', encoding='utf-8') as _f:
-            _cfg = json.load(_f)
-    except Exception:
-        _cfg = {}
-    max_wait = 0
-    for k,v in _cfg.items():
-        if isinstance(v, dict) and not k.startswith('_'):
-            try:
-                max_wait = max(max_wait, int(v.get('start_timeout_seconds', 300)))
-            except Exception:
-                pass
-    if max_wait <= 0:
-        max_wait = 300
-    t = threading.Thread(target=lambda: start_plugin_monitor_delayed(max_wait_seconds=max_wait, poll_interval=_cfg.get('_monitor', {}).get('check_interval_seconds', 5)), daemon=True)
-    t.start()
-except Exception as _e:
-    print('Failed to start PluginMonitor (delayed):', _e)
-# === END GEOPOLIS PLUGIN MONITOR AUTOSTART ===
-
-
 """
-GEOPOLIS v1.20.13 - Architecture Unifiée et Robuste
+GEOPOLIS v3.0 - Fabrique de l'application
 Un seul serveur Flask avec frontend Single Page Application unifié
+
+    from backend.core.app import create_app
+    app = create_app({'DEBUG': True})
+
+Rien n'est créé à l'import : ni application, ni fichiers de log, ni dossiers.
+Les blueprints sont enregistrés par `create_app` ; leurs modules de routes
+restent légers, les dépendances lourdes (feedparser, requests, code des
+plugins) n'étant importées qu'au premier appel qui en a besoin.
 """
 
-from flask import Flask, send_from_directory, jsonify, request
-from flask_cors import CORS
-import os
-import sys
+import importlib
 import logging
+import os
 from pathlib import Path
 
-# Force UTF-8 sur Windows
-if sys.platform == 'win32':
-    import codecs
-    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'strict')
-    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'strict')
+from flask import Blueprint, Flask, current_app, jsonify, request, send_from_directory
 
-# Configuration logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
-    handlers=[
-        logging.FileHandler('logs/geopolis.log', encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
-# Création structure
-for folder in ['logs', 'db', 'data', 'config', 'frontend', 'backend/modules']:
-    Path(folder).mkdir(parents=True, exist_ok=True)
+BASE_DIR = Path(__file__).resolve().parents[2]
 
-# Initialisation Flask
-app = Flask(__name__, static_folder='frontend', static_url_path='')
-CORS(app)  # Permet AJAX depuis le frontend
+VERSION = '3.0.0'
 
-app.config.update(
-    SECRET_KEY=os.environ.get('SECRET_KEY', 'geopolis-secret-key-change-me'),
-    JSON_AS_ASCII=False,
-    MAX_CONTENT_LENGTH=16 * 1024 * 1024
-)
+DEFAULT_CONFIG = {
+    'SECRET_KEY': os.environ.get('SECRET_KEY', 'geopolis-secret-key-change-me'),
+    'JSON_AS_ASCII': False,
+    'MAX_CONTENT_LENGTH': 16 * 1024 * 1024,
+    'LOG_DIR': 'logs',
+    'DB_DIR': 'db',
+    'LOG_LEVEL': os.environ.get('LOG_LEVEL', 'INFO'),
+    # Dossiers créés au démarrage (et non plus à l'import)
+    'RUNTIME_DIRS': ['logs', 'db', 'data', 'config'],
+    # None = tous les modules de MODULES
+    'ENABLED_MODULES': None,
+    # Jeton exigé par /api/profiling (sans jeton : fermé, sauf requête locale en debug)
+    'PROFILE_TOKEN': os.environ.get('PROFILE_TOKEN'),
+    # Flux /api/events simultanés par processus (0 = automatique : THREADS / 2 sous gthread)
+    'EVENTS_MAX_STREAMS': int(os.environ.get('EVENTS_MAX_STREAMS', 0)),
+    # Exécution du code du tuteur (/api/tuteur/run) : désactivée par défaut ; jeton
+    # exigé (en-tête X-Geopolis-Sandbox-Token), sauf requête locale en debug
+    'SANDBOX_ENABLED': os.environ.get('SANDBOX_ENABLED', 'False').lower() == 'true',
+    'SANDBOX_TOKEN': os.environ.get('SANDBOX_TOKEN'),
+    # Workers confinés (voir tuteur_ia/sandbox.py) et limites par exécution
+    'SANDBOX_WORKERS': int(os.environ.get('SANDBOX_WORKERS', 2)),
+    'SANDBOX_CPU_SECONDS': 2,
+    'SANDBOX_MEMORY_MB': 256,
+    'SANDBOX_WALL_SECONDS': 5.0,
+    # Fournisseurs LLM (backend/core/ai_manager.py) ; `local` = stand-in hors ligne
+    'AI_PROVIDER': os.environ.get('AI_PROVIDER', 'local'),
+    'AI_MAX_CONCURRENCY': 4,
+    'AI_BATCH_SIZE': 10,
+    # Tokens par heure, 0 = illimité
+    'AI_TOKEN_BUDGET': int(os.environ.get('AI_TOKEN_BUDGET', 200_000)),
+    'AI_CACHE_TTL': 24 * 3600
+}
 
-# ============================================
-# ROUTE PRINCIPALE : SERVE SPA
-# ============================================
+# (nom, module de routes, préfixe d'URL, libellé)
+MODULES = [
+    ('analyse_thematique', 'backend.modules.analyse_thematique.routes', '/api/analyse', 'Analyse Thematique'),
+    ('tuteur_ia', 'backend.modules.tuteur_ia.routes', '/api/tuteur', 'Tuteur IA'),
+    ('plugins', 'backend.modules.plugins.routes', '/api/plugins', 'Plugins')
+]
 
-@app.route('/')
-def serve_spa():
-    """Sert la Single Page Application"""
-    index_path = Path('frontend/index.html')
-    if index_path.exists():
-        return send_from_directory('frontend', 'index.html')
-    
-    # Fallback: créer index.html minimal
-    return """
+# Blueprints techniques (santé, événements, profilage), distincts des modules fonctionnels
+SERVICE_BLUEPRINTS = ('health', 'events', 'profiling')
+
+bp = Blueprint('core', __name__)
+
+SETUP_PAGE = """
     <!DOCTYPE html>
     <html lang="fr">
     <head>
@@ -132,151 +121,174 @@ def serve_spa():
         </script>
     </body>
     </html>
-    """
+"""
+
+# ============================================
+# ROUTE PRINCIPALE : SERVE SPA
+# ============================================
+
+@bp.route('/')
+def serve_spa():
+    """Sert la Single Page Application (version construite si disponible)"""
+    from .assets import index_folder
+    folder = index_folder(current_app.static_folder)
+    if (folder / 'index.html').exists():
+        response = send_from_directory(folder, 'index.html')
+        # Toujours revalidé : c'est lui qui référence les bundles empreintés
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    
+    # Fallback: page de configuration minimale
+    return SETUP_PAGE
+
+@bp.route('/dist/<path:filename>')
+def serve_bundle(filename):
+    """Bundles empreintés : précompressés et cache immuable"""
+    from .assets import DIST_DIR, send_asset
+    return send_asset(Path(current_app.static_folder) / DIST_DIR, filename)
 
 # ============================================
 # API CORE
 # ============================================
 
-@app.route('/api/health')
-def api_health():
-    """Health check"""
-    return jsonify({
-        'status': 'ok',
-        'version': '3.0.0',
-        'timestamp': Path('logs/geopolis.log').stat().st_mtime if Path('logs/geopolis.log').exists() else 0
-    })
+@bp.route('/api/status')
+def api_status():
+    """Sonde utilisée par start_all.sh et server.js"""
+    return jsonify({'status': 'ok'}), 200
 
-@app.route('/api/info')
+@bp.route('/api/info')
 def api_info():
     """Informations système"""
-    blueprints_loaded = [bp for bp in app.blueprints.keys() if bp != 'static']
+    blueprints_loaded = [name for name in current_app.blueprints.keys() if name not in ('static', 'core', *SERVICE_BLUEPRINTS)]
+    services = [name for name in current_app.blueprints.keys() if name in SERVICE_BLUEPRINTS]
     
     return jsonify({
         'name': 'GEOPOLIS',
-        'version': '3.0.0',
+        'version': VERSION,
         'architecture': 'Unified Flask + SPA',
         'modules_loaded': blueprints_loaded,
+        'services': services,
         'status': 'operational'
     })
 
-@app.route('/api/setup/frontend', methods=['POST'])
+@bp.route('/api/setup/frontend', methods=['POST'])
 def api_setup_frontend():
     """Génère le frontend unifié automatiquement"""
     try:
         from backend.core.frontend_generator import generate_frontend
-        generate_frontend()
-        return jsonify({'success': True, 'message': 'Frontend généré'})
+        manifest = generate_frontend(current_app.static_folder)
+        return jsonify({
+            'success': True,
+            'message': f"Frontend généré ({len(manifest['changed'])} fichier(s) modifié(s))",
+            'manifest': manifest
+        })
     except Exception as e:
         logger.error(f"Erreur génération frontend: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
-# ============================================
-# CHARGEMENT DES MODULES
-# ============================================
-
-def load_modules():
-    """Charge tous les modules (Blueprints)"""
-    modules_loaded = []
-    
-    # 1. Analyse Thématique
-    try:
-        from backend.modules.analyse_thematique.routes import bp as analyse_bp
-        app.register_blueprint(analyse_bp, url_prefix='/api/analyse')
-        modules_loaded.append('analyse_thematique')
-        logger.info("[OK] Module Analyse Thematique charge")
-    except ImportError as e:
-        logger.warning(f"[SKIP] Analyse Thematique: {e}")
-    except Exception as e:
-        logger.error(f"[ERREUR] Analyse Thematique: {e}")
-    
-    # 2. Tuteur IA
-    try:
-        from backend.modules.tuteur_ia.routes import bp as tuteur_bp
-        app.register_blueprint(tuteur_bp, url_prefix='/api/tuteur')
-        modules_loaded.append('tuteur_ia')
-        logger.info("[OK] Module Tuteur IA charge")
-    except ImportError as e:
-        logger.warning(f"[SKIP] Tuteur IA: {e}")
-    except Exception as e:
-        logger.error(f"[ERREUR] Tuteur IA: {e}")
-    
-    # 3. Plugins
-    try:
-        from backend.modules.plugins.routes import bp as plugins_bp
-        app.register_blueprint(plugins_bp, url_prefix='/api/plugins')
-        modules_loaded.append('plugins')
-        logger.info("[OK] Module Plugins charge")
-    except ImportError as e:
-        logger.warning(f"[SKIP] Plugins: {e}")
-    except Exception as e:
-        logger.error(f"[ERREUR] Plugins: {e}")
-    
-    return modules_loaded
-
 # ============================================
 # GESTION ERREURS
 # ============================================
 
-@app.errorhandler(404)
 def not_found(e):
     if request.path.startswith('/api/'):
         return jsonify({'error': 'Endpoint non trouve', 'path': request.path}), 404
+    if request.path.startswith('/dist/'):
+        # Bundle disparu : surtout pas la SPA, qui serait interprétée comme du JS
+        return 'Not Found', 404
     # Rediriger vers SPA pour le routing côté client
     return serve_spa()
 
-@app.errorhandler(500)
 def server_error(e):
     logger.error(f"Erreur 500: {e}", exc_info=True)
     if request.path.startswith('/api/'):
         return jsonify({'error': 'Erreur serveur', 'details': str(e)}), 500
     return jsonify({'error': str(e)}), 500
 
+# ============================================
+# CHARGEMENT DES MODULES
+# ============================================
+
+def register_modules(app):
+    """Enregistre les blueprints des modules activés"""
+    enabled = app.config.get('ENABLED_MODULES')
+    modules_loaded = []
+    
+    for name, import_path, url_prefix, label in MODULES:
+        if enabled is not None and name not in enabled:
+            continue
+        try:
+            module = importlib.import_module(import_path)
+            app.register_blueprint(module.bp, url_prefix=url_prefix)
+            modules_loaded.append(name)
+            logger.info(f"[OK] Module {label} charge")
+        except ImportError as e:
+            logger.warning(f"[SKIP] {label}: {e}")
+        except Exception as e:
+            logger.error(f"[ERREUR] {label}: {e}")
+    
+    return modules_loaded
+
 # ============================================
 # INITIALISATION
 # ============================================
 
-def initialize():
-    """Initialise l'application"""
+def create_app(config=None):
+    """Construit une application GEOPOLIS ; `config` surcharge DEFAULT_CONFIG"""
+    app = Flask(
+        __name__,
+        root_path=str(BASE_DIR),
+        static_folder=str(BASE_DIR / 'frontend'),
+        static_url_path=''
+    )
+    app.config.update(DEFAULT_CONFIG)
+    if config:
+        app.config.update(config)
+    
+    for folder in app.config['RUNTIME_DIRS']:
+        Path(folder).mkdir(parents=True, exist_ok=True)
+    
+    from .logs import configure_logging
+    configure_logging(app.config)
+    
+    from flask_cors import CORS
+    CORS(app)  # Permet AJAX depuis le frontend
+    
     logger.info("=" * 60)
     logger.info("GEOPOLIS v3.0 - Architecture Unifiee")
     logger.info("=" * 60)
     
-    # Charger les modules
-    modules = load_modules()
+    from .metrics import init_metrics
+    init_metrics(app)
+    
+    from .profiling import init_profiling
+    init_profiling(app)
+    
+    from .responses import init_conditional_get
+    init_conditional_get(app)
+    
+    from .events import init_events
+    init_events(app)
+    
+    from .health import bp as health_bp
+    from .events import bp as events_bp
+    app.register_blueprint(bp)
+    app.register_blueprint(health_bp, url_prefix='/api/health')
+    app.register_blueprint(events_bp, url_prefix='/api/events')
+    app.register_error_handler(404, not_found)
+    app.register_error_handler(500, server_error)
+    
+    modules = register_modules(app)
     logger.info(f"[+] Modules charges: {len(modules)}")
     
-    # Vérifier le frontend
-    if not Path('frontend/index.html').exists():
+    # Vérifier le frontend ; les bundles sont construits une fois avant le
+    # démarrage (backend.core.assets), pas ici : create_app tourne dans chaque worker
+    if not (Path(app.static_folder) / 'index.html').exists():
         logger.warning("[!] Frontend non configure - Utilisez /api/setup/frontend")
     else:
         logger.info("[OK] Frontend detecte")
     
-    logger.info("=" * 60)
     logger.info("[OK] Initialisation terminee")
     logger.info("=" * 60)
-
-# ============================================
-# POINT D'ENTRÉE
-# ============================================
-
-if __name__ == '__main__':
-    initialize()
-    
-    host = os.environ.get('HOST', '127.0.0.1')
-    port = int(os.environ.get('PORT', 5000))
-    debug = os.environ.get('DEBUG', 'True').lower() == 'true'
-    
-    logger.info(f"[+] Serveur demarre sur http://{host}:{port}")
-    logger.info("=" * 60)
     
-    app.run(host=host, port=port, debug=debug, use_reloader=False)
-
-# === Added by integration for GEOPOLIS unified service ===
-from flask import jsonify
-
-@app.route('/api/status')
-def api_status():
-    return jsonify({"status": "ok"}), 200
-# === End integration ===
-
+    return app
@@ -0,0 +1,303 @@
+"""
+Pipeline des assets du frontend : bundles minifiés, empreintés et précompressés
+
+`build_assets()` concatène les sources JS et CSS (dans l'ordre de BUNDLES),
+les minifie, les écrit sous `frontend/dist/<nom>.<empreinte>.<ext>` avec leurs
+variantes `.gz` (et `.br` si le paquet brotli est installé), puis écrit
+`frontend/dist/index.html` : `index.html` dont les blocs `<!-- build:... -->`
+pointent vers ces fichiers. Le `index.html` suivi par git n'est jamais
+modifié (il référence les sources et fonctionne sans construction) ; la SPA
+sert la version construite quand elle existe.
+
+La construction a lieu une fois par déploiement, pas dans chaque worker :
+
+    python -m backend.core.assets
+
+(lancé aussi par le hook `on_starting` de gunicorn.conf.py, dans le maître,
+et par les points d'entrée mono-processus `app.py` et `wsgi.py`).
+
+Les bundles sont servis par `/dist/...` avec `Cache-Control: immutable` :
+leur nom change avec leur contenu, le navigateur ne les revalide jamais.
+
+Toutes les écritures passent par `write_if_changed` : comparaison du contenu,
+puis fichier temporaire + `os.replace` (un client ne lit jamais un fichier
+à moitié écrit).
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from flask import request, send_from_directory
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+DIST_DIR = 'dist'
+MANIFEST = 'manifest.json'
+INDEX = 'index.html'
+
+# Bundle -> sources (relatives à frontend/), dans l'ordre d'exécution
+BUNDLES = {
+    'css': ('styles', ['css/styles.css']),
+    'js': ('app', [
+        'js/api.js',
+        'js/views/dashboard.js',
+        'js/views/analyse.js',
+        'js/views/tuteur.js',
+        'js/views/plugins.js',
+        'js/views/settings.js',
+        'js/app.js'
+    ])
+}
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+BUILD_BLOCK = re.compile(r'(<!-- build:(css|js) -->\r?\n)(.*?)(\s*<!-- endbuild -->)', re.DOTALL)
+
+
+# ============================================
+# ÉCRITURE INCRÉMENTALE
+# ============================================
+
+def write_if_changed(path, content):
+    """
+    Écrit `content` (str ou bytes) de façon atomique s'il diffère du fichier
+    existant ; retourne `(sha256, écrit)`. Un texte reprend les fins de ligne
+    du fichier existant (CRLF sous Windows), sinon celles de la plateforme.
+    """
+    path = Path(path)
+    try:
+        current = path.read_bytes()
+    except FileNotFoundError:
+        current = None
+
+    if isinstance(content, str):
+        newline = '\r\n' if (current is not None and b'\r\n' in current) or (current is None and os.linesep == '\r\n') else '\n'
+        content = content.replace('\r\n', '\n').replace('\n', newline).encode('utf-8')
+
+    digest = hashlib.sha256(content).hexdigest()
+    if current is not None and hashlib.sha256(current).hexdigest() == digest:
+        return digest, False
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return digest, True
+
+
+# ============================================
+# MINIFICATION
+# ============================================
+
+def minify_js(source):
+    """rjsmin si disponible ; sinon retire indentation, lignes vides et commentaires de ligne"""
+    if rjsmin is not None:
+        return rjsmin.jsmin(source)
+    lines = []
+    for line in source.splitlines():
+        stripped = line.strip()
+        # Seuls les commentaires occupant toute la ligne sont retirés (sûr hors chaînes)
+        if not stripped or stripped.startswith('//'):
+            continue
+        lines.append(stripped)
+    return '\n'.join(lines)
+
+
+def minify_css(source):
+    if rcssmin is not None:
+        return rcssmin.cssmin(source)
+    source = re.sub(r'/\*.*?\*/', '', source, flags=re.DOTALL)
+    source = re.sub(r'\s+', ' ', source)
+    source = re.sub(r'\s*([{};,>])\s*', r'\1', source)
+    source = re.sub(r':\s+', ':', source)
+    return source.replace(';}', '}').strip()
+
+
+MINIFIERS = {'css': minify_css, 'js': minify_js}
+
+
+# ============================================
+# CONSTRUCTION
+# ============================================
+
+def _compressed_variants(data):
+    variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(data, quality=11)
+    return variants
+
+
+def _render_tags(kind, filename):
+    url = f"/{DIST_DIR}/{filename}"
+    if kind == 'css':
+        return f'    <link rel="stylesheet" href="{url}">'
+    return f'    <script src="{url}"></script>'
+
+
+def rewrite_index(index_html, manifest):
+    """Remplace le contenu des blocs `<!-- build:css|js -->` par les bundles"""
+    def replace(match):
+        opening, kind, _, closing = match.groups()
+        return opening + _render_tags(kind, manifest['bundles'][kind]) + closing
+    return BUILD_BLOCK.sub(replace, index_html)
+
+
+def build_assets(frontend_dir='frontend'):
+    """
+    Construit les bundles et `dist/index.html` ; retourne le manifeste, avec
+    `written` = fichiers réellement écrits
+    """
+    frontend_dir = Path(frontend_dir)
+    dist_dir = frontend_dir / DIST_DIR
+    dist_dir.mkdir(parents=True, exist_ok=True)
+
+    previous = load_manifest(frontend_dir) or {}
+    manifest = {'bundles': {}, 'sources': {}}
+    written = []
+
+    for kind, (name, sources) in BUNDLES.items():
+        parts = []
+        for source in sources:
+            raw = (frontend_dir / source).read_bytes()
+            manifest['sources'][source] = hashlib.sha256(raw).hexdigest()[:16]
+            parts.append(raw.decode('utf-8'))
+        # ';' protège la jonction de deux scripts sans point-virgule final
+        joined = ';\n'.join(parts) if kind == 'js' else '\n'.join(parts)
+        data = MINIFIERS[kind](joined).encode('utf-8')
+
+        filename = f"{name}.{hashlib.sha256(data).hexdigest()[:12]}.{kind}"
+        manifest['bundles'][kind] = filename
+        target = dist_dir / filename
+        # Nom = empreinte du contenu : un fichier présent est forcément à jour
+        if not target.exists():
+            for suffix, blob in _compressed_variants(data).items():
+                write_if_changed(f"{target}{suffix}", blob)
+            write_if_changed(target, data)
+            written.append(f"{DIST_DIR}/{filename}")
+            logger.info(f"[OK] Bundle {filename} ({len(data)} octets)")
+
+    # Les bundles de la génération précédente restent servis aux pages déjà ouvertes
+    current = set(manifest['bundles'].values())
+    before = set(previous.get('bundles', {}).values())
+    manifest['previous'] = sorted((before - current) if before != current else previous.get('previous', []))
+    keep = current | set(manifest['previous'])
+    for path in dist_dir.iterdir():
+        base = path.name[:-len(path.suffix)] if path.suffix in ('.gz', '.br') else path.name
+        if path.name not in (MANIFEST, INDEX) and not path.name.startswith('.') and base not in keep:
+            path.unlink()
+
+    index_path = frontend_dir / INDEX
+    if index_path.exists():
+        # Octets bruts : les fins de ligne du fichier (CRLF) sont conservées
+        raw = index_path.read_bytes()
+        manifest['sources'][INDEX] = hashlib.sha256(raw).hexdigest()[:16]
+        if write_if_changed(dist_dir / INDEX, rewrite_index(raw.decode('utf-8'), manifest).encode('utf-8'))[1]:
+            written.append(f"{DIST_DIR}/{INDEX}")
+
+    if write_if_changed(dist_dir / MANIFEST, json.dumps(manifest, indent=2))[1]:
+        written.append(f"{DIST_DIR}/{MANIFEST}")
+
+    return dict(manifest, written=written)
+
+
+def load_manifest(frontend_dir='frontend'):
+    try:
+        return json.loads((Path(frontend_dir) / DIST_DIR / MANIFEST).read_text(encoding='utf-8'))
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def ensure_assets(frontend_dir='frontend'):
+    """
+    Reconstruit les bundles s'ils manquent ou si une source a changé ; à lancer
+    une fois avant de servir (jamais dans `create_app`, exécuté par chaque worker)
+    """
+    frontend_dir = Path(frontend_dir)
+    if not (frontend_dir / INDEX).exists():
+        return None
+    manifest = load_manifest(frontend_dir)
+    if manifest is not None:
+        built = [*manifest['bundles'].values(), INDEX]
+        bundles_ok = all((frontend_dir / DIST_DIR / name).exists() for name in built)
+        sources_ok = all(
+            (frontend_dir / source).exists()
+            and hashlib.sha256((frontend_dir / source).read_bytes()).hexdigest()[:16] == digest
+            for source, digest in manifest['sources'].items()
+        )
+        if bundles_ok and sources_ok:
+            return manifest
+    try:
+        return build_assets(frontend_dir)
+    except OSError as e:
+        logger.warning(f"[!] Bundles frontend non construits: {e}")
+        return None
+
+
+def index_folder(frontend_dir='frontend'):
+    """Dossier du `index.html` à servir : la version construite si elle existe"""
+    frontend_dir = Path(frontend_dir)
+    if (frontend_dir / DIST_DIR / INDEX).is_file():
+        return frontend_dir / DIST_DIR
+    return frontend_dir
+
+
+# ============================================
+# SERVICE HTTP
+# ============================================
+
+def send_asset(folder, filename):
+    """Sert un bundle, précompressé selon Accept-Encoding, avec cache immuable"""
+    folder = Path(folder)
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    encoding = None
+    for candidate, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if candidate in request.accept_encodings and (folder / f"{filename}{suffix}").is_file():
+            encoding = candidate
+            response = send_from_directory(folder, f"{filename}{suffix}", mimetype=mimetype)
+            break
+    else:
+        response = send_from_directory(folder, filename, mimetype=mimetype)
+
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Cache-Control'] = IMMUTABLE
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    manifest = ensure_assets(Path(__file__).resolve().parents[2] / 'frontend')
+    if manifest is None:
+        raise SystemExit("[!] Frontend absent ou non construit")
+    print(f"[OK] Bundles: {', '.join(manifest['bundles'].values())}")
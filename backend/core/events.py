@@ -0,0 +1,385 @@
+"""
+Canal d'événements poussés au navigateur (Server-Sent Events)
+
+    from backend.core.events import publish
+    publish('plugin', {'plugin': 'space-activity', 'success': True})
+
+`GET /api/events` garde une connexion ouverte par onglet et n'émet que
+lorsqu'un événement est publié (plus un commentaire de maintien toutes les
+`KEEPALIVE` secondes) : la charge dépend du rythme des changements, pas du
+nombre de tableaux de bord ouverts. Le navigateur se reconnecte seul et
+rejoue les événements manqués grâce à `Last-Event-ID`.
+
+Types publiés : `health` (changement de readiness), `plugin` (exécution
+terminée), `articles` (nouveaux articles analysés).
+
+Plusieurs workers : les événements sont écrits dans un journal SQLite partagé
+(`<DB_DIR>/events.sqlite`) qu'un thread de relais par processus relit toutes
+les `RELAY_INTERVAL` secondes ; un client reçoit donc les événements de tous
+les workers, et ses identifiants sont valables quel que soit le worker qui le
+reprend. Sans journal (dossier non inscriptible), le bus reste propre au
+processus.
+
+Sous gthread, chaque flux occupe un thread du worker : leur nombre est plafonné
+par processus (`EVENTS_MAX_STREAMS`, par défaut la moitié de `THREADS`, pour
+laisser des threads aux requêtes). Au-delà, `/api/events` répond 503 et le
+frontend interroge `GET /api/events/poll?last_id=N`. Avec un worker
+asynchrone (`GUNICORN_WORKER_CLASS=gevent`), le plafond par défaut est
+`ASYNC_MAX_STREAMS`.
+"""
+
+import itertools
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from flask import Blueprint, Response, current_app, jsonify, request
+
+from .runtime import on_fork
+
+logger = logging.getLogger(__name__)
+
+# Événements conservés pour rejouer après une reconnexion
+REPLAY_SIZE = 200
+# File par abonné : un client trop lent perd les plus anciens
+SUBSCRIBER_QUEUE_SIZE = 100
+# Commentaire de maintien (proxies, détection des clients partis)
+KEEPALIVE = 15.0
+# Délai de reconnexion suggéré au navigateur (ms)
+RETRY_MS = 5000
+
+# Journal partagé entre workers (dans DB_DIR) et période de relecture (s)
+EVENTS_DB = 'events.sqlite'
+RELAY_INTERVAL = 0.5
+# Événements publiés à l'identique par chaque worker : un seul est conservé
+DEDUPED_TYPES = ('health',)
+
+# Flux par processus sous un worker asynchrone (pas de thread par client)
+ASYNC_WORKERS = ('gevent', 'eventlet')
+ASYNC_MAX_STREAMS = 1000
+# Intervalle conseillé aux clients en mode interrogation (ms)
+POLL_MS = 15000
+
+bp = Blueprint('events', __name__)
+
+
+class StreamLimit(Exception):
+    """Plafond de flux SSE du processus atteint"""
+
+
+class EventLog:
+    """Journal d'événements SQLite partagé par les processus du serveur"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._appends = 0
+        self._local = threading.local()
+        db = self._connect()
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute(
+            'CREATE TABLE IF NOT EXISTS events ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, type TEXT NOT NULL, data TEXT NOT NULL, time REAL NOT NULL)'
+        )
+
+    def _connect(self):
+        # Connexion gardée par thread : fermer la dernière connexion WAL déclenche un checkpoint
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            # Événements éphémères : pas de fsync à chaque publication
+            db.execute('PRAGMA synchronous=NORMAL')
+            self._local.db = db
+        return db
+
+    def reset(self):
+        """Après fork : connexions du parent abandonnées"""
+        self._local = threading.local()
+
+    def append(self, event_type, data):
+        payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=str)
+        db = self._connect()
+        if event_type in DEDUPED_TYPES:
+            row = db.execute(
+                'SELECT id, data FROM events WHERE type = ? ORDER BY id DESC LIMIT 1', (event_type,)
+            ).fetchone()
+            if row and row[1] == payload:
+                return row[0]
+        event_id = db.execute(
+            'INSERT INTO events (type, data, time) VALUES (?, ?, ?)', (event_type, payload, time.time())
+        ).lastrowid
+        self._appends += 1
+        if self._appends % REPLAY_SIZE == 0:
+            db.execute('DELETE FROM events WHERE id <= ?', (event_id - REPLAY_SIZE,))
+        return event_id
+
+    def since(self, last_id, until=None):
+        """Événements d'identifiant > `last_id` (et <= `until`), dans l'ordre"""
+        query = 'SELECT id, type, data, time FROM events WHERE id > ?'
+        params = [last_id]
+        if until is not None:
+            query += ' AND id <= ?'
+            params.append(until)
+        query += ' ORDER BY id LIMIT ?'
+        params.append(REPLAY_SIZE)
+        rows = self._connect().execute(query, params).fetchall()
+        return [{'id': row[0], 'type': row[1], 'data': json.loads(row[2]), 'time': row[3]} for row in rows]
+
+    def last_id(self):
+        return self._connect().execute('SELECT COALESCE(MAX(id), 0) FROM events').fetchone()[0]
+
+
+class EventBus:
+    """Diffusion vers les abonnés du processus, depuis le journal partagé ou la mémoire"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._history = deque(maxlen=REPLAY_SIZE)
+        self._ids = itertools.count(1)
+        # Journal partagé (None : événements du seul processus)
+        self.log = None
+        # Flux simultanés acceptés (None : illimité)
+        self.max_subscribers = None
+        self._relay = None
+        self._cursor = 0
+
+    def use_log(self, log):
+        with self._lock:
+            self.log = log
+            self._relay = None
+
+    def publish(self, event_type, data):
+        if self.log is not None:
+            # Diffusé par le relais de chaque processus, celui-ci compris
+            return self.log.append(event_type, data)
+        with self._lock:
+            event = {'id': next(self._ids), 'type': event_type, 'data': data, 'time': time.time()}
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+        self._dispatch(event, subscribers)
+        return event['id']
+
+    def _dispatch(self, event, subscribers):
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(event)
+            except queue.Full:
+                try:
+                    subscriber.get_nowait()
+                    subscriber.put_nowait(event)
+                except (queue.Empty, queue.Full):
+                    pass
+
+    def _relay_loop(self, log):
+        while self.log is log:
+            time.sleep(RELAY_INTERVAL)
+            try:
+                # Sous verrou : un abonné inscrit ensuite reçoit ces événements par son rattrapage
+                with self._lock:
+                    events = log.since(self._cursor)
+                    if events:
+                        self._cursor = events[-1]['id']
+                    subscribers = list(self._subscribers)
+            except sqlite3.Error as e:
+                logger.error(f"[ERREUR] Relais evenements: {e}")
+                continue
+            for event in events:
+                self._dispatch(event, subscribers)
+
+    def _start_relay(self):
+        # Appelé sous self._lock
+        if self._relay is not None:
+            return
+        self._cursor = self.log.last_id()
+        self._relay = threading.Thread(target=self._relay_loop, args=(self.log,), name='geopolis-events', daemon=True)
+        self._relay.start()
+
+    def since(self, last_id):
+        """Événements postérieurs à `last_id` encore disponibles"""
+        if self.log is not None:
+            return self.log.since(last_id)
+        with self._lock:
+            return [event for event in self._history if event['id'] > last_id]
+
+    def last_id(self):
+        if self.log is not None:
+            return self.log.last_id()
+        with self._lock:
+            return self._history[-1]['id'] if self._history else 0
+
+    def subscribe(self, last_id=None):
+        """
+        Nouvelle file d'abonné, préremplie des événements postérieurs à `last_id`
+        StreamLimit si le processus sert déjà `max_subscribers` flux
+        """
+        subscriber = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            if self.max_subscribers is not None and len(self._subscribers) >= self.max_subscribers:
+                raise StreamLimit(f"{len(self._subscribers)} flux ouverts")
+            if self.log is not None:
+                self._start_relay()
+                backlog = self.log.since(last_id, until=self._cursor) if last_id is not None else []
+            else:
+                backlog = [event for event in self._history if last_id is not None and event['id'] > last_id]
+            for event in backlog:
+                try:
+                    subscriber.put_nowait(event)
+                except queue.Full:
+                    break
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'subscribers': len(self._subscribers),
+                'max_subscribers': self.max_subscribers,
+                'shared': self.log is not None,
+                'buffered': len(self._history)
+            }
+
+    def reset(self):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._relay = None
+        if self.log is not None:
+            self.log.reset()
+
+
+bus = EventBus()
+
+
+def publish(event_type, data):
+    """Publie un événement ; sans abonné, il ne coûte qu'un ajout à l'historique"""
+    try:
+        return bus.publish(event_type, data)
+    except Exception as e:
+        logger.error(f"[ERREUR] Publication evenement {event_type}: {e}")
+        return None
+
+
+def max_streams(config):
+    """Plafond de flux SSE par processus : configuré, sinon déduit du type de worker"""
+    configured = config.get('EVENTS_MAX_STREAMS')
+    if configured:
+        return int(configured)
+    if os.environ.get('GUNICORN_WORKER_CLASS', 'gthread') in ASYNC_WORKERS:
+        return ASYNC_MAX_STREAMS
+    return max(1, int(os.environ.get('THREADS', 4)) // 2)
+
+
+def init_events(app):
+    """Journal partagé dans DB_DIR et plafond de flux du processus"""
+    bus.max_subscribers = max_streams(app.config)
+    path = Path(app.config.get('DB_DIR', 'db')) / EVENTS_DB
+    try:
+        bus.use_log(EventLog(path))
+    except sqlite3.Error as e:
+        logger.warning(f"[!] Evenements propres a chaque processus ({path}): {e}")
+
+
+def _format(event):
+    payload = json.dumps(event['data'], ensure_ascii=False, separators=(',', ':'), default=str)
+    # Un événement sans identifiant ne déplace pas Last-Event-ID côté navigateur
+    head = f"id: {event['id']}\n" if event.get('id') else ''
+    return f"{head}event: {event['type']}\ndata: {payload}\n\n"
+
+
+def _stream(subscriber, initial=()):
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        for event_type, data in initial:
+            yield _format({'type': event_type, 'data': data})
+        while True:
+            try:
+                event = subscriber.get(timeout=KEEPALIVE)
+            except queue.Empty:
+                yield ": keepalive\n\n"
+                continue
+            yield _format(event)
+    finally:
+        # Client déconnecté (GeneratorExit à l'écriture suivante)
+        bus.unsubscribe(subscriber)
+
+
+def _last_id():
+    last_id = request.headers.get('Last-Event-ID') or request.args.get('last_id')
+    try:
+        return int(last_id) if last_id else None
+    except ValueError:
+        return None
+
+
+def _health():
+    # L'état de santé courant part immédiatement ; le thread de readiness
+    # (qui publie les changements) démarre avec le premier client
+    from .health import health_event, readiness
+    return health_event(readiness.snapshot(current_app.config.get('DB_DIR', 'db')))
+
+
+@bp.route('')
+def events_stream():
+    """Flux SSE des événements (503 au-delà du plafond : utiliser /poll)"""
+    last_id = _last_id()
+    health = _health()
+    try:
+        subscriber = bus.subscribe(last_id)
+    except StreamLimit as e:
+        response = jsonify({
+            'success': False,
+            'error': f"Trop de flux d'evenements ({e})",
+            'poll': '/api/events/poll',
+            'interval_ms': POLL_MS
+        })
+        response.status_code = 503
+        response.headers['Retry-After'] = str(POLL_MS // 1000)
+        return response
+
+    return Response(
+        _stream(subscriber, [('health', health)]),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+
+@bp.route('/poll')
+def events_poll():
+    """Événements postérieurs à `last_id` (sans `last_id` : seulement l'identifiant courant)"""
+    last_id = _last_id()
+    events = bus.since(last_id) if last_id is not None else []
+    stats = bus.stats()
+    response = jsonify({
+        'success': True,
+        'health': _health(),
+        'events': events,
+        'last_id': events[-1]['id'] if events else (last_id if last_id is not None else bus.last_id()),
+        'interval_ms': POLL_MS,
+        # Une place s'est libérée sur ce processus : le client peut retenter le flux
+        'stream_available': stats['max_subscribers'] is None or stats['subscribers'] < stats['max_subscribers']
+    })
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+
+@bp.route('/stats')
+def events_stats():
+    return jsonify(dict(bus.stats(), success=True))
+
+
+@on_fork
+def _reset_after_fork():
+    # Les connexions SSE du parent n'existent pas dans l'enfant ; le relais redémarre au premier abonné
+    bus.reset()
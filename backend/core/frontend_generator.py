@@ -1,13 +1,19 @@
 """
 Générateur automatique du frontend unifié SPA
+
+La génération est incrémentale : chaque fichier n'est réécrit (de façon
+atomique) que si son contenu change, et `generate_frontend()` renvoie le
+manifeste des fichiers modifiés. La relancer sur un serveur en marche ne
+touche donc ni les fichiers ni les caches navigateur quand rien n'a changé.
 """
 
 from pathlib import Path
 
-def generate_frontend():
-    """Génère tous les fichiers du frontend"""
+def generate_frontend(frontend_dir='frontend'):
+    """Génère tous les fichiers du frontend ; retourne le manifeste (modifiés / inchangés)"""
+    from backend.core.assets import build_assets, write_if_changed
     
-    frontend_dir = Path('frontend')
+    frontend_dir = Path(frontend_dir)
     frontend_dir.mkdir(exist_ok=True)
     
     # 1. Index HTML (SPA)
@@ -17,7 +23,9 @@ def generate_frontend():
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>GEOPOLIS v3.0 - Dashboard Géopolitique</title>
+    <!-- build:css -->
     <link rel="stylesheet" href="/css/styles.css">
+    <!-- endbuild -->
 </head>
 <body>
     <div id="app">
@@ -62,6 +70,7 @@ def generate_frontend():
         </main>
     </div>
     
+    <!-- build:js -->
     <script src="/js/api.js"></script>
     <script src="/js/views/dashboard.js"></script>
     <script src="/js/views/analyse.js"></script>
@@ -69,6 +78,7 @@ def generate_frontend():
     <script src="/js/views/plugins.js"></script>
     <script src="/js/views/settings.js"></script>
     <script src="/js/app.js"></script>
+    <!-- endbuild -->
 </body>
 </html>'''
     
@@ -295,9 +305,97 @@ input:focus, textarea:focus, select:focus {
     
     # 3. API Client
     api_js = '''// Client API centralisé
+// Cache des réponses GET : mémoire, et IndexedDB (persiste entre rechargements)
+// pour les seuls endpoints de PERSISTED ; /config, /health... restent en mémoire.
+// - Cache-Control: no-store -> jamais mis en cache ; max-age=N -> frais N secondes
+// - sinon l'entrée est servie immédiatement puis revalidée en arrière-plan
+//   (If-None-Match -> 304 si rien n'a changé), tant qu'elle a moins de staleTTL
+// - les GET identiques en cours sont partagés (une seule requête réseau)
+// Endpoints dont la réponse peut être écrite sur disque (liste explicite)
+const PERSISTED = ['/info', '/plugins/list'];
+
+class ResponseCache {
+    constructor(dbName = 'geopolis-api', maxEntries = 200) {
+        this.memory = new Map();
+        this.maxEntries = maxEntries;
+        this.db = this.openDB(dbName);
+    }
+    
+    openDB(dbName) {
+        if (!window.indexedDB) return Promise.resolve(null);
+        return new Promise(resolve => {
+            try {
+                // Version 2 : repart d'un magasin vide (la v1 persistait tous les GET)
+                const request = indexedDB.open(dbName, 2);
+                request.onupgradeneeded = () => {
+                    const db = request.result;
+                    if (db.objectStoreNames.contains('responses')) db.deleteObjectStore('responses');
+                    db.createObjectStore('responses');
+                };
+                request.onsuccess = () => resolve(request.result);
+                request.onerror = () => resolve(null);
+            } catch (e) {
+                resolve(null);
+            }
+        });
+    }
+    
+    async store(mode) {
+        const db = await this.db;
+        return db ? db.transaction('responses', mode).objectStore('responses') : null;
+    }
+    
+    async get(key) {
+        if (this.memory.has(key)) return this.memory.get(key);
+        const store = await this.store('readonly');
+        if (!store) return null;
+        return new Promise(resolve => {
+            const request = store.get(key);
+            request.onsuccess = () => {
+                if (request.result) this.remember(key, request.result);
+                resolve(request.result || null);
+            };
+            request.onerror = () => resolve(null);
+        });
+    }
+    
+    remember(key, entry) {
+        this.memory.delete(key);
+        this.memory.set(key, entry);
+        if (this.memory.size > this.maxEntries) {
+            this.memory.delete(this.memory.keys().next().value);
+        }
+    }
+    
+    async set(key, entry, persist = false) {
+        this.remember(key, entry);
+        if (!persist) return;
+        const store = await this.store('readwrite');
+        if (store) store.put(entry, key);
+    }
+    
+    async delete(prefix) {
+        for (const key of [...this.memory.keys()]) {
+            if (key.startsWith(prefix)) this.memory.delete(key);
+        }
+        const store = await this.store('readwrite');
+        if (!store) return;
+        const request = store.openCursor();
+        request.onsuccess = () => {
+            const cursor = request.result;
+            if (!cursor) return;
+            if (String(cursor.key).startsWith(prefix)) cursor.delete();
+            cursor.continue();
+        };
+    }
+}
+
 class API {
-    constructor(baseURL = '/api') {
+    constructor(baseURL = '/api', staleTTL = 5 * 60 * 1000) {
         this.baseURL = baseURL;
+        this.staleTTL = staleTTL;
+        this.cache = new ResponseCache();
+        this.inflight = new Map();
     }
     
     async request(endpoint, options = {}) {
@@ -325,9 +423,85 @@ class API {
         }
     }
     
-    // GET
-    get(endpoint) {
-        return this.request(endpoint, { method: 'GET' });
+    // Durée de fraîcheur annoncée par le serveur (null = ne pas stocker)
+    freshness(response) {
+        const header = response.headers.get('Cache-Control') || '';
+        if (header.includes('no-store')) return null;
+        const maxAge = header.match(/max-age=(\\d+)/);
+        return maxAge && !header.includes('no-cache') ? parseInt(maxAge[1], 10) * 1000 : 0;
+    }
+    
+    // Réponse de `endpoint` autorisée sur disque (chemin exact, sans la query)
+    persists(endpoint) {
+        return PERSISTED.includes(endpoint.split('?')[0]);
+    }
+    
+    // GET réseau (conditionnel si une version est en cache), partagé entre appelants
+    fetchAndStore(endpoint, cached) {
+        const url = `${this.baseURL}${endpoint}`;
+        if (this.inflight.has(url)) return this.inflight.get(url);
+        
+        const headers = { 'Accept': 'application/json' };
+        if (cached && cached.etag) headers['If-None-Match'] = cached.etag;
+        
+        const promise = fetch(url, { method: 'GET', headers })
+            .then(async response => {
+                const freshFor = this.freshness(response);
+                const persist = freshFor !== null && this.persists(endpoint);
+                const now = Date.now();
+                if (response.status === 304 && cached) {
+                    const entry = { ...cached, stored: now, expires: now + (freshFor || 0) };
+                    if (freshFor !== null) await this.cache.set(url, entry, persist);
+                    return entry.data;
+                }
+                const data = await response.json();
+                if (!response.ok) {
+                    throw new Error(data.error || `HTTP ${response.status}`);
+                }
+                if (freshFor !== null) {
+                    await this.cache.set(url, {
+                        data,
+                        etag: response.headers.get('ETag'),
+                        stored: now,
+                        expires: now + freshFor
+                    }, persist);
+                } else {
+                    // no-store : l'éventuelle version précédente est oubliée aussi
+                    await this.cache.delete(url);
+                }
+                return data;
+            })
+            .catch(error => {
+                console.error(`API Error [${endpoint}]:`, error);
+                throw error;
+            })
+            .finally(() => this.inflight.delete(url));
+        
+        this.inflight.set(url, promise);
+        return promise;
+    }
+    
+    // GET avec cache ; { fresh: true } impose une réponse revalidée
+    async get(endpoint, { fresh = false } = {}) {
+        const url = `${this.baseURL}${endpoint}`;
+        if (this.inflight.has(url)) return this.inflight.get(url);
+        
+        const cached = await this.cache.get(url);
+        const now = Date.now();
+        if (cached && now < cached.expires) {
+            return cached.data;
+        }
+        if (cached && !fresh && now - cached.stored < this.staleTTL) {
+            // Réponse immédiate, revalidation en arrière-plan
+            this.fetchAndStore(endpoint, cached).catch(() => {});
+            return cached.data;
+        }
+        return this.fetchAndStore(endpoint, cached);
+    }
+    
+    // Oublie les réponses en cache dont l'URL commence par `endpoint`
+    invalidate(endpoint = '') {
+        return this.cache.delete(`${this.baseURL}${endpoint}`);
     }
     
     // POST
@@ -340,7 +514,7 @@ class API {
     
     // Endpoints spécifiques
     health() {
-        return this.get('/health');
+        return this.get('/health', { fresh: true });
     }
     
     info() {
@@ -361,6 +535,19 @@ class API {
         return this.post('/tuteur/analyze', { code, provider });
     }
     
+    // Exécution côté serveur : jeton éventuel (SANDBOX_TOKEN) lu dans sessionStorage
+    runCode(code, stdin = '') {
+        const token = sessionStorage.getItem('geopolis.sandboxToken');
+        return this.request('/tuteur/run', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                ...(token ? { 'X-Geopolis-Sandbox-Token': token } : {})
+            },
+            body: JSON.stringify({ code, stdin })
+        });
+    }
+    
     // Plugins
     listPlugins() {
         return this.get('/plugins/list');
@@ -406,9 +593,8 @@ class App {
             this.navigateTo(hash);
         });
         
-        // Status check
-        this.checkStatus();
-        setInterval(() => this.checkStatus(), 30000);
+        // Status : poussé par le serveur (SSE), interrogation en repli
+        this.connectEvents();
         
         // Load initial view
         const initialView = window.location.hash.substring(1) || 'dashboard';
@@ -440,14 +626,83 @@ class App {
         window.location.hash = viewName;
     }
     
+    connectEvents() {
+        if (!window.EventSource) {
+            this.checkStatus();
+            setInterval(() => this.checkStatus(), 30000);
+            return;
+        }
+        
+        // Reconnexion automatique du navigateur, avec rejeu via Last-Event-ID
+        const resume = this.lastEventId ? `?last_id=${this.lastEventId}` : '';
+        const source = new EventSource(`/api/events${resume}`);
+        for (const type of ['health', 'plugin', 'articles']) {
+            source.addEventListener(type, (e) => {
+                this.lastEventId = e.lastEventId ? parseInt(e.lastEventId, 10) : this.lastEventId;
+                this.handleEvent(type, JSON.parse(e.data));
+            });
+        }
+        source.onerror = () => {
+            if (source.readyState === EventSource.CLOSED) {
+                // Flux refusé (503 : plafond du serveur atteint) : interrogation périodique
+                this.events = null;
+                this.pollEvents(this.lastEventId ?? null);
+            } else {
+                this.showStatus(null);
+            }
+        };
+        this.events = source;
+    }
+    
+    async pollEvents(lastId) {
+        let delay = 15000;
+        try {
+            const query = lastId === null ? '' : `?last_id=${lastId}`;
+            const data = await api.request(`/events/poll${query}`, { cache: 'no-store' });
+            this.showStatus(data.health);
+            data.events.forEach(event => this.handleEvent(event.type, event.data));
+            this.lastEventId = lastId = data.last_id;
+            delay = data.interval_ms || delay;
+            if (data.stream_available) {
+                // Place libérée : retour au flux, qui rejoue depuis lastEventId
+                return this.connectEvents();
+            }
+        } catch (error) {
+            this.showStatus(null);
+        }
+        setTimeout(() => this.pollEvents(lastId), delay);
+    }
+    
+    handleEvent(type, data) {
+        if (type === 'health') {
+            this.showStatus(data);
+            return;
+        }
+        if (type === 'plugin') api.invalidate('/plugins');
+        this.emit(type, data);
+    }
+    
+    emit(type, detail) {
+        // Les vues écoutent window 'geopolis:<type>'
+        window.dispatchEvent(new CustomEvent(`geopolis:${type}`, { detail }));
+    }
+    
+    showStatus(data) {
+        const status = document.getElementById('status');
+        if (!data) {
+            status.innerHTML = `<div style="color: #ff6b6b;">✗ Déconnecté</div>`;
+        } else if (data.status === 'degraded') {
+            status.innerHTML = `<div style="color: #ffd166;">⚠ Dégradé v${data.version}</div>`;
+        } else {
+            status.innerHTML = `<div style="color: rgba(255,255,255,0.9);">✓ Connecté v${data.version}</div>`;
+        }
+    }
+    
     async checkStatus() {
         try {
-            const data = await api.health();
-            document.getElementById('status').innerHTML = 
-                `<div style="color: rgba(255,255,255,0.9);">✓ Connecté v${data.version}</div>`;
+            this.showStatus(await api.health());
         } catch (error) {
-            document.getElementById('status').innerHTML = 
-                `<div style="color: #ff6b6b;">✗ Déconnecté</div>`;
+            this.showStatus(null);
         }
     }
 }
@@ -458,28 +713,35 @@ document.addEventListener('DOMContentLoaded', () => {
 });
 '''
     
-    # Écrire les fichiers
-    (frontend_dir / 'index.html').write_text(index_html, encoding='utf-8')
+    files = {
+        'css/styles.css': styles_css,
+        'js/api.js': api_js,
+        'js/app.js': app_js
+    }
+    files.update({f"js/views/{name}": content for name, content in generate_views().items()})
     
-    css_dir = frontend_dir / 'css'
-    css_dir.mkdir(exist_ok=True)
-    (css_dir / 'styles.css').write_text(styles_css, encoding='utf-8')
+    manifest = {'changed': [], 'unchanged': [], 'files': {}}
     
-    js_dir = frontend_dir / 'js'
-    js_dir.mkdir(exist_ok=True)
-    (js_dir / 'api.js').write_text(api_js, encoding='utf-8')
-    (js_dir / 'app.js').write_text(app_js, encoding='utf-8')
+    def write(relative, content):
+        digest, changed = write_if_changed(frontend_dir / relative, content)
+        manifest['files'][relative] = digest
+        manifest['changed' if changed else 'unchanged'].append(relative)
     
-    # Créer les vues
-    views_dir = js_dir / 'views'
-    views_dir.mkdir(exist_ok=True)
+    for relative, content in files.items():
+        write(relative, content)
+    write('index.html', index_html)
     
-    generate_views(views_dir)
+    # Bundles minifiés et empreintés, et dist/index.html qui les référence
+    # (index.html, suivi par git, garde les sources)
+    assets = build_assets(frontend_dir)
+    manifest['bundles'] = assets['bundles']
+    manifest['changed'].extend(assets['written'])
     
-    print("[OK] Frontend généré avec succès")
+    print(f"[OK] Frontend généré ({len(manifest['changed'])} fichier(s) modifié(s))")
+    return manifest
 
-def generate_views(views_dir):
-    """Génère tous les fichiers de vues"""
+def generate_views():
+    """Contenu des fichiers de vues (nom -> source)"""
     
     # Dashboard
     dashboard_js = '''class DashboardView {
@@ -616,6 +878,7 @@ def generate_views(views_dir):
                 </select>
                 
                 <button class="btn" onclick="this.analyzeCode()">🔍 Analyser le code</button>
+                <button class="btn" onclick="window.runCode()">▶ Exécuter</button>
                 
                 <div id="codeResult"></div>
             </div>
@@ -624,6 +887,35 @@ def generate_views(views_dir):
     
     mount() {
         window.analyzeCode = () => this.handleAnalyzeCode();
+        window.runCode = () => this.handleRunCode();
+    }
+    
+    async handleRunCode() {
+        const code = document.getElementById('codeInput').value;
+        const resultDiv = document.getElementById('codeResult');
+        
+        if (!code.trim()) {
+            resultDiv.innerHTML = '<div class="alert alert-warning">Veuillez entrer du code</div>';
+            return;
+        }
+        
+        resultDiv.innerHTML = '<div class="loading"><div class="spinner"></div>Exécution en cours...</div>';
+        
+        try {
+            const data = await api.runCode(code);
+            let html = data.ok
+                ? `<div class="alert alert-success">✓ Exécuté en ${(data.duration * 1000).toFixed(0)} ms</div>`
+                : `<div class="alert alert-error">❌ ${this.escape(data.error || 'Échec')}</div>`;
+            if (data.stdout) {
+                html += `<h3 style="margin-top: 20px;">Sortie :</h3><pre class="result-box">${this.escape(data.stdout)}</pre>`;
+            }
+            if (data.stderr) {
+                html += `<h3 style="margin-top: 20px;">Erreurs :</h3><pre class="result-box">${this.escape(data.stderr)}</pre>`;
+            }
+            resultDiv.innerHTML = html;
+        } catch (e) {
+            resultDiv.innerHTML = `<div class="alert alert-error">❌ Erreur: ${e.message}</div>`;
+        }
     }
     
     async handleAnalyzeCode() {
@@ -644,13 +936,30 @@ def generate_views(views_dir):
             let html = `<div class="alert alert-success">✓ Analyse terminée (Backend: ${data.backend})</div>`;
             
             if (data.analysis) {
-                html += `<div class="result-box">${data.analysis}</div>`;
+                html += `<div class="result-box">${this.escape(data.analysis)}</div>`;
+            }
+            
+            if (data.issues && data.issues.length) {
+                const icons = { error: '❌', warning: '⚠️', info: 'ℹ️' };
+                html += `
+                    <h3 style="margin-top: 20px;">Problèmes :</h3>
+                    <div class="result-box">${data.issues.map(issue =>
+                        `${icons[issue.severity] || ''} Ligne ${issue.line} : ${this.escape(issue.message)}`
+                    ).join('<br>')}</div>
+                `;
+            }
+            
+            if (data.suggestions && data.suggestions.length) {
+                html += `
+                    <h3 style="margin-top: 20px;">Suggestions :</h3>
+                    <div class="result-box">${data.suggestions.map(s => '• ' + this.escape(s)).join('<br>')}</div>
+                `;
             }
             
             if (data.fixed_code) {
                 html += `
                     <h3 style="margin-top: 20px;">Code corrigé :</h3>
-                    <div class="result-box">${data.fixed_code}</div>
+                    <pre class="result-box">${this.escape(data.fixed_code)}</pre>
                 `;
             }
             
@@ -659,6 +968,12 @@ def generate_views(views_dir):
             resultDiv.innerHTML = `<div class="alert alert-error">❌ Erreur: ${e.message}</div>`;
         }
     }
+    
+    escape(text) {
+        const div = document.createElement('div');
+        div.textContent = text;
+        return div.innerHTML;
+    }
 }
 '''
     
@@ -807,6 +1122,7 @@ def generate_views(views_dir):
         
         try {
             await api.post('/config', config);
+            api.invalidate('/config');
             resultDiv.innerHTML = '<div class="alert alert-success">✓ Configuration sauvegardée</div>';
             
             // Effacer les champs de clés
@@ -820,13 +1136,16 @@ def generate_views(views_dir):
 }
 '''
     
-    # Écrire tous les fichiers de vues
-    (views_dir / 'dashboard.js').write_text(dashboard_js, encoding='utf-8')
-    (views_dir / 'analyse.js').write_text(analyse_js, encoding='utf-8')
-    (views_dir / 'tuteur.js').write_text(tuteur_js, encoding='utf-8')
-    (views_dir / 'plugins.js').write_text(plugins_js, encoding='utf-8')
-    (views_dir / 'settings.js').write_text(settings_js, encoding='utf-8')
+    return {
+        'dashboard.js': dashboard_js,
+        'analyse.js': analyse_js,
+        'tuteur.js': tuteur_js,
+        'plugins.js': plugins_js,
+        'settings.js': settings_js
+    }
 
 if __name__ == '__main__':
-    generate_frontend()
+    result = generate_frontend()
+    for path in result['changed']:
+        print(f"  ~ {path}")
     print("Frontend généré avec succès !")
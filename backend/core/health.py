@@ -0,0 +1,244 @@
+"""
+Sondes de santé à trois niveaux
+
+- `/api/health`       : liveness, répondue depuis la mémoire (aucun accès disque) ;
+- `/api/health/ready` : readiness (registre des plugins, cache, base de données),
+  calculée par un thread d'arrière-plan toutes les `READINESS_INTERVAL`
+  secondes ; la requête ne fait que lire le dernier résultat ;
+- `/api/health/deep`  : vérifications coûteuses (écriture disque, import des
+  plugins, disjoncteurs amont), à réserver au diagnostic.
+
+Chaque changement de readiness est publié (événement `health`) sur `/api/events`.
+"""
+
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from flask import Blueprint, current_app, jsonify
+
+from .runtime import on_fork
+
+logger = logging.getLogger(__name__)
+
+# Période de rafraîchissement de la readiness (secondes)
+READINESS_INTERVAL = 15.0
+
+STARTED_AT = time.time()
+
+bp = Blueprint('health', __name__)
+
+
+# ============================================
+# VÉRIFICATIONS
+# ============================================
+
+def check_plugins():
+    """Registre des plugins découvert (la découverte n'a lieu qu'une fois)"""
+    try:
+        from backend.modules.plugins.manager import get_manager
+    except ImportError:
+        return {'ok': True, 'enabled': False}
+    plugins = get_manager().list_plugins()
+    return {
+        'ok': True,
+        'count': len(plugins),
+        'loaded': sum(1 for plugin in plugins if plugin['loaded'])
+    }
+
+
+def check_cache():
+    try:
+        from backend.modules.plugins.manager import get_manager
+    except ImportError:
+        return {'ok': True, 'enabled': False}
+    return dict(get_manager().cache.stats(), ok=True)
+
+
+def check_database(db_dir):
+    """Dossier de la base présent et accessible en écriture"""
+    path = Path(db_dir)
+    return {
+        'ok': path.is_dir() and os.access(path, os.W_OK),
+        'path': str(path)
+    }
+
+
+def check_writable(folder):
+    """Écriture réelle d'un fichier temporaire (vérification profonde)"""
+    try:
+        with tempfile.NamedTemporaryFile(dir=folder, prefix='.health-'):
+            pass
+        return {'ok': True, 'path': str(folder)}
+    except OSError as e:
+        return {'ok': False, 'path': str(folder), 'error': str(e)}
+
+
+def check_plugin_imports():
+    """Importe chaque plugin (déjà chargé = coût nul)"""
+    try:
+        from backend.modules.plugins.manager import get_manager
+    except ImportError:
+        return {'ok': True, 'enabled': False}
+    manager = get_manager()
+    failures = {}
+    for plugin in manager.list_plugins():
+        try:
+            manager.get_plugin(plugin['id'])
+        except Exception as e:
+            failures[plugin['id']] = str(e)
+    return {'ok': not failures, 'failures': failures}
+
+
+def check_upstreams():
+    try:
+        from backend.modules.plugins.upstream import session
+    except ImportError:
+        return {'ok': True, 'enabled': False}
+    circuits = session.circuit_states()
+    open_circuits = sorted(host for host, state in circuits.items() if state['state'] != 'closed')
+    # Un amont indisponible dégrade les plugins (fallbacks) sans rendre le serveur inapte
+    return {'ok': True, 'open': open_circuits, 'circuits': circuits}
+
+
+def check_logging():
+    from .logs import _state, dropped_records
+    listener = _state['listener']
+    alive = listener is not None and listener._thread is not None and listener._thread.is_alive()
+    return {'ok': alive, 'dropped_records': dropped_records()}
+
+
+def _run_checks(checks):
+    results = {}
+    for name, check in checks:
+        try:
+            results[name] = check()
+        except Exception as e:
+            results[name] = {'ok': False, 'error': str(e)}
+    return results
+
+
+# ============================================
+# READINESS EN ARRIÈRE-PLAN
+# ============================================
+
+class ReadinessProbe:
+    """Recalcule périodiquement la readiness ; les lectures sont sans verrou"""
+
+    def __init__(self, interval=READINESS_INTERVAL):
+        self.interval = interval
+        self.report = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._db_dir = 'db'
+
+    def compute(self):
+        checks = _run_checks([
+            ('plugins', check_plugins),
+            ('cache', check_cache),
+            ('database', lambda: check_database(self._db_dir))
+        ])
+        previous = self.report
+        self.report = {
+            'ready': all(check['ok'] for check in checks.values()),
+            'checks': checks,
+            'checked_at': time.time()
+        }
+        if previous is not None and health_event(previous) != health_event(self.report):
+            from .events import publish
+            publish('health', health_event(self.report))
+        return self.report
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.compute()
+            except Exception as e:
+                logger.error(f"[ERREUR] Readiness: {e}")
+
+    def start(self, db_dir='db'):
+        """Premier calcul synchrone puis thread de rafraîchissement (une fois par processus)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._db_dir = db_dir
+            self.compute()
+            self._thread = threading.Thread(target=self._loop, name='geopolis-readiness', daemon=True)
+            self._thread.start()
+
+    def snapshot(self, db_dir='db'):
+        if self.report is None:
+            self.start(db_dir)
+        return self.report
+
+    def reset(self):
+        self.report = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+
+readiness = ReadinessProbe()
+
+
+def health_event(report):
+    """Résumé d'un rapport de readiness diffusé aux navigateurs"""
+    from .app import VERSION
+    return {
+        'status': 'ok' if report['ready'] else 'degraded',
+        'version': VERSION,
+        'checks': {name: check['ok'] for name, check in report['checks'].items()}
+    }
+
+
+# ============================================
+# ENDPOINTS
+# ============================================
+
+def _db_dir():
+    return current_app.config.get('DB_DIR', 'db')
+
+
+@bp.route('')
+def health_live():
+    """Liveness : le processus répond"""
+    from .app import VERSION
+    return jsonify({
+        'status': 'ok',
+        'version': VERSION,
+        'uptime': round(time.time() - STARTED_AT, 1),
+        'timestamp': time.time()
+    })
+
+
+@bp.route('/ready')
+def health_ready():
+    """Readiness : dernier résultat calculé en arrière-plan"""
+    report = readiness.snapshot(_db_dir())
+    payload = dict(report, status='ok' if report['ready'] else 'degraded', age=round(time.time() - report['checked_at'], 1))
+    return jsonify(payload), 200 if report['ready'] else 503
+
+
+@bp.route('/deep')
+def health_deep():
+    """Vérifications complètes, calculées à la demande"""
+    checks = _run_checks([
+        ('plugins', check_plugin_imports),
+        ('cache', check_cache),
+        ('database', lambda: check_writable(_db_dir())),
+        ('logs', lambda: check_writable(current_app.config.get('LOG_DIR', 'logs'))),
+        ('logging', check_logging),
+        ('upstreams', check_upstreams)
+    ])
+    healthy = all(check['ok'] for check in checks.values())
+    return jsonify({'status': 'ok' if healthy else 'degraded', 'checks': checks}), 200 if healthy else 503
+
+
+@on_fork
+def _reset_after_fork():
+    # Le thread de rafraîchissement n'existe pas dans l'enfant : relance paresseuse
+    readiness.reset()
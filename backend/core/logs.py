@@ -0,0 +1,245 @@
+"""
+Pipeline de logs non bloquant
+
+Les threads de requête ne font que déposer l'enregistrement dans une file
+(QueueHandler) ; un thread dédié (QueueListener) écrit sur la console et dans
+`<LOG_DIR>/geopolis.log`, avec rotation par taille ET par date.
+
+Variables de configuration (app.config ou environnement) :
+    LOG_LEVEL, LOG_DIR, LOG_FORMAT ('text' | 'json'), LOG_MAX_BYTES,
+    LOG_BACKUP_COUNT, LOG_ROTATE_WHEN, LOG_QUEUE_SIZE
+
+En multi-workers, chaque processus a son propre thread d'écriture sur le même
+fichier : mettre `LOG_MAX_BYTES=0` et confier la rotation à logrotate si
+plusieurs workers risquent de déclencher la rotation simultanément.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+from pathlib import Path
+
+from .runtime import on_fork
+
+TEXT_FORMAT = '%(asctime)s [%(levelname)s] %(name)s: %(message)s'
+
+DEFAULTS = {
+    'LOG_LEVEL': 'INFO',
+    'LOG_DIR': 'logs',
+    'LOG_FORMAT': 'text',
+    'LOG_MAX_BYTES': 10 * 1024 * 1024,
+    'LOG_BACKUP_COUNT': 7,
+    'LOG_ROTATE_WHEN': 'midnight',
+    'LOG_QUEUE_SIZE': 10000
+}
+
+_state = {'listener': None, 'handler': None, 'config': None}
+_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """Une ligne JSON par enregistrement (ingestion ELK / Loki)"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'pid': record.process,
+            'thread': record.threadName
+        }
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exc_info'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class SizedTimedRotatingFileHandler(TimedRotatingFileHandler):
+    """
+    Rotation à l'échéance `when` ou dès que le fichier dépasse `max_bytes`
+
+    Une rotation par taille produit `<fichier>.<date>.<n>` (n = 1, 2…) : la
+    sauvegarde datée de l'échéance n'est jamais écrasée. La taille est tenue
+    à jour à chaque écriture, sans interroger le fichier.
+    """
+
+    def __init__(self, filename, max_bytes=0, **kwargs):
+        self.max_bytes = max_bytes
+        self.size = 0
+        super().__init__(filename, **kwargs)
+
+    def _open(self):
+        stream = super()._open()
+        self.size = os.fstat(stream.fileno()).st_size
+        return stream
+
+    def emit(self, record):
+        try:
+            msg = self.format(record) + self.terminator
+            length = len(msg.encode(self.encoding or 'utf-8', errors='replace'))
+            if super().shouldRollover(record):
+                self.doRollover()
+            elif self.max_bytes > 0 and self.size > 0 and self.size + length > self.max_bytes:
+                self.doSizeRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(msg)
+            self.flush()
+            self.size += length
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def doRollover(self):
+        super().doRollover()
+        self.size = 0
+
+    def doSizeRollover(self):
+        """Rotation avant l'échéance : sauvegarde numérotée dans l'intervalle courant"""
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        start = self.rolloverAt - self.interval
+        stamp = time.strftime(self.suffix, time.gmtime(start) if self.utc else time.localtime(start))
+        n = 1
+        while os.path.exists(f"{self.baseFilename}.{stamp}.{n}"):
+            n += 1
+        if os.path.exists(self.baseFilename):
+            os.rename(self.baseFilename, f"{self.baseFilename}.{stamp}.{n}")
+        if self.backupCount > 0:
+            for path in self.getFilesToDelete():
+                os.remove(path)
+        self.size = 0
+        if not self.delay:
+            self.stream = self._open()
+
+    def getFilesToDelete(self):
+        """
+        Sauvegardes en surnombre, les plus anciennes d'abord : par date, puis
+        les numérotées (1, 2… 10) avant celle de l'échéance, la dernière du jour
+        """
+        directory, name = os.path.split(self.baseFilename)
+        backups = []
+        for filename in os.listdir(directory):
+            if not filename.startswith(name + '.'):
+                continue
+            parts = filename[len(name) + 1:].split('.')
+            if not self.extMatch.match(parts[0]) or len(parts) > 2 or not all(p.isdigit() for p in parts[1:]):
+                continue
+            order = int(parts[1]) if len(parts) == 2 else float('inf')
+            backups.append((parts[0], order, os.path.join(directory, filename)))
+        backups.sort()
+        return [path for _, _, path in backups[:max(0, len(backups) - self.backupCount)]]
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    File pleine : les messages INFO/DEBUG sont comptés puis abandonnés plutôt
+    que de bloquer la requête ; WARNING et au-delà attendent au plus 1 s
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            if record.levelno >= logging.WARNING:
+                self.queue.put(record, timeout=1.0)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _setting(config, key):
+    if config and key in config:
+        return config[key]
+    return os.environ.get(key, DEFAULTS[key])
+
+
+def _build_handlers(config):
+    if str(_setting(config, 'LOG_FORMAT')).lower() == 'json':
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(TEXT_FORMAT)
+
+    handlers = [logging.StreamHandler()]
+    log_dir = Path(_setting(config, 'LOG_DIR'))
+    try:
+        log_dir.mkdir(parents=True, exist_ok=True)
+        handlers.append(SizedTimedRotatingFileHandler(
+            log_dir / 'geopolis.log',
+            max_bytes=int(_setting(config, 'LOG_MAX_BYTES')),
+            when=_setting(config, 'LOG_ROTATE_WHEN'),
+            backupCount=int(_setting(config, 'LOG_BACKUP_COUNT')),
+            encoding='utf-8',
+            delay=True
+        ))
+    except OSError as e:
+        print(f"[!] Log fichier indisponible: {e}", file=sys.stderr)
+
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    return handlers
+
+
+def _start(config):
+    log_queue = queue.Queue(maxsize=int(_setting(config, 'LOG_QUEUE_SIZE')))
+    handler = DroppingQueueHandler(log_queue)
+    listener = QueueListener(log_queue, *_build_handlers(config), respect_handler_level=True)
+    listener.start()
+
+    root = logging.getLogger()
+    if _state['handler'] is not None:
+        root.removeHandler(_state['handler'])
+    root.addHandler(handler)
+    root.setLevel(str(_setting(config, 'LOG_LEVEL')).upper())
+
+    _state.update(listener=listener, handler=handler, config=config)
+
+
+def configure_logging(config=None):
+    """Installe le pipeline (idempotent : une seule fois par processus)"""
+    with _lock:
+        if _state['listener'] is None:
+            _start(config)
+
+
+def shutdown_logging():
+    """Vide la file et arrête le thread d'écriture"""
+    with _lock:
+        listener = _state['listener']
+        if listener is not None:
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+            _state['listener'] = None
+
+
+def dropped_records():
+    handler = _state['handler']
+    return handler.dropped if handler is not None else 0
+
+
+atexit.register(shutdown_logging)
+
+
+@on_fork
+def _restart_after_fork():
+    # Le thread d'écriture n'existe pas dans l'enfant : nouvelle file, nouveau thread
+    global _lock
+    _lock = threading.Lock()
+    if _state['listener'] is not None:
+        _state['listener'] = None
+        configure_logging(_state['config'])
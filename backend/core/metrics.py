@@ -0,0 +1,275 @@
+"""
+Instrumentation des requêtes HTTP et endpoint `/api/metrics` (format Prometheus)
+
+Chaque thread agrège ses propres compteurs (aucun verrou sur le chemin de
+la requête) ; les fragments ne sont fusionnés qu'au moment du scrape. Le
+fragment d'un thread terminé est versé dans un total commun, si bien que le
+nombre de fragments suit le nombre de threads vivants.
+
+Séries exposées, par endpoint (règle d'URL), blueprint et méthode :
+- geopolis_http_requests_total{status}
+- geopolis_http_request_errors_total        (5xx et exceptions)
+- geopolis_http_request_duration_seconds    (histogramme)
+- geopolis_http_response_size_bytes         (somme / nombre)
+- geopolis_http_requests_in_flight          (par blueprint)
+"""
+
+import threading
+import time
+import weakref
+from bisect import bisect_left
+
+from flask import Response, g, request
+
+from .runtime import on_fork
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PROMETHEUS_MIMETYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class _Series:
+    """Agrégats d'un triplet (endpoint, blueprint, méthode) dans un fragment"""
+
+    __slots__ = ('buckets', 'duration_sum', 'count', 'errors', 'size_sum', 'size_count', 'statuses')
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.duration_sum = 0.0
+        self.count = 0
+        self.errors = 0
+        self.size_sum = 0
+        self.size_count = 0
+        self.statuses = {}
+
+
+class _Shard:
+    """Fragment propre à un thread : seul ce thread y écrit"""
+
+    __slots__ = ('series', 'in_flight')
+
+    def __init__(self):
+        self.series = {}
+        self.in_flight = {}
+
+
+class _Owner:
+    """Jeton rangé dans le thread-local : sa collecte signale la fin du thread"""
+
+    __slots__ = ('__weakref__',)
+
+
+def _merge_series(series, part):
+    """Ajoute le fragment `part` ({clé: _Series}) aux totaux `series`"""
+    for key, part_series in list(part.items()):
+        total = series.get(key)
+        if total is None:
+            total = series[key] = _Series()
+        total.buckets = [a + b for a, b in zip(total.buckets, part_series.buckets)]
+        total.duration_sum += part_series.duration_sum
+        total.count += part_series.count
+        total.errors += part_series.errors
+        total.size_sum += part_series.size_sum
+        total.size_count += part_series.size_count
+        for status, value in list(part_series.statuses.items()):
+            total.statuses[status] = total.statuses.get(status, 0) + value
+
+
+class RequestMetrics:
+    """Registre des fragments des threads vivants et totaux des threads terminés"""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        self._retired = {}
+        self._lock = threading.Lock()
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = _Shard()
+            owner = _Owner()
+            self._local.shard = shard
+            self._local.owner = owner
+            # Thread terminé (serveur à un thread par requête) : son fragment est
+            # versé dans les totaux retirés au lieu de s'accumuler
+            weakref.finalize(owner, self._retire, shard)
+            # Seul moment où l'on prend un verrou : la première requête d'un thread
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def _retire(self, shard):
+        with self._lock:
+            try:
+                self._shards.remove(shard)
+            except ValueError:
+                # Fragment d'avant un reset (fork)
+                return
+            _merge_series(self._retired, shard.series)
+
+    def start(self, blueprint):
+        shard = self._shard()
+        shard.in_flight[blueprint] = shard.in_flight.get(blueprint, 0) + 1
+
+    def finish(self, blueprint):
+        shard = self._shard()
+        shard.in_flight[blueprint] = shard.in_flight.get(blueprint, 0) - 1
+
+    def observe(self, endpoint, blueprint, method, status, duration, size=None, error=False):
+        shard = self._shard()
+        key = (endpoint, blueprint, method)
+        series = shard.series.get(key)
+        if series is None:
+            series = shard.series[key] = _Series()
+        series.buckets[bisect_left(BUCKETS, duration)] += 1
+        series.duration_sum += duration
+        series.count += 1
+        series.statuses[status] = series.statuses.get(status, 0) + 1
+        if error or status >= 500:
+            series.errors += 1
+        if size is not None:
+            series.size_sum += size
+            series.size_count += 1
+
+    def merged(self):
+        """Fusionne les fragments : ({clé: _Series}, {blueprint: en_cours})"""
+        series, in_flight = {}, {}
+        with self._lock:
+            shards = list(self._shards)
+            _merge_series(series, self._retired)
+
+        for shard in shards:
+            for blueprint, value in list(shard.in_flight.items()):
+                in_flight[blueprint] = in_flight.get(blueprint, 0) + value
+            _merge_series(series, shard.series)
+        return series, in_flight
+
+    def reset(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards = []
+        self._retired = {}
+
+
+metrics = RequestMetrics()
+
+
+# ============================================
+# FORMAT PROMETHEUS
+# ============================================
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def render_prometheus():
+    series, in_flight = metrics.merged()
+    lines = []
+
+    def header(name, kind, text):
+        lines.append(f'# HELP {name} {text}')
+        lines.append(f'# TYPE {name} {kind}')
+
+    header('geopolis_http_requests_total', 'counter', 'Requetes HTTP traitees')
+    for (endpoint, blueprint, method), s in sorted(series.items()):
+        for status, value in sorted(s.statuses.items()):
+            labels = _labels(endpoint=endpoint, blueprint=blueprint, method=method, status=status)
+            lines.append(f'geopolis_http_requests_total{labels} {value}')
+
+    header('geopolis_http_request_errors_total', 'counter', 'Requetes en erreur (5xx ou exception)')
+    for (endpoint, blueprint, method), s in sorted(series.items()):
+        labels = _labels(endpoint=endpoint, blueprint=blueprint, method=method)
+        lines.append(f'geopolis_http_request_errors_total{labels} {s.errors}')
+
+    header('geopolis_http_request_duration_seconds', 'histogram', 'Duree de traitement des requetes')
+    for (endpoint, blueprint, method), s in sorted(series.items()):
+        cumulative = 0
+        for bound, value in zip(BUCKETS + ('+Inf',), s.buckets):
+            cumulative += value
+            labels = _labels(endpoint=endpoint, blueprint=blueprint, method=method, le=bound)
+            lines.append(f'geopolis_http_request_duration_seconds_bucket{labels} {cumulative}')
+        labels = _labels(endpoint=endpoint, blueprint=blueprint, method=method)
+        lines.append(f'geopolis_http_request_duration_seconds_sum{labels} {s.duration_sum:.6f}')
+        lines.append(f'geopolis_http_request_duration_seconds_count{labels} {s.count}')
+
+    header('geopolis_http_response_size_bytes', 'summary', 'Taille des reponses (hors flux)')
+    for (endpoint, blueprint, method), s in sorted(series.items()):
+        labels = _labels(endpoint=endpoint, blueprint=blueprint, method=method)
+        lines.append(f'geopolis_http_response_size_bytes_sum{labels} {s.size_sum}')
+        lines.append(f'geopolis_http_response_size_bytes_count{labels} {s.size_count}')
+
+    header('geopolis_http_requests_in_flight', 'gauge', 'Requetes en cours')
+    for blueprint, value in sorted(in_flight.items()):
+        lines.append(f'geopolis_http_requests_in_flight{_labels(blueprint=blueprint)} {value}')
+
+    from .logs import dropped_records
+    header('geopolis_log_records_dropped_total', 'counter', 'Logs abandonnes (file pleine)')
+    lines.append(f'geopolis_log_records_dropped_total {dropped_records()}')
+
+    return '\n'.join(lines) + '\n'
+
+
+# ============================================
+# INTÉGRATION FLASK
+# ============================================
+
+def _blueprint():
+    if request.endpoint == 'static':
+        return 'static'
+    return request.blueprint or 'core'
+
+
+def _before_request():
+    g._metrics_start = time.perf_counter()
+    g._metrics_blueprint = _blueprint()
+    metrics.start(g._metrics_blueprint)
+
+
+def _after_request(response):
+    start = g.pop('_metrics_start', None)
+    if start is not None:
+        endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        metrics.observe(
+            endpoint,
+            g._metrics_blueprint,
+            request.method,
+            response.status_code,
+            time.perf_counter() - start,
+            size=None if response.is_streamed else response.content_length
+        )
+    return response
+
+
+def _teardown_request(exc):
+    blueprint = g.pop('_metrics_blueprint', None)
+    if blueprint is None:
+        return
+    start = g.pop('_metrics_start', None)
+    if start is not None:
+        # after_request n'a pas été appelé : exception non gérée
+        endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        metrics.observe(endpoint, blueprint, request.method, 500, time.perf_counter() - start, error=True)
+    metrics.finish(blueprint)
+
+
+def api_metrics():
+    """Métriques au format texte Prometheus"""
+    return Response(render_prometheus(), mimetype=PROMETHEUS_MIMETYPE)
+
+
+def init_metrics(app):
+    """Branche l'instrumentation sur `app` et expose `/api/metrics`"""
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    app.add_url_rule('/api/metrics', 'api_metrics', api_metrics)
+
+
+@on_fork
+def _reset_after_fork():
+    metrics.reset()
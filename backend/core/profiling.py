@@ -0,0 +1,358 @@
+"""
+Profilage à la demande des requêtes en production
+
+Deux déclencheurs, sans redémarrage du serveur :
+- en-tête `X-Geopolis-Profile: cprofile|sampling` sur une requête donnée ;
+- armement via `POST /api/profiling/arm` : les N prochaines requêtes dont le
+  chemin commence par `path_prefix` sont profilées.
+
+Deux profileurs :
+- `cprofile` : profil déterministe, enregistré au format `.pstats`
+  (`python -m pstats`, snakeviz) ;
+- `sampling` : échantillonnage périodique de la pile du thread de la requête,
+  enregistré en piles repliées `.collapsed` (flamegraph.pl, speedscope).
+
+Une réponse en flux (NDJSON, SSE) est profilée jusqu'à la fin de l'envoi de
+son corps, pas seulement jusqu'au retour de la vue ; le profileur reste donc
+occupé pendant toute la durée d'un flux long (`/api/events`).
+
+Les profils sont écrits dans `<LOG_DIR>/profiles/` et téléchargeables via
+`GET /api/profiling/<nom>`. Les endpoints d'administration et l'en-tête
+exigent `X-Geopolis-Profile-Token` (valeur de `PROFILE_TOKEN`) ; sans jeton
+configuré, le profilage est fermé, sauf en mode debug pour une requête locale
+(127.0.0.1 / ::1).
+"""
+
+import cProfile
+import hmac
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from flask import Blueprint, current_app, g, jsonify, request, send_from_directory
+
+from .runtime import on_fork
+
+logger = logging.getLogger(__name__)
+
+MODES = ('cprofile', 'sampling')
+
+# Période d'échantillonnage par défaut (secondes)
+SAMPLING_INTERVAL = 0.005
+# Profils conservés sur disque (les plus anciens sont supprimés)
+PROFILE_KEEP = 50
+# Nombre maximal de requêtes armées en une fois
+MAX_ARMED = 100
+
+PROFILE_HEADER = 'X-Geopolis-Profile'
+TOKEN_HEADER = 'X-Geopolis-Profile-Token'
+
+SAFE_NAME = re.compile(r'^[\w.-]+\.(pstats|collapsed)$')
+
+bp = Blueprint('profiling', __name__)
+
+
+class SamplingProfiler(threading.Thread):
+    """Échantillonne la pile d'un thread et compte les piles repliées"""
+
+    def __init__(self, thread_id, interval=SAMPLING_INTERVAL):
+        super().__init__(name='geopolis-sampler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def collapsed(self):
+        return ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfilingController:
+    """Armement des requêtes à profiler et accès aux profils enregistrés"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # cProfile ne supporte qu'un profileur actif à la fois par processus
+        self._busy = threading.Lock()
+        self.armed = None
+
+    def arm(self, path_prefix, count, mode, interval=SAMPLING_INTERVAL):
+        with self._lock:
+            self.armed = {
+                'path_prefix': path_prefix,
+                'remaining': count,
+                'mode': mode,
+                'interval': interval,
+                'armed_at': time.time()
+            }
+            return dict(self.armed)
+
+    def disarm(self):
+        with self._lock:
+            self.armed = None
+
+    def status(self):
+        with self._lock:
+            return dict(self.armed) if self.armed else None
+
+    def matches(self, path):
+        """`path` est visé par l'armement en cours (sans le consommer)"""
+        armed = self.armed
+        return armed is not None and path.startswith(armed['path_prefix'])
+
+    def claim(self, path):
+        """
+        Consomme une requête armée : mode et intervalle, ou None si l'armement
+        a été épuisé entre-temps. À appeler une fois le profileur réservé
+        (`_busy`), pour ne pas décompter une requête qui ne sera pas profilée
+        """
+        with self._lock:
+            armed = self.armed
+            if not armed or not path.startswith(armed['path_prefix']):
+                return None
+            armed['remaining'] -= 1
+            if armed['remaining'] <= 0:
+                self.armed = None
+            return armed['mode'], armed['interval']
+
+    def reset(self):
+        self._lock = threading.Lock()
+        self._busy = threading.Lock()
+        self.armed = None
+
+
+controller = ProfilingController()
+
+
+# ============================================
+# STOCKAGE DES PROFILS
+# ============================================
+
+def profiles_dir():
+    return Path(current_app.config.get('LOG_DIR', 'logs')) / 'profiles'
+
+
+def _profile_name(extension):
+    endpoint = request.url_rule.rule if request.url_rule is not None else request.path
+    slug = re.sub(r'[^\w-]+', '_', endpoint).strip('_') or 'root'
+    stamp = time.strftime('%Y%m%d-%H%M%S')
+    return f"{stamp}-{int(time.time() * 1000) % 1000:03d}-{os.getpid()}-{slug}.{extension}"
+
+
+def _prune(folder):
+    files = sorted(
+        (p for p in folder.iterdir() if SAFE_NAME.match(p.name)),
+        key=lambda p: p.stat().st_mtime
+    )
+    for path in files[:-PROFILE_KEEP]:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def list_profiles():
+    folder = profiles_dir()
+    if not folder.exists():
+        return []
+    profiles = []
+    for path in folder.iterdir():
+        if SAFE_NAME.match(path.name):
+            stat = path.stat()
+            profiles.append({'name': path.name, 'size': stat.st_size, 'created': stat.st_mtime})
+    return sorted(profiles, key=lambda p: p['created'], reverse=True)
+
+
+def _destination(mode):
+    """(dossier, nom, libellé) du profil de la requête courante"""
+    name = _profile_name('pstats' if mode == 'cprofile' else 'collapsed')
+    return profiles_dir(), name, f"{request.method} {request.path}"
+
+
+def _save(profiler, mode, elapsed, destination):
+    folder, name, label = destination
+    folder.mkdir(parents=True, exist_ok=True)
+    if mode == 'cprofile':
+        profiler.dump_stats(str(folder / name))
+    else:
+        (folder / name).write_text(profiler.collapsed(), encoding='utf-8')
+    _prune(folder)
+    logger.info(f"[PROFIL] {label} ({elapsed * 1000:.1f} ms) -> {name}")
+
+
+# ============================================
+# CONTRÔLE D'ACCÈS
+# ============================================
+
+def _authorized():
+    token = current_app.config.get('PROFILE_TOKEN') or os.environ.get('PROFILE_TOKEN')
+    if token:
+        return hmac.compare_digest(request.headers.get(TOKEN_HEADER, ''), token)
+    # Derrière un proxy (nginx, gunicorn) tout client paraît local : sans jeton,
+    # l'accès local n'est accordé qu'au serveur de développement (debug)
+    return current_app.debug and request.remote_addr in ('127.0.0.1', '::1')
+
+
+def _forbidden():
+    return jsonify({'success': False, 'error': 'Profilage non autorise'}), 403
+
+
+# ============================================
+# INTÉGRATION FLASK
+# ============================================
+
+def _requested():
+    """`(mode, intervalle)` demandés par l'en-tête, 'armed' si l'armement vise la requête, sinon None"""
+    header = request.headers.get(PROFILE_HEADER, '').lower()
+    if header:
+        if header in ('1', 'true'):
+            header = 'cprofile'
+        if header in MODES and _authorized():
+            return header, SAMPLING_INTERVAL
+        return None
+    if request.path.startswith('/api/profiling') or not controller.matches(request.path):
+        return None
+    return 'armed'
+
+
+def _before_request():
+    requested = _requested()
+    if requested is None:
+        return
+    # Une requête déjà profilée dans ce processus : on ne bloque pas celle-ci
+    if not controller._busy.acquire(blocking=False):
+        return
+    if requested == 'armed':
+        # Décompté seulement maintenant que le profileur est réservé
+        requested = controller.claim(request.path)
+        if requested is None:
+            controller._busy.release()
+            return
+    mode, interval = requested
+    if mode == 'cprofile':
+        profiler = cProfile.Profile()
+        profiler.enable()
+    else:
+        profiler = SamplingProfiler(threading.get_ident(), interval)
+        profiler.start()
+    g._profiling = (profiler, mode, time.perf_counter())
+
+
+def _finish(state, destination):
+    profiler, mode, start = state
+    try:
+        if mode == 'cprofile':
+            profiler.disable()
+        else:
+            profiler.stop()
+        _save(profiler, mode, time.perf_counter() - start, destination)
+    except Exception as e:
+        logger.error(f"[ERREUR] Enregistrement du profil: {e}")
+    finally:
+        controller._busy.release()
+
+
+def _after_request(response):
+    # Réponse en flux : le corps est produit après le teardown, le profil s'arrête
+    # à la fermeture de la réponse (destination calculée tant que la requête existe)
+    state = g.get('_profiling')
+    if state is not None and response.is_streamed:
+        g.pop('_profiling')
+        destination = _destination(state[1])
+        response.call_on_close(lambda: _finish(state, destination))
+    return response
+
+
+def _teardown_request(exc):
+    state = g.pop('_profiling', None)
+    if state is None:
+        return
+    _finish(state, _destination(state[1]))
+
+
+# ============================================
+# API D'ADMINISTRATION
+# ============================================
+
+@bp.route('', methods=['GET'])
+def profiling_status():
+    """État de l'armement et profils disponibles"""
+    if not _authorized():
+        return _forbidden()
+    return jsonify({'success': True, 'armed': controller.status(), 'profiles': list_profiles()})
+
+
+@bp.route('/arm', methods=['POST'])
+def profiling_arm():
+    """Profile les `count` prochaines requêtes dont le chemin commence par `path_prefix`"""
+    if not _authorized():
+        return _forbidden()
+    data = request.get_json(silent=True) or {}
+
+    path_prefix = data.get('path_prefix', '/api/')
+    mode = data.get('mode', 'cprofile')
+    if mode not in MODES:
+        return jsonify({'success': False, 'error': f"Mode inconnu: {mode}", 'modes': list(MODES)}), 400
+    try:
+        count = min(max(int(data.get('count', 1)), 1), MAX_ARMED)
+        interval = max(float(data.get('interval', SAMPLING_INTERVAL)), 0.001)
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'count/interval invalides'}), 400
+
+    armed = controller.arm(path_prefix, count, mode, interval)
+    logger.info(f"[PROFIL] Arme: {count} requete(s) {path_prefix}* en mode {mode}")
+    return jsonify({'success': True, 'armed': armed})
+
+
+@bp.route('/arm', methods=['DELETE'])
+def profiling_disarm():
+    if not _authorized():
+        return _forbidden()
+    controller.disarm()
+    return jsonify({'success': True, 'armed': None})
+
+
+@bp.route('/<name>', methods=['GET'])
+def profiling_download(name):
+    """Télécharge un profil (.pstats ou .collapsed)"""
+    if not _authorized():
+        return _forbidden()
+    if not SAFE_NAME.match(name):
+        return jsonify({'success': False, 'error': 'Nom de profil invalide'}), 400
+    folder = profiles_dir().resolve()
+    if not (folder / name).exists():
+        return jsonify({'success': False, 'error': 'Profil introuvable'}), 404
+    return send_from_directory(str(folder), name, as_attachment=True)
+
+
+def init_profiling(app):
+    """Branche les hooks de profilage sur `app` et expose `/api/profiling`"""
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    app.register_blueprint(bp, url_prefix='/api/profiling')
+
+
+@on_fork
+def _reset_after_fork():
+    controller.reset()
@@ -0,0 +1,129 @@
+"""
+Réponses API négociées : format (JSON / msgpack), compression, ETag
+
+`api_response(payload)` remplace `jsonify(payload)` sur les endpoints qui
+peuvent renvoyer de gros volumes (plugins, flux RSS).
+"""
+
+import gzip
+import hashlib
+import json
+
+from flask import Response, current_app, request
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# En dessous de cette taille, la compression coûte plus qu'elle ne rapporte
+DEFAULT_COMPRESS_MIN_SIZE = 1024
+
+MSGPACK_MIMETYPES = ('application/msgpack', 'application/x-msgpack')
+
+
+def _wants_msgpack():
+    if msgpack is None:
+        return False
+    best = request.accept_mimetypes.best_match(('application/json',) + MSGPACK_MIMETYPES)
+    return best in MSGPACK_MIMETYPES
+
+
+def _choose_encoding():
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def _compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=5)
+    # mtime fixe : même contenu -> mêmes octets -> même ETag
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+
+def _etag_matches(etag):
+    header = request.headers.get('If-None-Match', '')
+    if not header:
+        return False
+    candidates = [tag.strip() for tag in header.split(',')]
+    return '*' in candidates or etag in candidates
+
+
+def api_response(payload, status=200):
+    """
+    Sérialise `payload` selon `Accept`, compresse selon `Accept-Encoding` ;
+    ETag et If-None-Match (304) pour GET/HEAD uniquement
+    """
+    if _wants_msgpack():
+        body = msgpack.packb(payload, use_bin_type=True, default=str)
+        mimetype = 'application/msgpack'
+    else:
+        body = json.dumps(payload, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8')
+        mimetype = 'application/json'
+
+    encoding = None
+    if len(body) >= current_app.config.get('COMPRESS_MIN_SIZE', DEFAULT_COMPRESS_MIN_SIZE):
+        encoding = _choose_encoding()
+
+    # ETag fort : dépend du contenu, du format et de l'encodage
+    suffix = ''
+    if mimetype != 'application/json':
+        suffix += '-msgpack'
+    if encoding:
+        suffix += '-' + encoding
+    etag = f'"{hashlib.sha256(body).hexdigest()[:32]}{suffix}"'
+
+    headers = {
+        'Vary': 'Accept, Accept-Encoding',
+        'Cache-Control': 'no-cache'
+    }
+
+    # Une requête POST a déjà produit son effet : pas de 304 (RFC 9110, 13.1.2)
+    if request.method in ('GET', 'HEAD'):
+        headers['ETag'] = etag
+        if status == 200 and _etag_matches(etag):
+            return Response(status=304, headers=headers)
+
+    if encoding:
+        body = _compress(body, encoding)
+        headers['Content-Encoding'] = encoding
+
+    return Response(body, status=status, mimetype=mimetype, headers=headers)
+
+
+# ============================================
+# GET CONDITIONNELS
+# ============================================
+
+def _conditional_get(response):
+    """ETag sur les réponses JSON des GET /api/* qui n'en ont pas ; 304 si inchangé"""
+    if (
+        request.method not in ('GET', 'HEAD')
+        or not request.path.startswith('/api/')
+        or response.status_code != 200
+        or response.is_streamed
+        or response.mimetype != 'application/json'
+        or 'ETag' in response.headers
+    ):
+        return response
+
+    etag = f'"{hashlib.sha256(response.get_data()).hexdigest()[:32]}"'
+    response.headers['ETag'] = etag
+    response.headers.setdefault('Cache-Control', 'no-cache')
+    if _etag_matches(etag):
+        return Response(status=304, headers={'ETag': etag, 'Cache-Control': response.headers['Cache-Control']})
+    return response
+
+
+def init_conditional_get(app):
+    """Permet aux clients de revalider les GET JSON à moindre coût (If-None-Match)"""
+    app.after_request(_conditional_get)
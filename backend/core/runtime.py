@@ -0,0 +1,35 @@
+"""
+État global par processus
+
+Les serveurs multi-workers (gunicorn avec `preload_app`, multiprocessing)
+créent les workers par `fork()`. Verrous, sessions HTTP et compteurs hérités
+du parent doivent alors être réinitialisés dans chaque enfant : les modules
+concernés enregistrent leur fonction de remise à zéro avec `@on_fork`.
+"""
+
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+_handlers = []
+
+
+def on_fork(func):
+    """Décorateur : `func()` sera appelée dans chaque processus enfant après fork"""
+    _handlers.append(func)
+    return func
+
+
+def reinit_after_fork():
+    """Exécute les remises à zéro enregistrées (appelé automatiquement)"""
+    for func in list(_handlers):
+        try:
+            func()
+        except Exception as e:
+            logger.error(f"[ERREUR] Reinitialisation apres fork ({func.__module__}.{func.__name__}): {e}")
+
+
+# Indisponible sous Windows : pas de fork, donc rien à réinitialiser
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=reinit_after_fork)
@@ -0,0 +1,145 @@
+"""
+Configuration JSON chargée une fois, mise en cache et rechargée à chaud
+
+    from backend.core.settings import get_store
+    settings = get_store().get()           # dict en mémoire, aucun accès disque
+    get_store().subscribe(callback)        # callback(settings) à chaque modification
+
+Un thread par fichier surveille `mtime`/taille toutes les `POLL_INTERVAL`
+secondes ; la lecture et le parsing n'ont lieu qu'au démarrage et quand le
+fichier change. Un fichier devenu invalide est ignoré (la dernière version
+valide reste en place).
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+
+from .runtime import on_fork
+
+logger = logging.getLogger(__name__)
+
+PLUGINS_SETTINGS = Path('config/plugins.json')
+
+# Période de surveillance des fichiers (secondes)
+POLL_INTERVAL = 2.0
+
+
+class SettingsStore:
+    """Contenu d'un fichier JSON, rechargé quand il change sur disque"""
+
+    def __init__(self, path, poll_interval=POLL_INTERVAL):
+        self.path = Path(path)
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._data = None
+        self._signature = None
+        self._subscribers = []
+        self._thread = None
+        self._stop = threading.Event()
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+            return (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            return None
+
+    def _read(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def get(self):
+        """Dernière configuration valide (à ne pas modifier en place)"""
+        if self._data is None:
+            with self._lock:
+                if self._data is None:
+                    self._signature = self._stat()
+                    try:
+                        self._data = self._read()
+                    except Exception as e:
+                        logger.warning(f"Configuration illisible ({self.path}): {e}")
+                        self._data = {}
+                    self._start_watcher()
+        return self._data
+
+    def subscribe(self, callback):
+        """`callback(settings)` sera appelé après chaque rechargement"""
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def reload(self):
+        """Relit le fichier s'il a changé ; True si la configuration a été remplacée"""
+        signature = self._stat()
+        if signature == self._signature:
+            return False
+        try:
+            data = self._read()
+        except Exception as e:
+            # Fichier en cours d'écriture ou invalide : on garde l'ancienne version
+            logger.warning(f"Configuration invalide ignoree ({self.path}): {e}")
+            return False
+
+        with self._lock:
+            self._signature = signature
+            changed = data != self._data
+            self._data = data
+            subscribers = list(self._subscribers)
+        if not changed:
+            return False
+
+        logger.info(f"[OK] Configuration rechargee: {self.path}")
+        for callback in subscribers:
+            try:
+                callback(data)
+            except Exception as e:
+                logger.error(f"[ERREUR] Rechargement configuration ({callback.__qualname__}): {e}")
+        return True
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            self.reload()
+
+    def _start_watcher(self):
+        if self._thread is None and self.poll_interval:
+            self._thread = threading.Thread(target=self._watch, name=f"settings-{self.path.name}", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def reset(self):
+        # Après fork : nouveau verrou et nouveau thread (démarré au prochain get)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        if self._data is not None:
+            self._start_watcher()
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(path=PLUGINS_SETTINGS):
+    """Store partagé du fichier `path` (un seul par processus)"""
+    key = str(path)
+    store = _stores.get(key)
+    if store is None:
+        with _stores_lock:
+            store = _stores.setdefault(key, SettingsStore(path))
+    return store
+
+
+@on_fork
+def _reset_after_fork():
+    global _stores_lock
+    _stores_lock = threading.Lock()
+    for store in list(_stores.values()):
+        store.reset()
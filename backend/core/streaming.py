@@ -0,0 +1,178 @@
+"""
+Réponses API en flux : NDJSON ou tableau JSON émis par morceaux
+
+La mémoire consommée ne dépend plus du nombre de lignes renvoyées et le
+client peut afficher les premières lignes avant la fin du calcul.
+
+Modes (paramètre `?stream=` ou en-tête `Accept`) :
+- `ndjson` : une ligne `{"meta": {...}}`, puis une ligne JSON par élément,
+  puis `{"end": {"count": N, ...}}` ;
+- `json`   : l'enveloppe habituelle, dont le tableau est écrit élément par
+  élément ; `success` et `count` sont écrits en dernier.
+
+`key` est l'emplacement du tableau dans l'enveloppe, éventuellement imbriqué
+(`'result.data'` : même forme que la réponse non diffusée). Un générateur peut
+retourner (`return {...}`) les champs connus seulement à la fin : ils
+rejoignent l'objet qui contient le tableau (json) ou la ligne `end` (ndjson),
+et un `success` faux parmi eux fait échouer la réponse.
+
+Écriture sur la socket : l'en-tête part immédiatement ; les lignes d'un
+générateur (produites au fil du calcul) partent chacune dès qu'elles sont
+produites, celles d'une liste déjà en mémoire par paquets de `CHUNK_SIZE`.
+
+Si le générateur lève une exception en cours de route, l'erreur est
+journalisée et la réponse se termine par un enregistrement d'échec :
+`{"error": {"message": ..., "count": N}}` en ndjson, `"error"` et
+`"success": false` en json.
+"""
+
+import json
+import logging
+import types
+
+from flask import Response, request, stream_with_context
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# Nombre d'éléments regroupés par écriture sur la socket (lignes déjà en mémoire)
+CHUNK_SIZE = 50
+
+# Champs de fin réservés au premier niveau de l'enveloppe
+RESERVED_KEYS = ('success', 'count', 'error')
+
+
+def _dumps(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=str)
+
+
+def stream_mode():
+    """'ndjson', 'json' ou None si le client n'a pas demandé de flux"""
+    mode = request.args.get('stream', '').lower()
+    if mode in ('ndjson', 'json'):
+        return mode
+    if mode in ('1', 'true'):
+        return 'json'
+    if request.accept_mimetypes.best == NDJSON_MIMETYPE:
+        return 'ndjson'
+    return None
+
+
+def _batched(lines, size):
+    """Regroupe les morceaux par `size` ; le premier (en-tête) part seul, sans attendre"""
+    lines = iter(lines)
+    head = next(lines, None)
+    if head is not None:
+        yield head
+    if size <= 1:
+        yield from lines
+        return
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= size:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+def _drain(rows, state):
+    """Éléments de `rows` ; `state` reçoit leur nombre, la valeur de retour et l'erreur éventuelle"""
+    iterator = iter(rows)
+    while True:
+        try:
+            row = next(iterator)
+        except StopIteration as stop:
+            state['trailer'] = stop.value or {}
+            return
+        except Exception as e:
+            # Les en-têtes (200) sont déjà partis : l'échec est signalé dans le corps
+            logger.error(f"Erreur pendant une reponse en flux: {e}", exc_info=True)
+            state['error'] = str(e) or type(e).__name__
+            return
+        state['count'] += 1
+        yield row
+
+
+def _new_state():
+    return {'count': 0, 'trailer': {}, 'error': None}
+
+
+def _ndjson_lines(meta, path, rows):
+    yield _dumps({'meta': meta}) + '\n'
+    state = _new_state()
+    for row in _drain(rows, state):
+        yield _dumps(row) + '\n'
+    if state['error'] is not None:
+        yield _dumps({'error': {'message': state['error'], 'count': state['count']}}) + '\n'
+        return
+    end = {'count': state['count']}
+    if state['trailer']:
+        if len(path) > 1:
+            end[path[0]] = state['trailer']
+        else:
+            end.update((k, v) for k, v in state['trailer'].items() if k not in RESERVED_KEYS)
+    yield _dumps({'end': end}) + '\n'
+
+
+def _open_object(obj, name):
+    """`{"a":1,...,"<name>":` : l'objet `obj` ouvert jusqu'à la clé `name`"""
+    head = _dumps({k: v for k, v in obj.items() if k != name})
+    return (head[:-1] + ',' if len(head) > 2 else '{') + _dumps(name) + ':'
+
+
+def _json_array_parts(meta, path, rows):
+    success = meta.get('success', True)
+    # Ouvre l'enveloppe jusqu'au tableau : {...,"result":{...,"data":[
+    level = {k: v for k, v in meta.items() if k != 'success'}
+    opening = []
+    for name in path:
+        opening.append(_open_object(level, name))
+        container = level
+        level = level.get(name) if isinstance(level.get(name), dict) else {}
+    yield ''.join(opening) + '['
+
+    state = _new_state()
+    for row in _drain(rows, state):
+        yield (',' if state['count'] > 1 else '') + _dumps(row)
+
+    closing = [']']
+    trailer = state['trailer']
+    reserved = RESERVED_KEYS if len(path) == 1 else ()
+    for key, value in trailer.items():
+        # Les champs déjà écrits en tête ne sont pas répétés
+        if key not in container and key != path[-1] and key not in reserved:
+            closing.append(',' + _dumps(key) + ':' + _dumps(value))
+    closing.append('}' * (len(path) - 1))
+    if state['error'] is not None:
+        closing.append(',"error":' + _dumps(state['error']))
+    ok = bool(success) and trailer.get('success', True) is not False and state['error'] is None
+    closing.append(',"count":' + str(state['count']) + ',"success":' + _dumps(ok) + '}')
+    yield ''.join(closing)
+
+
+def stream_response(meta, rows, key='data', mode=None, chunk_size=None):
+    """
+    Réponse Flask en flux ; `rows` est un itérable (idéalement un générateur).
+    `chunk_size` par défaut : 1 pour un générateur, `CHUNK_SIZE` sinon
+    """
+    mode = mode or stream_mode() or 'json'
+    if chunk_size is None:
+        chunk_size = 1 if isinstance(rows, types.GeneratorType) else CHUNK_SIZE
+    path = tuple(key.split('.'))
+    if mode == 'ndjson':
+        parts, mimetype = _ndjson_lines(meta, path, rows), NDJSON_MIMETYPE
+    else:
+        parts, mimetype = _json_array_parts(meta, path, rows), 'application/json'
+
+    return Response(
+        stream_with_context(_batched(parts, chunk_size)),
+        mimetype=mimetype,
+        headers={
+            'Cache-Control': 'no-cache',
+            # Désactive la mise en tampon des reverse proxies (nginx)
+            'X-Accel-Buffering': 'no'
+        }
+    )
@@ -5,10 +5,18 @@ Module Analyse Thématique - Routes API
 from flask import Blueprint, request, jsonify
 import logging
 
+from backend.core.responses import api_response
+from backend.core.streaming import stream_mode, stream_response
+
 logger = logging.getLogger(__name__)
 
 bp = Blueprint('analyse', __name__)
 
+# Textes acceptés par /batch
+MAX_BATCH_TEXTS = 200
+# Articles renvoyés au plus par /rss (`limit`)
+MAX_RSS_ITEMS = 500
+
 # ============================================
 # ANALYSE DE TEXTE
 # ============================================
@@ -43,6 +51,49 @@ def analyze_text():
             'error': str(e)
         }), 500
 
+@bp.route('/batch', methods=['POST'])
+def analyze_batch():
+    """Analyse de plusieurs textes, envoyés par lots au fournisseur d'IA (`mode`: keywords | tfidf)"""
+    try:
+        data = request.get_json(force=True)
+        texts = data.get('texts')
+
+        if not isinstance(texts, list) or not texts or not all(isinstance(text, str) for text in texts):
+            return jsonify({
+                'success': False,
+                'error': 'Liste de textes manquante'
+            }), 400
+
+        if len(texts) > MAX_BATCH_TEXTS:
+            return jsonify({
+                'success': False,
+                'error': f'Trop de textes (maximum {MAX_BATCH_TEXTS})'
+            }), 400
+
+        from .service import THEME_MODES, analyze_texts_with_ai
+        mode = data.get('mode', 'keywords')
+        if mode not in THEME_MODES:
+            return jsonify({
+                'success': False,
+                'error': f"Mode inconnu: {mode} ({', '.join(THEME_MODES)})"
+            }), 400
+
+        results = analyze_texts_with_ai(texts, provider=data.get('provider'), mode=mode)
+
+        return api_response({
+            'success': True,
+            'mode': mode,
+            'count': len(results),
+            'results': results
+        })
+
+    except Exception as e:
+        logger.error(f"Erreur analyse par lot: {e}", exc_info=True)
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 # ============================================
 # ANALYSE RSS
 # ============================================
@@ -60,11 +111,30 @@ def analyze_rss():
                 'error': 'URL manquante'
             }), 400
         
+        try:
+            limit = min(max(int(data.get('limit', 20)), 1), MAX_RSS_ITEMS)
+        except (TypeError, ValueError):
+            return jsonify({
+                'success': False,
+                'error': f'limit invalide (entier de 1 à {MAX_RSS_ITEMS})'
+            }), 400
+        
+        # Flux demandé : les articles partent au fur et à mesure du parsing
+        mode = stream_mode()
+        if mode:
+            from .service import announce_articles, iter_rss_feed
+            return stream_response(
+                {'success': True, 'status': 'ok', 'source': url},
+                announce_articles(iter_rss_feed(url, limit), url),
+                key='articles',
+                mode=mode
+            )
+        
         # Parser RSS
-        from .service import parse_rss_feed
-        articles = parse_rss_feed(url)
+        from .service import announce_articles, parse_rss_feed
+        articles = list(announce_articles(parse_rss_feed(url, limit), url))
         
-        return jsonify({
+        return api_response({
             'success': True,
             'status': 'ok',
             'source': url,
@@ -85,18 +155,15 @@ def analyze_rss():
 
 @bp.route('/keywords', methods=['GET'])
 def get_keywords():
-    """Retourne les mots-clés configurés"""
-    keywords = {
-        'geopolitique': ['conflit', 'diplomatie', 'sanction', 'alliance'],
-        'economie': ['inflation', 'croissance', 'commerce', 'dette'],
-        'social': ['manifestation', 'grève', 'réforme', 'social'],
-        'environnement': ['climat', 'pollution', 'énergie', 'écologie'],
-        'technologie': ['intelligence', 'numérique', 'cyber', 'innovation']
-    }
-    
+    """Retourne les mots-clés configurés (config/taxonomy.json)"""
+    from .taxonomy import get_taxonomy
+    taxonomy = get_taxonomy()
     return jsonify({
         'success': True,
-        'keywords': keywords
+        'version': taxonomy.version,
+        'fingerprint': taxonomy.fingerprint,
+        'keywords': taxonomy.themes,
+        'taxonomy': taxonomy.to_dict()
     })
 
 @bp.route('/sources', methods=['GET'])
@@ -128,9 +195,13 @@ def get_sources():
 @bp.route('/status', methods=['GET'])
 def status():
     """État du module"""
+    from .classifier import BACKEND
+    from .taxonomy import get_taxonomy
     return jsonify({
         'success': True,
         'module': 'Analyse Thématique',
         'version': '3.0.0',
-        'status': 'operational'
+        'status': 'operational',
+        'taxonomy': get_taxonomy().fingerprint,
+        'classifier': BACKEND
     })
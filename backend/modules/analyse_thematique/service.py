@@ -3,120 +3,170 @@ Module Analyse Thématique - Logique métier
 """
 
 import re
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
+
+from backend.core.events import publish
+from backend.core.runtime import on_fork
+
+from .taxonomy import get_taxonomy
+from .tokens import tokenize
 
 logger = logging.getLogger(__name__)
 
+# Liens déjà annoncés (borné : les plus anciens sont oubliés)
+SEEN_ARTICLES_MAX = 5000
+# Articles détaillés par événement `articles` (le compte reste exact)
+ANNOUNCE_LIMIT = 20
+
+# Analyses heuristiques conservées (clé : version de taxonomie + empreinte du texte)
+ANALYSIS_CACHE_MAX = 2048
+
+_seen_articles = OrderedDict()
+_seen_lock = threading.Lock()
+_analysis_cache = OrderedDict()
+_analysis_lock = threading.Lock()
+
 # ============================================
 # ANALYSE DE TEXTE
 # ============================================
 
-def analyze_text_content(text):
+def analyze_text_content(text, document=None):
     """
     Analyse le contenu d'un texte
     Retourne thème, sentiment, mots-clés, etc.
+    `document` : découpage déjà fait par l'appelant (sinon calculé ici)
     """
-    
-    # Mots-clés par thème
-    themes = {
-        'geopolitique': ['guerre', 'conflit', 'diplomatie', 'sanction', 'alliance', 'tension'],
-        'economie': ['inflation', 'croissance', 'commerce', 'dette', 'marché', 'économie'],
-        'social': ['manifestation', 'grève', 'réforme', 'social', 'protestation'],
-        'environnement': ['climat', 'pollution', 'énergie', 'écologie', 'carbone'],
-        'technologie': ['intelligence', 'numérique', 'cyber', 'innovation', 'tech']
-    }
-    
-    # Détection du thème principal
-    text_lower = text.lower()
-    theme_scores = {}
-    
-    for theme, keywords in themes.items():
-        score = sum(1 for kw in keywords if kw in text_lower)
-        if score > 0:
-            theme_scores[theme] = score
-    
+    taxonomy = get_taxonomy()
+    # Résultat mis en cache par version de taxonomie : un changement de mots-clés ne sert pas de résultat périmé
+    key = (taxonomy.fingerprint, hashlib.sha1(text.encode('utf-8', 'surrogatepass')).digest())
+    with _analysis_lock:
+        cached = _analysis_cache.get(key)
+        if cached is not None:
+            _analysis_cache.move_to_end(key)
+            return dict(cached)
+
+    # Normalisation et découpage une seule fois, réutilisés par toutes les passes
+    if document is None:
+        document = tokenize(text)
+    theme_counts = dict.fromkeys(taxonomy.themes, 0)
+    counts = {'positive': 0, 'negative': 0, 'risk': 0}
+    keywords_found = []
+    for term in taxonomy.match(document):
+        for role, theme in taxonomy.roles[term]:
+            if role == 'theme':
+                theme_counts[theme] += 1
+            else:
+                counts[role] += 1
+        if term in taxonomy.theme_terms:
+            keywords_found.append(term.rstrip('*'))
+
+    # Détection du thème principal (à égalité, le premier de la taxonomie)
+    theme_scores = {theme: score for theme, score in theme_counts.items() if score > 0}
     main_theme = max(theme_scores, key=theme_scores.get) if theme_scores else 'general'
-    
+
     # Analyse de sentiment
-    positive_words = ['succès', 'accord', 'paix', 'coopération', 'progrès', 'victoire']
-    negative_words = ['crise', 'conflit', 'guerre', 'tension', 'échec', 'problème']
-    
-    pos_count = sum(1 for w in positive_words if w in text_lower)
-    neg_count = sum(1 for w in negative_words if w in text_lower)
-    
+    pos_count, neg_count = counts['positive'], counts['negative']
     if pos_count > neg_count:
         sentiment = {'label': 'positif', 'score': min(50 + pos_count * 10, 90)}
     elif neg_count > pos_count:
         sentiment = {'label': 'négatif', 'score': max(50 - neg_count * 10, 10)}
     else:
         sentiment = {'label': 'neutre', 'score': 50}
-    
+
     # Niveau de risque
-    risk_keywords = ['crise', 'conflit', 'guerre', 'sanction', 'tension']
-    risk_count = sum(1 for kw in risk_keywords if kw in text_lower)
-    
-    if risk_count >= 3:
+    if counts['risk'] >= taxonomy.risk_thresholds['high']:
         risk_level = 'high'
-    elif risk_count >= 1:
+    elif counts['risk'] >= taxonomy.risk_thresholds['medium']:
         risk_level = 'medium'
     else:
         risk_level = 'low'
-    
-    # Extraction mots-clés
-    keywords_found = []
-    for theme_keywords in themes.values():
-        keywords_found.extend([kw for kw in theme_keywords if kw in text_lower])
-    
-    return {
+
+    result = {
         'theme': main_theme,
         'sentiment': sentiment,
         'risk_level': risk_level,
-        'keywords': list(set(keywords_found))[:10],  # Top 10 uniques
-        'word_count': len(text.split()),
+        'keywords': keywords_found[:10],  # Top 10 uniques
+        'word_count': document.word_count,
         'character_count': len(text)
     }
+    with _analysis_lock:
+        _analysis_cache[key] = result
+        if len(_analysis_cache) > ANALYSIS_CACHE_MAX:
+            _analysis_cache.popitem(last=False)
+    return dict(result)
+
+def clear_analysis_cache():
+    """Vide le cache des analyses heuristiques (benchmarks, diagnostic)"""
+    with _analysis_lock:
+        _analysis_cache.clear()
 
 # ============================================
 # PARSING RSS
 # ============================================
 
-def parse_rss_feed(url):
+def parse_rss_feed(url, limit=20):
     """
-    Parse un flux RSS et retourne les articles
+    Parse un flux RSS et retourne les articles ([] en cas d'erreur)
+    """
+    try:
+        return list(iter_rss_feed(url, limit))
+    except Exception:
+        return []
+
+def iter_rss_feed(url, limit=20):
+    """
+    Générateur d'articles RSS (utilisé tel quel par les réponses en flux)
+    `limit=None` parcourt tout le flux ; une erreur est journalisée puis
+    propagée, pour que la réponse en flux se termine par un échec
     """
     try:
         import feedparser
-        
+    except ImportError:
+        logger.error("feedparser non installé")
+        yield from iter_rss_fallback(url, limit)
+        return
+    
+    try:
         logger.info(f"Parsing RSS: {url}")
         feed = feedparser.parse(url)
+        source = feed.feed.get('title', 'Source inconnue')
+        entries = feed.entries if limit is None else feed.entries[:limit]
         
-        articles = []
-        for entry in feed.entries[:20]:  # Limiter à 20 articles
-            article = {
+        count = 0
+        for entry in entries:
+            yield {
                 'title': entry.get('title', 'Sans titre'),
                 'link': entry.get('link', ''),
                 'description': entry.get('summary', entry.get('description', '')),
                 'published': entry.get('published', ''),
-                'source': feed.feed.get('title', 'Source inconnue')
+                'source': source
             }
-            articles.append(article)
+            count += 1
         
-        logger.info(f"✓ {len(articles)} articles récupérés")
-        return articles
-    
-    except ImportError:
-        logger.error("feedparser non installé")
-        return parse_rss_fallback(url)
+        logger.info(f"✓ {count} articles récupérés")
     
     except Exception as e:
         logger.error(f"Erreur parsing RSS: {e}")
-        return []
+        raise
 
-def parse_rss_fallback(url):
+def parse_rss_fallback(url, limit=20):
     """
     Fallback si feedparser n'est pas disponible
     Utilise requests + regex basique
     """
+    try:
+        return list(iter_rss_fallback(url, limit))
+    except Exception:
+        return []
+
+def iter_rss_fallback(url, limit=20):
+    """
+    Générateur du fallback regex : les balises sont extraites au fil de l'eau
+    (erreurs journalisées puis propagées, comme `iter_rss_feed`)
+    """
     try:
         import requests
         
@@ -128,40 +178,135 @@ def parse_rss_fallback(url):
         xml_content = response.text
         
         # Extraction basique par regex
-        titles = re.findall(r'<title>(.*?)</title>', xml_content, re.DOTALL)
-        links = re.findall(r'<link>(.*?)</link>', xml_content, re.DOTALL)
+        titles = (m.group(1).strip() for m in re.finditer(r'<title>(.*?)</title>', xml_content, re.DOTALL))
+        links = (m.group(1).strip() for m in re.finditer(r'<link>(.*?)</link>', xml_content, re.DOTALL))
         
-        articles = []
-        for i in range(min(len(titles), len(links), 20)):
-            if i > 0:  # Skip le premier (titre du feed)
-                articles.append({
-                    'title': titles[i].strip(),
-                    'link': links[i].strip(),
-                    'description': '',
-                    'published': '',
-                    'source': titles[0].strip() if titles else 'Source inconnue'
-                })
+        # Le premier couple titre/lien décrit le flux lui-même
+        source = next(titles, None)
+        if source is None or next(links, None) is None:
+            return
         
-        logger.info(f"✓ {len(articles)} articles récupérés (fallback)")
-        return articles
+        count = 0
+        for title, link in zip(titles, links):
+            if limit is not None and count >= limit - 1:
+                break
+            yield {
+                'title': title,
+                'link': link,
+                'description': '',
+                'published': '',
+                'source': source or 'Source inconnue'
+            }
+            count += 1
+        
+        logger.info(f"✓ {count} articles récupérés (fallback)")
     
     except Exception as e:
         logger.error(f"Erreur fallback RSS: {e}")
-        return []
+        raise
+
+# ============================================
+# NOUVEAUX ARTICLES
+# ============================================
+
+def announce_articles(articles, source=''):
+    """
+    Laisse passer les articles et publie, en fin de parcours, ceux jamais vus
+    (événement `articles` de /api/events)
+    """
+    fresh = []
+    for article in articles:
+        link = article.get('link')
+        if link:
+            with _seen_lock:
+                if link in _seen_articles:
+                    _seen_articles.move_to_end(link)
+                else:
+                    _seen_articles[link] = True
+                    if len(_seen_articles) > SEEN_ARTICLES_MAX:
+                        _seen_articles.popitem(last=False)
+                    fresh.append(article)
+        yield article
+    
+    if fresh:
+        publish('articles', {
+            'source': source,
+            'count': len(fresh),
+            'articles': [
+                {'title': a['title'], 'link': a['link'], 'source': a.get('source', '')}
+                for a in fresh[:ANNOUNCE_LIMIT]
+            ]
+        })
 
 # ============================================
 # ANALYSE AVANCÉE (avec IA si disponible)
 # ============================================
 
-def analyze_with_ai(text, ai_manager=None):
+# Champs repris de la réponse IA (les autres restent heuristiques)
+AI_FIELDS = ('theme', 'sentiment', 'risk_level', 'keywords', 'summary')
+# En mode `tfidf`, thème et mots-clés restent ceux du classifieur (cohérents avec
+# theme_confidence / theme_scores)
+TFIDF_AI_FIELDS = ('sentiment', 'risk_level', 'summary')
+
+# Détection du thème : comptage de mots-clés ou classification TF-IDF du lot
+THEME_MODES = ('keywords', 'tfidf')
+
+
+def analyze_texts(texts, mode='keywords'):
+    """Analyse heuristique d'un lot ; en mode `tfidf`, thème, confiance et scores viennent du classifieur"""
+    if mode != 'tfidf':
+        return [analyze_text_content(text) for text in texts]
+
+    from .classifier import classify_documents
+    documents = [tokenize(text) for text in texts]
+    results = [analyze_text_content(text, document) for text, document in zip(texts, documents)]
+    for result, classification in zip(results, classify_documents(documents)):
+        result.update(
+            theme=classification['theme'],
+            theme_confidence=classification['confidence'],
+            theme_scores=classification['scores']
+        )
+    return results
+
+
+def analyze_texts_with_ai(texts, ai_manager=None, provider=None, mode='keywords'):
+    """
+    Analyse heuristique de chaque texte, enrichie par l'IA quand elle répond :
+    les textes partent par lots (une requête pour `AI_BATCH_SIZE` textes).
+    Le fournisseur `local` (stand-in sans modèle) n'enrichit rien : sans
+    fournisseur réel, le résultat est celui de l'analyse heuristique
+    """
+    results = analyze_texts(texts, mode)
+    if ai_manager is None:
+        from backend.core.ai_manager import get_ai_manager
+        ai_manager = get_ai_manager()
+    name = provider or ai_manager.default_provider
+    if name == 'local':
+        return results
+    try:
+        # Thèmes de la taxonomie courante : le prompt (donc sa clé de cache) suit sa version
+        enriched = ai_manager.analyze_texts(texts, provider=provider, themes=[*get_taxonomy().themes, 'general'])
+    except Exception as e:
+        logger.warning(f"IA non disponible: {e}, utilisation heuristique")
+        return results
+
+    fields = TFIDF_AI_FIELDS if mode == 'tfidf' else AI_FIELDS
+    for result, ai_result in zip(results, enriched):
+        if ai_result:
+            result.update({field: ai_result[field] for field in fields if ai_result.get(field)})
+            result['ai_provider'] = name
+    return results
+
+
+def analyze_with_ai(text, ai_manager=None, provider=None):
     """
     Analyse avec IA si disponible, sinon fallback heuristique
     """
-    if ai_manager:
-        try:
-            result = ai_manager.analyze_text(text)
-            return result
-        except Exception as e:
-            logger.warning(f"IA non disponible: {e}, utilisation heuristique")
-    
-    return analyze_text_content(text)
+    return analyze_texts_with_ai([text], ai_manager, provider)[0]
+
+
+@on_fork
+def _reset_after_fork():
+    global _seen_lock, _analysis_lock
+    _seen_lock = threading.Lock()
+    _analysis_lock = threading.Lock()
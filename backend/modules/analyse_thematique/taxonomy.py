@@ -0,0 +1,207 @@
+"""
+Module Analyse Thématique - Taxonomie des mots-clés
+
+    from .taxonomy import get_taxonomy
+    taxonomy = get_taxonomy()          # version compilée courante (immuable)
+    taxonomy.match(tokenize(text))     # mots-clés présents dans le document
+
+Un mot-clé désigne un mot entier, comparé sans accents ni casse et, si
+`stemming` est actif, après racinisation légère (voir tokens.py) ; il peut
+aussi être une expression de plusieurs mots, ou un préfixe terminé par `*`
+(« cyber* » couvre « cyberattaque »).
+
+Thèmes, listes de sentiment et mots de risque sont lus dans
+`config/taxonomy.json`, surveillé par le SettingsStore : une modification est
+compilée hors verrou puis remplace l'ancienne version en une seule affectation
+(une analyse en cours garde la version qu'elle a prise). Un fichier invalide
+est ignoré et la dernière version valide reste en place.
+
+`fingerprint` (numéro de version du fichier + empreinte du contenu) entre dans
+les clés des caches d'analyse : un changement de mots-clés invalide les
+résultats même si le numéro de version n'a pas été incrémenté.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+
+from backend.core.runtime import on_fork
+from backend.core.settings import get_store
+
+from .tokens import fold, normalize_term, stem_variants
+
+logger = logging.getLogger(__name__)
+
+TAXONOMY_PATH = Path('config/taxonomy.json')
+
+# Seuils de risque si le fichier n'en fixe pas
+DEFAULT_RISK_THRESHOLDS = {'high': 3, 'medium': 1}
+
+
+class TaxonomyError(ValueError):
+    """Contenu de taxonomie invalide"""
+
+
+def _terms(value, where):
+    if not isinstance(value, list) or not all(isinstance(term, str) and term.strip() for term in value):
+        raise TaxonomyError(f"{where}: liste de mots-clés attendue")
+    return [term.strip().lower() for term in value]
+
+
+class Taxonomy:
+    """Taxonomie compilée : chaque mot-clé distinct et les rôles qu'il porte"""
+
+    def __init__(self, data):
+        if not isinstance(data, dict) or not isinstance(data.get('themes'), dict):
+            raise TaxonomyError("section 'themes' manquante")
+        sentiment = data.get('sentiment') or {}
+        risk = data.get('risk') or {}
+
+        self.version = data.get('version', 0)
+        self.stemming = bool(data.get('stemming', True))
+        self.themes = {theme: _terms(terms, f"themes.{theme}") for theme, terms in data['themes'].items()}
+        self.positive = _terms(sentiment.get('positive', []), 'sentiment.positive')
+        self.negative = _terms(sentiment.get('negative', []), 'sentiment.negative')
+        self.risk = _terms(risk.get('keywords', []), 'risk.keywords')
+        self.risk_thresholds = {
+            level: int(risk.get(level, default)) for level, default in DEFAULT_RISK_THRESHOLDS.items()
+        }
+
+        # Un mot présent dans plusieurs listes n'est cherché qu'une fois
+        roles = {}
+        for theme, terms in self.themes.items():
+            for term in terms:
+                roles.setdefault(term, set()).add(('theme', theme))
+        for role, terms in (('positive', self.positive), ('negative', self.negative), ('risk', self.risk)):
+            for term in terms:
+                roles.setdefault(term, set()).add((role, None))
+        self.terms = tuple(roles)
+        self.theme_terms = frozenset(term for terms in self.themes.values() for term in terms)
+        self.roles = {term: frozenset(term_roles) for term, term_roles in roles.items()}
+
+        # Index par forme normalisée : mot seul, expression (par longueur) ou préfixe
+        # `term_keys` : mot-clé -> caractéristique (racine, tuple de racines ou préfixe `xxx*`)
+        self.word_index = {}
+        self.phrase_index = {}
+        self.prefix_index = []
+        self.term_keys = {}
+        for term in self.terms:
+            if term.endswith('*'):
+                prefix = fold(term[:-1]).strip()
+                if not prefix:
+                    raise TaxonomyError(f"préfixe vide: {term!r}")
+                self.prefix_index.append((prefix, term))
+                self.term_keys[term] = term
+                continue
+            key = normalize_term(term, self.stemming)
+            if not key:
+                raise TaxonomyError(f"mot-clé sans lettre ni chiffre: {term!r}")
+            if len(key) == 1:
+                self.word_index.setdefault(key[0], []).append(term)
+                self.term_keys[term] = key[0]
+            else:
+                self.phrase_index.setdefault(len(key), {}).setdefault(key, []).append(term)
+                self.term_keys[term] = key
+
+        # Recherche directe dans le texte normalisé : « ␣forme␣ » pour chaque forme d'une
+        # racine ; l'ancre « ␣début commun » écarte d'une seule recherche une racine absente
+        self._word_forms = []
+        for word, terms in self.word_index.items():
+            forms = self._forms(word)
+            self._word_forms.append((self._anchor(forms), tuple(f" {form} " for form in forms), terms))
+        self._phrase_forms = [
+            (size, gram, tuple(tuple(f" {form} " for form in self._forms(word)) for word in gram))
+            for size, phrases in self.phrase_index.items() for gram in phrases
+        ]
+        self._prefixes = [(f" {prefix}", term) for prefix, term in self.prefix_index]
+
+        canonical = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+        self.fingerprint = f"{self.version}-{hashlib.sha1(canonical.encode('utf-8')).hexdigest()[:12]}"
+
+    def _forms(self, key):
+        """Mots du texte normalisé qui donnent la caractéristique `key`"""
+        return tuple(stem_variants(key)) if self.stemming else (key,)
+
+    @staticmethod
+    def _anchor(forms):
+        """Début commun des formes précédé d'une espace (None s'il n'y a qu'une forme)"""
+        if len(forms) == 1:
+            return None
+        common = forms[0]
+        for form in forms[1:]:
+            while not form.startswith(common):
+                common = common[:-1]
+        return ' ' + common
+
+    def match(self, document):
+        """Mots-clés présents dans un `Document`, dans l'ordre de la taxonomie"""
+        text = document.normalized
+        found = set()
+        for anchor, forms, terms in self._word_forms:
+            if anchor is not None and anchor not in text:
+                continue
+            for form in forms:
+                if form in text:
+                    found.update(terms)
+                    break
+        # Expressions : n-grammes calculés seulement si chacun de leurs mots est présent
+        ngrams = {}
+        for size, gram, word_forms in self._phrase_forms:
+            if all(any(form in text for form in forms) for forms in word_forms):
+                if size not in ngrams:
+                    ngrams[size] = document.ngrams(size, self.stemming)
+                if gram in ngrams[size]:
+                    found.update(self.phrase_index[size][gram])
+        for prefix, term in self._prefixes:
+            if prefix in text:
+                found.add(term)
+        return [term for term in self.terms if term in found]
+
+    def to_dict(self):
+        return {
+            'version': self.version,
+            'fingerprint': self.fingerprint,
+            'stemming': self.stemming,
+            'themes': self.themes,
+            'sentiment': {'positive': self.positive, 'negative': self.negative},
+            'risk': dict(self.risk_thresholds, keywords=self.risk)
+        }
+
+
+_current = None
+_load_lock = threading.Lock()
+
+
+def _swap(data):
+    """Compile puis remplace la taxonomie courante ; l'ancienne reste si `data` est invalide"""
+    global _current
+    try:
+        taxonomy = Taxonomy(data)
+    except (TaxonomyError, TypeError, ValueError) as e:
+        logger.error(f"[ERREUR] Taxonomie invalide ignoree ({TAXONOMY_PATH}): {e}")
+        return False
+    _current = taxonomy
+    logger.info(f"[OK] Taxonomie {taxonomy.fingerprint}: {len(taxonomy.terms)} mots-cles")
+    return True
+
+
+def get_taxonomy():
+    """Taxonomie courante (chargée et abonnée aux modifications au premier appel)"""
+    global _current
+    if _current is None:
+        with _load_lock:
+            if _current is None:
+                store = get_store(TAXONOMY_PATH)
+                if not _swap(store.get()):
+                    # Aucune version valide : analyse sans mot-clé (thème `general`)
+                    _current = Taxonomy({'themes': {}})
+                store.subscribe(_swap)
+    return _current
+
+
+@on_fork
+def _reset_after_fork():
+    global _load_lock
+    _load_lock = threading.Lock()
@@ -0,0 +1,174 @@
+"""
+Module Analyse Thématique - Normalisation et découpage en mots
+
+    doc = tokenize("Les sanctions économiques")
+    doc.normalized        # ' les sanctions economiques '
+    doc.has_word('sanctions')  # True
+    doc.tokens            # ['les', 'sanctions', 'economiques']
+    doc.terms(stemming=True)   # {'le', 'sanction', 'economique'}
+
+Le texte est normalisé une seule fois par document (Unicode NFKD, accents
+retirés, casse repliée, tout caractère hors mot remplacé par une espace) ;
+toutes les passes de score (thèmes, sentiment, risque) réutilisent le même
+`Document`. Les mots-clés de la taxonomie passent par les mêmes fonctions, si
+bien que « economie » et « Économie » se confondent et que « tech » ne trouve
+plus « technique ».
+
+Coût : un texte représentable en Latin-1 (cas courant du français) est
+normalisé (et ses mots comptés) par des tables d'octets dérivées de `fold` au
+chargement ; les autres passent par `fold`. La recherche d'un mot entier est
+alors une recherche de sous-chaîne « ␣mot␣ » dans le texte normalisé : aucune
+liste de mots n'est construite pour l'analyse par mots-clés (`tokens` est
+calculé à la demande, pour la classification TF-IDF).
+
+La racinisation est volontairement légère (pluriels et quelques finales du
+français) : elle rapproche « sanction »/« sanctions » ou « social »/« sociaux »
+sans fusionner des mots distincts.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+WORD = re.compile(r'\w+')
+
+# (finale, remplacement) appliqués au premier qui correspond ; ordre significatif
+SUFFIXES = (
+    ('eaux', 'eau'),
+    ('aux', 'al'),
+    ('s', ''),
+    ('x', '')
+)
+# Mots plus courts laissés intacts (« pays », « gaz », « lois »…)
+MIN_STEM_LENGTH = 5
+
+
+def fold(text):
+    """Minuscules sans accents ni variantes de compatibilité (ﬁ -> fi, ² -> 2)"""
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def _latin1_tables():
+    """
+    Tables d'octets Latin-1 : caractère replié (ou espace hors mot), et forme
+    « w »/espace pour compter les mots ; les octets dont le repli n'est pas un
+    seul caractère Latin-1 (ß, µ, ½…) renvoient le texte vers `fold`
+    """
+    table = bytearray(range(256))
+    shape = bytearray(b' ' * 256)
+    special = []
+    for code in range(256):
+        folded = fold(chr(code))
+        if len(folded) != 1 or ord(folded) > 255:
+            special.append(bytes([code]))
+        elif WORD.fullmatch(folded):
+            table[code] = ord(folded)
+            shape[code] = ord('w')
+        else:
+            table[code] = 0x20
+    return bytes(table), bytes(shape), tuple(special)
+
+
+LATIN1_TABLE, LATIN1_SHAPE, LATIN1_SPECIAL = _latin1_tables()
+
+
+def _normalize(text):
+    """(mots repliés séparés par des espaces et bornés par une espace, nombre de mots)"""
+    try:
+        encoded = text.encode('latin-1')
+    except UnicodeEncodeError:
+        encoded = None
+    if encoded is None or any(byte in encoded for byte in LATIN1_SPECIAL):
+        words = WORD.findall(fold(text))
+        return ' ' + ' '.join(words) + ' ', len(words)
+    # Un mot commence à chaque « espace suivie d'un caractère de mot »
+    count = (b' ' + encoded.translate(LATIN1_SHAPE)).count(b' w')
+    return ' ' + encoded.translate(LATIN1_TABLE).decode('latin-1') + ' ', count
+
+
+def normalize(text):
+    """Mots repliés séparés par des espaces, bornés par une espace de chaque côté"""
+    return _normalize(text)[0]
+
+
+@lru_cache(maxsize=65536)
+def stem(token):
+    """Racine légère d'un mot déjà replié"""
+    if len(token) < MIN_STEM_LENGTH or token.isdigit():
+        return token
+    for suffix, replacement in SUFFIXES:
+        if token.endswith(suffix):
+            return token[:-len(suffix)] + replacement
+    return token
+
+
+def stem_variants(root):
+    """Mots repliés dont la racine est `root` (inverse de `stem`)"""
+    candidates = {root, root + 's', root + 'x'}
+    if root.endswith('al'):
+        candidates.add(root[:-2] + 'aux')
+    if root.endswith('eau'):
+        candidates.add(root[:-3] + 'eaux')
+    return sorted(candidate for candidate in candidates if stem(candidate) == root)
+
+
+class Document:
+    """Texte normalisé, partagé par les passes d'analyse"""
+
+    __slots__ = ('text', 'normalized', 'word_count', '_tokens', '_stems', '_sets')
+
+    def __init__(self, text):
+        self.text = text
+        self.normalized, self.word_count = _normalize(text)
+        self._tokens = None
+        self._stems = None
+        self._sets = {}
+
+    @property
+    def tokens(self):
+        if self._tokens is None:
+            self._tokens = self.normalized.split()
+        return self._tokens
+
+    def has_word(self, word):
+        """Mot entier présent (recherche de sous-chaîne, sans découpage)"""
+        return f" {word} " in self.normalized
+
+    def has_prefix(self, prefix):
+        """Un mot commence par `prefix`"""
+        return f" {prefix}" in self.normalized
+
+    def sequence(self, stemming=False):
+        """Mots dans l'ordre du texte, racinisés si demandé"""
+        if not stemming:
+            return self.tokens
+        if self._stems is None:
+            self._stems = [stem(token) for token in self.tokens]
+        return self._stems
+
+    def terms(self, stemming=False):
+        """Ensemble des mots distincts"""
+        terms = self._sets.get(stemming)
+        if terms is None:
+            # Racines calculées sur les mots distincts, pas sur chaque occurrence
+            terms = frozenset(stem(token) for token in self.terms()) if stemming else frozenset(self.tokens)
+            self._sets[stemming] = terms
+        return terms
+
+    def ngrams(self, size, stemming=False):
+        """Suites de `size` mots consécutifs (expressions de plusieurs mots)"""
+        words = self.sequence(stemming)
+        return {tuple(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def tokenize(text):
+    return Document(text)
+
+
+def normalize_term(term, stemming=False):
+    """Mots d'un mot-clé (ou d'une expression) normalisés comme ceux des documents"""
+    words = WORD.findall(fold(term))
+    return tuple(stem(word) for word in words) if stemming else tuple(words)
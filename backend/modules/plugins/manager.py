@@ -0,0 +1,290 @@
+"""
+Module Plugins - Découverte et exécution des plugins
+
+Un plugin est un dossier contenant `plugin.py` (classe `Plugin(settings)` avec
+une méthode `run(payload)`) et, optionnellement, `metadata.json`.
+Les dossiers sont cherchés dans `plugins/` puis à la racine du projet.
+
+La configuration (`config/plugins.json`) vient du store partagé
+`backend.core.settings` : lue une fois, puis rechargée à chaud. À chaque
+modification, les instances chargées la reçoivent par `update_settings(settings)`
+si elles l'exposent, sinon sont recréées à partir du module déjà importé.
+"""
+
+import importlib.util
+import json
+import logging
+import threading
+from pathlib import Path
+
+from backend.core.events import publish
+from backend.core.runtime import on_fork
+from backend.core.settings import get_store
+
+from .monitor import get_monitor, instrument_plugin
+from .result import PluginResult, ResultCache
+
+logger = logging.getLogger(__name__)
+
+PLUGIN_DIRS = [Path('plugins'), Path('.')]
+
+# Durée de vie par défaut d'un résultat en cache (surchargée par `cache_ttl` dans metadata.json)
+DEFAULT_CACHE_TTL = 300
+
+# Au-delà, un résultat produit par `iter_data` n'est pas conservé en cache
+STREAM_CACHE_MAX_ROWS = 1000
+
+
+class PluginNotFound(LookupError):
+    """Aucun plugin ne correspond à l'identifiant demandé"""
+
+
+def normalize_id(plugin_id):
+    """`water_security` et `water-security` désignent le même plugin"""
+    return plugin_id.strip().lower().replace('_', '-')
+
+
+class PluginManager:
+    """Registre des plugins du processus (découverte paresseuse, instances réutilisées)"""
+
+    def __init__(self, search_paths=None):
+        self.search_paths = [Path(p) for p in (search_paths or PLUGIN_DIRS)]
+        self._lock = threading.RLock()
+        self._entries = None
+        self._instances = {}
+        self._modules = {}
+        self._subscribed = False
+        self.cache = ResultCache()
+
+    # ------------------------------------------------------------
+    # Découverte
+    # ------------------------------------------------------------
+
+    def _discover(self):
+        entries = {}
+        for base in self.search_paths:
+            if not base.is_dir():
+                continue
+            for folder in sorted(base.iterdir()):
+                plugin_file = folder / 'plugin.py'
+                if not plugin_file.is_file():
+                    continue
+                plugin_id = normalize_id(folder.name)
+                if plugin_id in entries:
+                    continue
+                metadata = {}
+                metadata_file = folder / 'metadata.json'
+                if metadata_file.is_file():
+                    try:
+                        metadata = json.loads(metadata_file.read_text(encoding='utf-8'))
+                    except Exception as e:
+                        logger.warning(f"metadata.json invalide pour {plugin_id}: {e}")
+                entries[plugin_id] = {
+                    'id': plugin_id,
+                    'path': plugin_file,
+                    'module_name': f"geopolis_plugin_{folder.name.replace('-', '_')}",
+                    'metadata': metadata
+                }
+        logger.info(f"[OK] {len(entries)} plugins detectes")
+        return entries
+
+    def _get_entries(self):
+        if self._entries is None:
+            with self._lock:
+                if self._entries is None:
+                    self._entries = self._discover()
+        return self._entries
+
+    def _get_settings(self):
+        store = get_store()
+        if not self._subscribed:
+            store.subscribe(self.apply_settings)
+            self._subscribed = True
+        return store.get()
+
+    def apply_settings(self, settings):
+        """Propage une nouvelle configuration aux plugins déjà chargés"""
+        with self._lock:
+            for plugin_id, instance in list(self._instances.items()):
+                try:
+                    if hasattr(instance, 'update_settings'):
+                        instance.update_settings(settings)
+                    else:
+                        # Les plugins dérivent souvent leurs clés dans __init__ : on les recrée
+                        plugin = self._modules[plugin_id].Plugin(settings)
+                        self._instances[plugin_id] = instrument_plugin(plugin_id, plugin)
+                except Exception as e:
+                    logger.error(f"[ERREUR] Rechargement configuration {plugin_id}: {e}")
+            # Les résultats en cache ont pu être calculés avec d'anciennes clés
+            self.cache.clear()
+        logger.info(f"[OK] Configuration appliquee a {len(self._instances)} plugin(s)")
+
+    def list_plugins(self):
+        """Liste des plugins disponibles (sans les importer)"""
+        return [
+            {
+                'id': entry['id'],
+                'name': entry['metadata'].get('name', entry['id']),
+                'metadata': entry['metadata'],
+                'loaded': entry['id'] in self._instances
+            }
+            for entry in self._get_entries().values()
+        ]
+
+    # ------------------------------------------------------------
+    # Chargement
+    # ------------------------------------------------------------
+
+    def get_plugin(self, plugin_id):
+        """Instance du plugin, importée et instanciée au premier appel"""
+        plugin_id = normalize_id(plugin_id)
+        instance = self._instances.get(plugin_id)
+        if instance is not None:
+            return instance
+
+        entry = self._get_entries().get(plugin_id)
+        if entry is None:
+            raise PluginNotFound(plugin_id)
+
+        with self._lock:
+            instance = self._instances.get(plugin_id)
+            if instance is None:
+                spec = importlib.util.spec_from_file_location(entry['module_name'], entry['path'])
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+                instance = instrument_plugin(plugin_id, module.Plugin(self._get_settings()))
+                self._modules[plugin_id] = module
+                self._instances[plugin_id] = instance
+                logger.info(f"[OK] Plugin {plugin_id} charge")
+        return instance
+
+    # ------------------------------------------------------------
+    # Exécution
+    # ------------------------------------------------------------
+
+    def execute_plugin(self, plugin_id, payload=None, use_cache=True):
+        """Exécute un plugin (ou sert le cache) et renvoie l'enveloppe normalisée"""
+        plugin = self.get_plugin(plugin_id)
+        plugin_id = normalize_id(plugin_id)
+        result, cached = self.run_plugin(plugin_id, plugin, payload, use_cache)
+
+        return {
+            'success': result.success,
+            'plugin': plugin_id,
+            'cached': cached,
+            'result': result.to_dict()
+        }
+
+    def stream_plugin(self, plugin_id, payload=None, use_cache=True):
+        """
+        Retourne `(meta, lignes)` pour une réponse en flux sous la clé `result.data`
+        (même enveloppe que `execute_plugin`).
+        Un plugin peut exposer `iter_data(payload)` : générateur des lignes de
+        `data` qui retourne (`return`) le reste de son résultat ; la liste
+        complète n'est alors matérialisée que pour le cache, et seulement sous
+        `STREAM_CACHE_MAX_ROWS` lignes. Sinon, ou si le cache a la réponse, on
+        itère sur `data` du résultat.
+        """
+        plugin = self.get_plugin(plugin_id)
+        plugin_id = normalize_id(plugin_id)
+
+        if hasattr(plugin, 'iter_data'):
+            hit = use_cache and self.cache.get(ResultCache.make_key(plugin_id, payload)) is not None
+            if not hit:
+                meta = {'success': True, 'plugin': plugin_id, 'cached': False, 'result': {}}
+                return meta, self._iter_rows(plugin_id, payload, plugin.iter_data(payload or {}))
+
+        result, cached = self.run_plugin(plugin_id, plugin, payload, use_cache)
+        meta = result.to_dict()
+        rows = meta.pop('data')
+        meta = {'success': result.success, 'plugin': plugin_id, 'cached': cached, 'result': meta}
+        return meta, iter(rows)
+
+    def _iter_rows(self, plugin_id, payload, rows):
+        """Lignes de `iter_data`, puis le reste du résultat normalisé (sans `data`)"""
+        kept = []
+        # La mesure couvre toute la durée du flux, pas seulement le premier élément
+        with get_monitor().track(plugin_id) as outcome:
+            iterator = iter(rows)
+            while True:
+                try:
+                    row = next(iterator)
+                except StopIteration as stop:
+                    rest = stop.value
+                    break
+                if kept is not None:
+                    kept.append(row)
+                    if len(kept) > STREAM_CACHE_MAX_ROWS:
+                        kept = None
+                yield row
+            result = PluginResult.from_raw(plugin_id, dict(rest or {}, data=kept or []))
+            if not result.success:
+                outcome['ok'] = False
+                outcome['error'] = result.error
+
+        if result.success and kept is not None:
+            metadata = self._get_entries()[plugin_id]['metadata']
+            self.cache.set(ResultCache.make_key(plugin_id, payload), result,
+                           metadata.get('cache_ttl', DEFAULT_CACHE_TTL))
+
+        publish('plugin', {
+            'plugin': plugin_id,
+            'success': result.success,
+            'timestamp': result.timestamp,
+            'message': result.message or result.error
+        })
+        trailer = result.to_dict()
+        del trailer['data']
+        return trailer
+
+    def run_plugin(self, plugin_id, plugin, payload=None, use_cache=True):
+        """Retourne `(PluginResult, servi_depuis_le_cache)`"""
+        key = ResultCache.make_key(plugin_id, payload)
+        if use_cache:
+            result = self.cache.get(key)
+            if result is not None:
+                get_monitor().record_cache_hit(plugin_id)
+                return result, True
+
+        with get_monitor().track(plugin_id) as outcome:
+            result = PluginResult.from_raw(plugin_id, plugin.run(payload or {}))
+            if not result.success:
+                outcome['ok'] = False
+                outcome['error'] = result.error
+
+        if result.success:
+            metadata = self._get_entries()[plugin_id]['metadata']
+            self.cache.set(key, result, metadata.get('cache_ttl', DEFAULT_CACHE_TTL))
+
+        publish('plugin', {
+            'plugin': plugin_id,
+            'success': result.success,
+            'timestamp': result.timestamp,
+            'message': result.message or result.error
+        })
+        return result, False
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_manager():
+    """Gestionnaire partagé du processus"""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = PluginManager()
+    return _manager
+
+
+@on_fork
+def _reset_after_fork():
+    # Registre et instances préchargés par le parent restent utilisables ;
+    # seuls les verrous (potentiellement tenus au moment du fork) sont recréés
+    global _manager_lock
+    _manager_lock = threading.Lock()
+    if _manager is not None:
+        _manager._lock = threading.RLock()
+        _manager.cache._lock = threading.Lock()
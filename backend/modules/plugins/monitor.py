@@ -0,0 +1,260 @@
+"""
+Module Plugins - Monitoring en mémoire
+
+Échantillonne la latence d'exécution de chaque plugin, le taux d'erreur des
+APIs amont et le nombre de recours aux fallbacks (`_get_*_fallback`).
+Tout reste en mémoire : une fenêtre glissante par clé, des compteurs simples.
+"""
+
+import functools
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+
+from backend.core.runtime import on_fork
+
+# Nombre d'échantillons conservés par fenêtre de latence
+WINDOW_SIZE = 1024
+
+FALLBACK_PATTERN = re.compile(r'^_get_\w+_fallback$')
+
+_current = threading.local()
+
+
+def current_plugin():
+    """Plugin en cours d'exécution sur ce thread (ou None)"""
+    return getattr(_current, 'plugin_id', None)
+
+
+class LatencyWindow:
+    """Fenêtre glissante de durées (secondes) avec percentiles à la demande"""
+
+    __slots__ = ('samples',)
+
+    def __init__(self, size=WINDOW_SIZE):
+        self.samples = deque(maxlen=size)
+
+    def add(self, seconds):
+        # deque.append est atomique sous le GIL : pas de verrou sur le chemin chaud
+        self.samples.append(seconds)
+
+    def percentiles(self):
+        values = sorted(self.samples)
+        if not values:
+            return {'p50_ms': None, 'p90_ms': None, 'p99_ms': None, 'max_ms': None}
+
+        def pick(q):
+            index = min(len(values) - 1, int(round(q * (len(values) - 1))))
+            return round(values[index] * 1000, 2)
+
+        return {
+            'p50_ms': pick(0.50),
+            'p90_ms': pick(0.90),
+            'p99_ms': pick(0.99),
+            'max_ms': round(values[-1] * 1000, 2)
+        }
+
+
+class PluginStats:
+    """Statistiques d'un plugin"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.runs = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.fallbacks = Counter()
+        self.latency = LatencyWindow()
+        self.last_error = None
+        self.last_run = None
+
+    def snapshot(self):
+        with self.lock:
+            runs, errors, cache_hits = self.runs, self.errors, self.cache_hits
+            fallbacks = dict(self.fallbacks)
+            last_error, last_run = self.last_error, self.last_run
+        return {
+            'runs': runs,
+            'errors': errors,
+            'error_rate': round(errors / runs, 4) if runs else 0.0,
+            'cache_hits': cache_hits,
+            'fallbacks': fallbacks,
+            'fallbacks_total': sum(fallbacks.values()),
+            'latency': self.latency.percentiles(),
+            'last_error': last_error,
+            'last_run': last_run
+        }
+
+
+class UpstreamStats:
+    """Statistiques d'une API amont (par hôte)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.short_circuited = 0
+        self.plugins = Counter()
+        self.latency = LatencyWindow()
+        self.last_status = None
+        self.last_error = None
+
+    def snapshot(self):
+        with self.lock:
+            calls, errors, short_circuited = self.calls, self.errors, self.short_circuited
+            plugins = dict(self.plugins)
+            last_status, last_error = self.last_status, self.last_error
+        return {
+            'calls': calls,
+            'errors': errors,
+            'error_rate': round(errors / calls, 4) if calls else 0.0,
+            'short_circuited': short_circuited,
+            'plugins': plugins,
+            'latency': self.latency.percentiles(),
+            'last_status': last_status,
+            'last_error': last_error
+        }
+
+
+class PluginMonitor:
+    """Collecteur central des métriques plugins"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._plugins = {}
+        self._upstreams = {}
+        self.started_at = time.time()
+
+    def _plugin(self, plugin_id):
+        stats = self._plugins.get(plugin_id)
+        if stats is None:
+            with self._lock:
+                stats = self._plugins.setdefault(plugin_id, PluginStats())
+        return stats
+
+    def _upstream(self, host):
+        stats = self._upstreams.get(host)
+        if stats is None:
+            with self._lock:
+                stats = self._upstreams.setdefault(host, UpstreamStats())
+        return stats
+
+    @contextmanager
+    def track(self, plugin_id):
+        """Mesure une exécution de plugin et l'associe au thread courant"""
+        previous = getattr(_current, 'plugin_id', None)
+        _current.plugin_id = plugin_id
+        outcome = {'ok': True, 'error': None}
+        start = time.perf_counter()
+        try:
+            yield outcome
+        except Exception as e:
+            outcome['ok'] = False
+            outcome['error'] = str(e)
+            raise
+        finally:
+            _current.plugin_id = previous
+            self.record_run(plugin_id, time.perf_counter() - start, outcome['ok'], outcome['error'])
+
+    def record_run(self, plugin_id, elapsed, ok=True, error=None):
+        stats = self._plugin(plugin_id)
+        stats.latency.add(elapsed)
+        with stats.lock:
+            stats.runs += 1
+            stats.last_run = time.time()
+            if not ok:
+                stats.errors += 1
+                stats.last_error = error
+
+    def record_cache_hit(self, plugin_id):
+        stats = self._plugin(plugin_id)
+        with stats.lock:
+            stats.cache_hits += 1
+
+    def record_fallback(self, plugin_id, name):
+        stats = self._plugin(plugin_id)
+        with stats.lock:
+            stats.fallbacks[name] += 1
+
+    def record_upstream(self, host, elapsed, ok=True, status=None, error=None):
+        stats = self._upstream(host)
+        stats.latency.add(elapsed)
+        plugin_id = current_plugin()
+        with stats.lock:
+            stats.calls += 1
+            stats.last_status = status
+            if plugin_id:
+                stats.plugins[plugin_id] += 1
+            if not ok:
+                stats.errors += 1
+                stats.last_error = error or (f'HTTP {status}' if status else None)
+
+    def record_short_circuit(self, host):
+        """Appel évité par le disjoncteur (pas d'aller-retour réseau)"""
+        stats = self._upstream(host)
+        with stats.lock:
+            stats.short_circuited += 1
+
+    def snapshot(self):
+        """Vue JSON-sérialisable de toutes les métriques"""
+        with self._lock:
+            plugins = list(self._plugins.items())
+            upstreams = list(self._upstreams.items())
+
+        upstream_view = {host: stats.snapshot() for host, stats in upstreams}
+        # Les amonts les plus lents en premier : c'est ce que l'on cherche
+        slowest = sorted(
+            upstream_view,
+            key=lambda h: upstream_view[h]['latency']['p90_ms'] or 0,
+            reverse=True
+        )
+
+        return {
+            'uptime_seconds': round(time.time() - self.started_at, 1),
+            'plugins': {pid: stats.snapshot() for pid, stats in plugins},
+            'upstreams': upstream_view,
+            'slowest_upstreams': slowest[:5]
+        }
+
+    def reset(self):
+        with self._lock:
+            self._plugins = {}
+            self._upstreams = {}
+            self.started_at = time.time()
+
+
+monitor = PluginMonitor()
+
+
+def get_monitor():
+    """Retourne le moniteur partagé du processus"""
+    return monitor
+
+
+@on_fork
+def _reset_after_fork():
+    # Chaque worker mesure ses propres requêtes
+    monitor._lock = threading.Lock()
+    monitor.reset()
+
+
+def instrument_plugin(plugin_id, instance):
+    """Enveloppe les méthodes `_get_*_fallback` d'une instance pour les compter"""
+    for name in dir(type(instance)):
+        if not FALLBACK_PATTERN.match(name):
+            continue
+        method = getattr(instance, name, None)
+        if not callable(method):
+            continue
+        setattr(instance, name, _count_fallback(plugin_id, name, method))
+    return instance
+
+
+def _count_fallback(plugin_id, name, method):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        monitor.record_fallback(plugin_id, name)
+        return method(*args, **kwargs)
+    return wrapper
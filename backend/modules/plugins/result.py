@@ -0,0 +1,191 @@
+"""
+Module Plugins - Modèle de résultat normalisé
+
+Les plugins renvoient des enveloppes hétérogènes (`status`/`data`/`metrics`
+pour les uns, `success`/`error` pour les autres). `PluginResult` les ramène à
+une forme unique ; les résultats mis en cache sont stockés sous forme binaire
+compacte (msgpack si disponible, sinon JSON compressé) et ne sont rendus en
+JSON qu'au moment de la réponse HTTP.
+"""
+
+import json
+import logging
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+# Clés de l'enveloppe standard ; tout le reste va dans `extra`
+ENVELOPE_KEYS = ('status', 'success', 'plugin', 'timestamp', 'data', 'metrics', 'message', 'error')
+
+
+class PluginResult:
+    """Résultat d'exécution d'un plugin"""
+
+    __slots__ = ('plugin', 'success', 'status', 'timestamp', 'data', 'metrics', 'message', 'error', 'extra')
+
+    def __init__(self, plugin, success=True, timestamp=None, data=None, metrics=None,
+                 message='', error=None, extra=None, status=None):
+        self.plugin = plugin
+        self.success = success
+        # Statut propre au plugin (« partial », « degraded »...) conservé tel quel
+        self.status = status or ('success' if success else 'error')
+        self.timestamp = timestamp or datetime.now().isoformat()
+        self.data = data if data is not None else []
+        self.metrics = metrics if metrics is not None else {}
+        self.message = message
+        self.error = error
+        self.extra = extra if extra is not None else {}
+
+    @classmethod
+    def from_raw(cls, plugin_id, raw):
+        """Adapte la sortie brute de `Plugin.run()` au modèle commun"""
+        if isinstance(raw, cls):
+            return raw
+        if not isinstance(raw, dict):
+            return cls(plugin_id, data=raw if isinstance(raw, list) else [raw])
+
+        if 'success' in raw:
+            success = bool(raw['success'])
+        else:
+            success = raw.get('status', 'success') != 'error'
+
+        message = raw.get('message') or ''
+        error = raw.get('error') or (None if success else message or 'Erreur inconnue')
+
+        data = raw.get('data')
+        if data is None:
+            data = []
+        elif not isinstance(data, list):
+            data = [data]
+
+        return cls(
+            plugin=plugin_id,
+            success=success,
+            timestamp=raw.get('timestamp'),
+            data=data,
+            metrics=raw.get('metrics') or {},
+            message=message,
+            error=error,
+            extra={k: v for k, v in raw.items() if k not in ENVELOPE_KEYS},
+            status=raw.get('status')
+        )
+
+    def to_dict(self):
+        result = {
+            'plugin': self.plugin,
+            'success': self.success,
+            'status': self.status,
+            'timestamp': self.timestamp,
+            'data': self.data,
+            'metrics': self.metrics,
+            'message': self.message,
+            'error': self.error
+        }
+        result.update(self.extra)
+        return result
+
+    @classmethod
+    def from_dict(cls, values):
+        return cls.from_raw(values.get('plugin'), values)
+
+    def pack(self):
+        return pack(self.to_dict())
+
+    @classmethod
+    def unpack(cls, blob):
+        return cls.from_dict(unpack(blob))
+
+
+# ============================================
+# SÉRIALISATION BINAIRE
+# ============================================
+
+# Préfixe d'un octet : permet de relire un cache quel que soit le format
+_MSGPACK = b'M'
+_ZJSON = b'Z'
+
+
+def pack(obj):
+    """
+    Sérialise en binaire compact ; types non JSON (datetime, Decimal, set...)
+    convertis par `str`, comme dans la réponse HTTP (backend.core.responses)
+    """
+    if msgpack is not None:
+        return _MSGPACK + msgpack.packb(obj, use_bin_type=True, default=str)
+    raw = json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8')
+    return _ZJSON + zlib.compress(raw, 6)
+
+
+def unpack(blob):
+    kind, body = blob[:1], blob[1:]
+    if kind == _MSGPACK:
+        # Clés entières (ou autres) acceptées : ce que pack écrit, unpack le relit
+        return msgpack.unpackb(body, raw=False, strict_map_key=False)
+    return json.loads(zlib.decompress(body).decode('utf-8'))
+
+
+# ============================================
+# CACHE DE RÉSULTATS
+# ============================================
+
+class ResultCache:
+    """Cache LRU à expiration, valeurs stockées sous forme binaire"""
+
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def make_key(plugin_id, payload):
+        return plugin_id, json.dumps(payload or {}, sort_keys=True, default=str)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, blob = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return PluginResult.unpack(blob)
+
+    def set(self, key, result, ttl):
+        try:
+            blob = result.pack()
+        except (TypeError, ValueError, OverflowError) as e:
+            # Résultat non sérialisable : simplement pas mis en cache
+            logger.warning(f"[!] Resultat {key[0]} non mis en cache: {e}")
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, blob)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self, plugin_id=None):
+        with self._lock:
+            if plugin_id is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == plugin_id]:
+                    del self._entries[key]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': sum(len(blob) for _, blob in self._entries.values()),
+                'format': 'msgpack' if msgpack is not None else 'json+zlib'
+            }
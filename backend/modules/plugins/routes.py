@@ -6,6 +6,9 @@ from flask import Blueprint, request, jsonify
 import logging
 from pathlib import Path
 
+from backend.core.responses import api_response
+from backend.core.streaming import stream_mode, stream_response
+
 logger = logging.getLogger(__name__)
 
 bp = Blueprint('plugins', __name__)
@@ -14,10 +17,9 @@ bp = Blueprint('plugins', __name__)
 def list_plugins():
     """Liste tous les plugins disponibles"""
     try:
-        from .manager import PluginManager
+        from .manager import get_manager
         
-        manager = PluginManager()
-        plugins = manager.list_plugins()
+        plugins = get_manager().list_plugins()
         
         return jsonify({
             'success': True,
@@ -37,16 +39,28 @@ def list_plugins():
 @bp.route('/<plugin_id>/run', methods=['POST'])
 def run_plugin(plugin_id):
     """Exécute un plugin"""
+    from .manager import get_manager, PluginNotFound
+    
     try:
-        from .manager import PluginManager
-        
         data = request.get_json(force=True) if request.data else {}
         payload = data.get('payload', {})
+        use_cache = request.args.get('refresh', '0') not in ('1', 'true')
+        
+        mode = stream_mode()
+        if mode:
+            meta, rows = get_manager().stream_plugin(plugin_id, payload, use_cache=use_cache)
+            return stream_response(meta, rows, key='result.data', mode=mode)
         
-        manager = PluginManager()
-        result = manager.execute_plugin(plugin_id, payload)
+        result = get_manager().execute_plugin(plugin_id, payload, use_cache=use_cache)
         
-        return jsonify(result)
+        return api_response(result)
+    
+    except PluginNotFound:
+        return jsonify({
+            'success': False,
+            'plugin': plugin_id,
+            'error': 'Plugin introuvable'
+        }), 404
     
     except Exception as e:
         logger.error(f"Erreur exécution plugin {plugin_id}: {e}")
@@ -56,6 +70,20 @@ def run_plugin(plugin_id):
             'error': str(e)
         }), 500
 
+@bp.route('/metrics', methods=['GET'])
+def metrics():
+    """Latence, erreurs amont et recours aux fallbacks par plugin"""
+    from .manager import get_manager
+    from .monitor import get_monitor
+    from .upstream import session
+    
+    return jsonify({
+        'success': True,
+        'metrics': get_monitor().snapshot(),
+        'circuits': session.circuit_states(),
+        'cache': get_manager().cache.stats()
+    })
+
 @bp.route('/status', methods=['GET'])
 def status():
     """État du module"""
@@ -0,0 +1,304 @@
+"""
+Module Plugins - Simulateur local des APIs amont
+
+Rejoue des réponses enregistrées (CelesTrak, NASA, Open Notify, The Space
+Devs...) avec un profil de latence, de taux d'erreur et de taille de charge
+configurable, pour tester charge, cache et disjoncteurs sans solliciter les
+vraies APIs.
+
+    python -m backend.modules.plugins.simulator --port 8700 --profile realistic
+    python -m backend.modules.plugins.simulator --record      # rafraîchit les enregistrements
+
+Les plugins y sont redirigés par `config/plugins.json` :
+
+    "upstream_overrides": {"*": "http://127.0.0.1:8700"}
+
+Une URL `https://celestrak.org/NORAD/...` devient alors
+`http://127.0.0.1:8700/celestrak.org/NORAD/...` ; la route enregistrée la plus
+longue préfixe de ce chemin est servie.
+
+Pilotage à chaud :
+    GET  /_sim/status              profil courant et compteurs
+    POST /_sim/profile             {"profile": "degraded"} ou paramètres explicites
+"""
+
+import argparse
+import json
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+RECORDINGS_DIR = Path(__file__).resolve().parent / 'recordings'
+
+DEFAULT_PORT = 8700
+
+# latency_ms + uniforme(0, jitter_ms) ; error_rate dans [0, 1] ;
+# payload_scale multiplie les listes de premier niveau des réponses JSON
+PROFILES = {
+    'fast': {'latency_ms': 0, 'jitter_ms': 0, 'error_rate': 0.0, 'payload_scale': 1},
+    'realistic': {'latency_ms': 120, 'jitter_ms': 180, 'error_rate': 0.02, 'payload_scale': 1},
+    'slow': {'latency_ms': 2000, 'jitter_ms': 3000, 'error_rate': 0.0, 'payload_scale': 1},
+    'degraded': {'latency_ms': 600, 'jitter_ms': 900, 'error_rate': 0.3, 'payload_scale': 1},
+    'outage': {'latency_ms': 0, 'jitter_ms': 0, 'error_rate': 1.0, 'payload_scale': 1},
+    'large': {'latency_ms': 50, 'jitter_ms': 50, 'error_rate': 0.0, 'payload_scale': 20}
+}
+
+# Réponses d'erreur tirées au hasard ; 'reset' ferme la connexion sans répondre
+ERROR_KINDS = (503, 502, 429, 'reset')
+
+# URLs réelles enregistrées par --record (clé de route -> URL)
+SOURCES = {
+    '/celestrak.org/NORAD/elements/gp.php?GROUP=active': 'https://celestrak.org/NORAD/elements/gp.php?GROUP=active&FORMAT=json',
+    '/celestrak.org/NORAD/elements/gp.php?GROUP=debris': 'https://celestrak.org/NORAD/elements/gp.php?GROUP=debris&FORMAT=json',
+    '/api.nasa.gov/DONKI/notifications': 'https://api.nasa.gov/DONKI/notifications?api_key=DEMO_KEY',
+    '/api.nasa.gov/planetary/apod': 'https://api.nasa.gov/planetary/apod?api_key=DEMO_KEY',
+    '/api.open-notify.org/iss-now.json': 'http://api.open-notify.org/iss-now.json',
+    '/lldev.thespacedevs.com/2.2.0/launch/upcoming/': 'https://lldev.thespacedevs.com/2.2.0/launch/upcoming/'
+}
+
+
+def route_key(url):
+    """`https://hote/chemin?requete` -> `/hote/chemin?requete`"""
+    parts = urlsplit(url)
+    return f"/{parts.hostname}{parts.path}" + (f"?{parts.query}" if parts.query else '')
+
+
+def load_recordings(folder=RECORDINGS_DIR):
+    """Routes `{clé: (statut, type, corps)}` des fichiers `<hôte>.json`"""
+    routes = {}
+    for path in sorted(Path(folder).glob('*.json')):
+        for record in json.loads(path.read_text(encoding='utf-8')):
+            body = record['body']
+            if not isinstance(body, str):
+                body = json.dumps(body, ensure_ascii=False)
+            routes[record['route']] = (record.get('status', 200), record.get('content_type', 'application/json'), body.encode('utf-8'))
+    return routes
+
+
+def scale_payload(body, content_type, scale):
+    """Multiplie les listes JSON de premier niveau (taille de charge)"""
+    if scale == 1 or 'json' not in content_type:
+        return body
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return body
+    if isinstance(data, list):
+        data = data * scale
+    elif isinstance(data, dict):
+        data = {key: value * scale if isinstance(value, list) else value for key, value in data.items()}
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # En-têtes et corps partent en deux écritures : sans cela, Nagle ajoute ~40 ms
+    disable_nagle_algorithm = True
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        simulator = self.server.simulator
+        if self.path.startswith('/_sim/status'):
+            return self._send(200, 'application/json', json.dumps(simulator.status()).encode('utf-8'))
+
+        outcome = simulator.respond(self.path)
+        if outcome == 'reset':
+            self.close_connection = True
+            return
+        self._send(*outcome)
+
+    def do_POST(self):
+        simulator = self.server.simulator
+        if not self.path.startswith('/_sim/profile'):
+            return self.do_GET()
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            data = json.loads(self.rfile.read(length) or b'{}')
+            simulator.set_profile(data.pop('profile', None), **data)
+        except (ValueError, KeyError, TypeError) as e:
+            return self._send(400, 'application/json', json.dumps({'error': str(e)}).encode('utf-8'))
+        self._send(200, 'application/json', json.dumps(simulator.status()).encode('utf-8'))
+
+    def handle(self):
+        try:
+            super().handle()
+        except (ConnectionResetError, BrokenPipeError):
+            # Client qui coupe en cours de corps (lecture en flux arrêtée tôt) : normal
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+class UpstreamSimulator:
+    """Serveur HTTP multi-thread rejouant les routes avec le profil courant"""
+
+    def __init__(self, routes=None, profile='fast', host='127.0.0.1', port=0, seed=None):
+        self.routes = dict(load_recordings() if routes is None else routes)
+        self.profile_name = None
+        self.profile = {}
+        self.set_profile(profile)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.counters = {'requests': 0, 'errors': 0, 'not_found': 0}
+
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.simulator = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def add(self, route, body, content_type='application/json', status=200):
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        self.routes[route] = (status, content_type, body)
+
+    def set_profile(self, name=None, **overrides):
+        """Profil nommé de PROFILES, éventuellement ajusté paramètre par paramètre"""
+        profile = dict(PROFILES[name]) if name else dict(self.profile or PROFILES['fast'])
+        unknown = set(overrides) - set(PROFILES['fast'])
+        if unknown:
+            raise KeyError(f"Parametres inconnus: {sorted(unknown)}")
+        profile.update(overrides)
+        self.profile = profile
+        self.profile_name = name or self.profile_name or 'custom'
+
+    def status(self):
+        with self._lock:
+            counters = dict(self.counters)
+        return {'profile': self.profile_name, 'settings': self.profile, 'routes': len(self.routes), 'counters': counters}
+
+    def respond(self, path):
+        """(statut, type, corps) ou 'reset'"""
+        profile = self.profile
+        with self._lock:
+            self.counters['requests'] += 1
+            delay = (profile['latency_ms'] + self._rng.uniform(0, profile['jitter_ms'])) / 1000
+            failing = self._rng.random() < profile['error_rate']
+            error_kind = self._rng.choice(ERROR_KINDS)
+        if delay:
+            time.sleep(delay)
+
+        if failing:
+            with self._lock:
+                self.counters['errors'] += 1
+            if error_kind == 'reset':
+                return 'reset'
+            return error_kind, 'application/json', json.dumps({'error': 'simulated'}).encode('utf-8')
+
+        matches = [key for key in self.routes if path.startswith(key)]
+        if not matches:
+            with self._lock:
+                self.counters['not_found'] += 1
+            return 404, 'application/json', json.dumps({'error': 'no recording', 'path': path}).encode('utf-8')
+        status, content_type, body = self.routes[max(matches, key=len)]
+        return status, content_type, scale_payload(body, content_type, profile['payload_scale'])
+
+    def start(self):
+        """Sert en arrière-plan (tests, benchmarks)"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='upstream-simulator', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# ============================================
+# ENREGISTREMENT
+# ============================================
+
+def record(sources=SOURCES, folder=RECORDINGS_DIR):
+    """Interroge une fois les vraies APIs et remplace les enregistrements"""
+    import requests
+
+    by_host = {}
+    for route, url in sources.items():
+        try:
+            response = requests.get(url, timeout=30)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"[ERREUR] {url}: {e}")
+            continue
+        content_type = response.headers.get('Content-Type', 'application/json').split(';')[0]
+        try:
+            body = response.json() if 'json' in content_type else response.text
+        except ValueError:
+            body = response.text
+        host = route.split('/')[1]
+        by_host.setdefault(host, []).append({
+            'route': route,
+            'status': response.status_code,
+            'content_type': content_type,
+            'body': body
+        })
+        logger.info(f"[OK] {url} ({response.status_code}, {len(response.content)} octets)")
+
+    folder.mkdir(parents=True, exist_ok=True)
+    for host, records in by_host.items():
+        (folder / f"{host}.json").write_text(json.dumps(records, ensure_ascii=False, indent=1), encoding='utf-8')
+    return sorted(by_host)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='realistic')
+    parser.add_argument('--latency-ms', type=float)
+    parser.add_argument('--jitter-ms', type=float)
+    parser.add_argument('--error-rate', type=float)
+    parser.add_argument('--payload-scale', type=int)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--record', action='store_true', help='enregistre les réponses des vraies APIs puis quitte')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+
+    if args.record:
+        hosts = record()
+        logger.info(f"[OK] Enregistrements mis a jour: {', '.join(hosts) or 'aucun'}")
+        return
+
+    overrides = {
+        key: value for key, value in (
+            ('latency_ms', args.latency_ms), ('jitter_ms', args.jitter_ms),
+            ('error_rate', args.error_rate), ('payload_scale', args.payload_scale)
+        ) if value is not None
+    }
+    simulator = UpstreamSimulator(host=args.host, port=args.port, seed=args.seed)
+    simulator.set_profile(args.profile, **overrides)
+    logger.info(f"Simulateur amont sur {simulator.url} - profil {args.profile} {simulator.profile}")
+    logger.info(f"{len(simulator.routes)} routes enregistrees")
+    try:
+        simulator.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator.httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+"""
+Module Plugins - Couche HTTP des plugins vers les APIs amont
+
+Session partagée (pool de connexions) qui mesure chaque appel et remonte
+latence et erreurs par hôte au moniteur de plugins.
+
+Chaque hôte a son disjoncteur : après plusieurs échecs consécutifs, les appels
+échouent immédiatement (ou renvoient la dernière réponse valide connue) au lieu
+d'attendre le timeout réseau ; les plugins basculent alors tout de suite sur
+leurs fallbacks. Une sonde unique est autorisée après `recovery_timeout`.
+
+Redirection (simulateur local, proxy de test) : `upstream_overrides` dans
+`config/plugins.json` associe un hôte, ou `*` pour tous, à une URL de base ;
+`https://hote/chemin` est alors envoyé à `<base>/hote/chemin`. La variable
+d'environnement `GEOPOLIS_UPSTREAM_OVERRIDE` vaut pour `*`. Les disjoncteurs et
+les statistiques restent indexés par l'hôte d'origine.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode, urlsplit
+
+import requests
+
+from backend.core.runtime import on_fork
+from backend.core.settings import get_store
+
+from .monitor import get_monitor
+
+# Échecs consécutifs avant ouverture du disjoncteur
+FAILURE_THRESHOLD = 3
+# Délai (secondes) avant d'autoriser une sonde de rétablissement
+RECOVERY_TIMEOUT = 30.0
+# Dernières réponses valides conservées pour servir pendant une panne
+STALE_CACHE_SIZE = 256
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+OVERRIDE_ENV = 'GEOPOLIS_UPSTREAM_OVERRIDE'
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Appel court-circuité : l'hôte amont est considéré indisponible"""
+
+
+class CircuitBreaker:
+    """Disjoncteur d'un hôte amont (closed -> open -> half_open -> closed)"""
+
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, recovery_timeout=RECOVERY_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.lock = threading.Lock()
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+
+    def allow(self):
+        """True si l'appel peut partir sur le réseau"""
+        with self.lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.recovery_timeout:
+                self.state = HALF_OPEN
+                self.probe_in_flight = False
+            if self.state == HALF_OPEN and not self.probe_in_flight:
+                self.probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.probe_in_flight = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.probe_in_flight = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def snapshot(self):
+        with self.lock:
+            view = {'state': self.state, 'failures': self.failures}
+            if self.state != CLOSED:
+                remaining = self.recovery_timeout - (time.monotonic() - self.opened_at)
+                view['retry_in_seconds'] = round(max(0.0, remaining), 1)
+        return view
+
+
+class UpstreamSession:
+    """Client HTTP instrumenté, API compatible avec `requests.get/post`"""
+
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, recovery_timeout=RECOVERY_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._session = None
+        self._lock = threading.Lock()
+        self._breakers = {}
+        self._stale = OrderedDict()
+        self._overrides = None
+        self._pinned = False
+
+    def configure(self, overrides=None):
+        """Fixe les redirections `{hôte | '*': url_de_base}` ; None = relire la configuration"""
+        self._overrides = dict(overrides) if overrides is not None else None
+        self._pinned = overrides is not None
+
+    def _get_overrides(self):
+        if self._overrides is None:
+            store = get_store()
+            store.subscribe(self._on_settings)
+            overrides = dict(store.get().get('upstream_overrides') or {})
+            if os.environ.get(OVERRIDE_ENV):
+                overrides.setdefault('*', os.environ[OVERRIDE_ENV])
+            self._overrides = overrides
+        return self._overrides
+
+    def _on_settings(self, settings):
+        # Relu au prochain appel (sauf redirection fixée par configure())
+        if not self._pinned:
+            self._overrides = None
+
+    def resolve(self, url):
+        """URL réellement appelée après application des redirections"""
+        overrides = self._get_overrides()
+        if not overrides:
+            return url
+        parts = urlsplit(url)
+        base = overrides.get(parts.hostname) or overrides.get('*')
+        if not base:
+            return url
+        return f"{base.rstrip('/')}/{parts.hostname}{parts.path}" + (f"?{parts.query}" if parts.query else '')
+
+    def _get_session(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = requests.Session()
+        return self._session
+
+    def breaker(self, host):
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(
+                    host, CircuitBreaker(self.failure_threshold, self.recovery_timeout)
+                )
+        return breaker
+
+    def circuit_states(self):
+        """État des disjoncteurs par hôte"""
+        with self._lock:
+            breakers = list(self._breakers.items())
+        return {host: breaker.snapshot() for host, breaker in breakers}
+
+    def _stale_key(self, method, url, kwargs):
+        # Réponse en flux : son corps est consommé par l'appelant, rien à resservir
+        if method != 'GET' or kwargs.get('stream'):
+            return None
+        params = kwargs.get('params')
+        if params is None or isinstance(params, (str, bytes)):
+            return url, params
+        # dict, liste de couples, valeurs multiples : chaîne de requête normalisée (hachable)
+        try:
+            items = params.items() if hasattr(params, 'items') else params
+            return url, urlencode(sorted(items, key=lambda item: str(item[0])), doseq=True)
+        except (TypeError, ValueError):
+            # Forme inattendue : pas de réponse de secours plutôt qu'une erreur
+            return None
+
+    def _remember(self, key, response):
+        with self._lock:
+            self._stale[key] = response
+            self._stale.move_to_end(key)
+            while len(self._stale) > STALE_CACHE_SIZE:
+                self._stale.popitem(last=False)
+
+    def request(self, method, url, **kwargs):
+        host = urlsplit(url).hostname or url
+        breaker = self.breaker(host)
+        stale_key = self._stale_key(method, url, kwargs)
+
+        if not breaker.allow():
+            get_monitor().record_short_circuit(host)
+            stale = self._stale.get(stale_key) if stale_key else None
+            if stale is not None:
+                return stale
+            raise CircuitOpenError(f"Circuit ouvert pour {host}")
+
+        start = time.perf_counter()
+        try:
+            response = self._get_session().request(method, self.resolve(url), **kwargs)
+        except Exception as e:
+            breaker.record_failure()
+            get_monitor().record_upstream(host, time.perf_counter() - start, ok=False, error=type(e).__name__)
+            raise
+
+        # 5xx et 429 signalent un amont en difficulté ; les autres 4xx non
+        if response.status_code >= 500 or response.status_code == 429:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+            if stale_key and response.status_code == 200:
+                self._remember(stale_key, response)
+
+        get_monitor().record_upstream(
+            host,
+            time.perf_counter() - start,
+            ok=response.status_code < 400,
+            status=response.status_code
+        )
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+
+session = UpstreamSession()
+
+
+@on_fork
+def _reset_after_fork():
+    # Les sockets du pool et l'état des disjoncteurs ne se partagent pas entre processus
+    session._lock = threading.Lock()
+    session._session = None
+    session._breakers = {}
+    session._stale = OrderedDict()
@@ -2,13 +2,19 @@
 Module Tuteur IA - Routes API Simplifiées
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
+import hmac
 import logging
 
 logger = logging.getLogger(__name__)
 
 bp = Blueprint('tuteur', __name__)
 
+# Taille maximale du code exécuté (caractères)
+MAX_RUN_CODE = 100_000
+
+TOKEN_HEADER = 'X-Geopolis-Sandbox-Token'
+
 @bp.route('/analyze', methods=['POST'])
 def analyze_code():
     """Analyse du code Python"""
@@ -43,24 +49,86 @@ def analyze_code():
             'error': str(e)
         }), 500
 
+def _run_authorized():
+    token = current_app.config.get('SANDBOX_TOKEN')
+    if token:
+        return hmac.compare_digest(request.headers.get(TOKEN_HEADER, ''), token)
+    # Sans jeton : serveur de développement et requête locale uniquement
+    return current_app.debug and request.remote_addr in ('127.0.0.1', '::1')
+
+@bp.route('/run', methods=['POST'])
+def run_code():
+    """Exécute du code Python dans un worker confiné (CPU, mémoire et durée limités)"""
+    if not current_app.config.get('SANDBOX_ENABLED'):
+        return jsonify({
+            'success': False,
+            'error': 'Exécution de code désactivée (SANDBOX_ENABLED)'
+        }), 403
+    if not _run_authorized():
+        return jsonify({
+            'success': False,
+            'error': 'Exécution de code non autorisée'
+        }), 403
+    
+    try:
+        data = request.get_json(force=True)
+        code = data.get('code', '')
+        
+        if not code.strip():
+            return jsonify({
+                'success': False,
+                'error': 'Code manquant'
+            }), 400
+        if len(code) > MAX_RUN_CODE:
+            return jsonify({
+                'success': False,
+                'error': f'Code trop long (maximum {MAX_RUN_CODE} caractères)'
+            }), 400
+        
+        from .sandbox import SandboxBusy, get_pool
+        try:
+            result = get_pool(current_app.config).run(code, stdin=data.get('stdin', ''))
+        except SandboxBusy as e:
+            return jsonify({
+                'success': False,
+                'error': f'Exécuteur occupé: {e}'
+            }), 503
+        
+        return jsonify(dict(result, success=True))
+    
+    except Exception as e:
+        logger.error(f"Erreur execution code: {e}", exc_info=True)
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @bp.route('/providers', methods=['GET'])
 def list_providers():
     """Liste des providers IA disponibles"""
+    from backend.core.ai_manager import get_ai_manager
+    ai = get_ai_manager(current_app.config)
     return jsonify({
         'success': True,
-        'providers': {
-            'local': {'name': 'Analyse Locale', 'available': True},
-            'openai': {'name': 'OpenAI', 'available': False},
-            'anthropic': {'name': 'Anthropic', 'available': False}
-        }
+        'default': ai.default_provider,
+        'providers': ai.providers()
     })
 
 @bp.route('/status', methods=['GET'])
 def status():
     """État du module"""
+    from .service import analysis_cache
     return jsonify({
         'success': True,
         'module': 'Tuteur IA',
         'version': '3.0.0',
-        'status': 'operational'
+        'status': 'operational',
+        'analysis_cache': analysis_cache.stats(),
+        'run_enabled': bool(current_app.config.get('SANDBOX_ENABLED')),
+        'sandbox': _sandbox_stats()
     })
+
+def _sandbox_stats():
+    # Sans démarrer le pool s'il n'a pas encore servi
+    from . import sandbox
+    return sandbox._pool.stats() if sandbox._pool is not None else None
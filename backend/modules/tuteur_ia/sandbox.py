@@ -0,0 +1,640 @@
+"""
+Module Tuteur IA - Exécution confinée du code des utilisateurs
+
+Le code soumis ne s'exécute jamais dans le processus Flask. `SandboxPool`
+démarre à l'avance quelques interpréteurs (`python -I <ce fichier>`) qui
+restent chauds entre les requêtes ; chacun reçoit un travail par ligne JSON
+sur stdin et répond par une ligne JSON sur stdout.
+
+Sous POSIX, l'interpréteur chaud est un « zygote » : il fork un enfant par
+exécution (quelques millisecondes, modules déjà importés), applique à
+l'enfant les limites `RLIMIT_CPU`, `RLIMIT_AS`, `RLIMIT_FSIZE`, `RLIMIT_NPROC`,
+redirige ses descripteurs standard vers /dev/null et le tue au-delà du délai
+réel. Une exécution ne peut donc ni polluer la suivante ni écrire dans le
+canal de contrôle.
+
+Les limites de ressources ne protègent ni les fichiers ni le réseau. Sous
+Linux, l'enfant est en plus confiné avant d'exécuter le code (`_isolate`) :
+- namespaces réseau (aucune interface), IPC et montage (`unshare`) ;
+- `chroot` dans un dossier vide monté en lecture seule : aucun fichier de
+  l'hôte n'est lisible ni modifiable, seuls les modules déjà chargés par le
+  zygote (`WARM_MODULES`) sont importables ;
+- lancé par root : utilisateur `nobody` (`RLIMIT_NPROC` s'applique alors) ;
+  sinon : namespace utilisateur, capacités retirées ;
+- `PR_SET_NO_NEW_PRIVS`.
+Le zygote vérifie au démarrage que ce confinement fonctionne. Sans lui, le
+pool refuse de démarrer sous root ; ailleurs (Windows, noyau sans namespaces
+utilisateur) le code s'exécute avec les droits du serveur, ce qui est signalé
+au démarrage. Sans `fork`/`resource` (Windows), le code s'exécute dans le
+worker lui-même, seul le délai réel est appliqué, et le worker est remplacé
+après chaque exécution.
+
+Ce fichier ne dépend que de la bibliothèque standard : il sert aussi de
+script aux workers.
+"""
+
+import atexit
+import contextlib
+import io
+import json
+import logging
+import os
+import queue
+import selectors
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import traceback
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+try:
+    import ctypes
+    _libc = ctypes.CDLL(None, use_errno=True) if sys.platform.startswith('linux') else None
+except (ImportError, OSError):
+    ctypes = None
+    _libc = None
+
+try:
+    from backend.core.runtime import on_fork
+except ImportError:
+    # Exécuté comme script du worker (`python -I`) : pas d'application à réinitialiser
+    def on_fork(func):
+        return func
+
+logger = logging.getLogger(__name__)
+
+# Limites par défaut d'une exécution
+DEFAULT_LIMITS = {
+    'cpu_seconds': 2,
+    'memory_mb': 256,
+    'wall_seconds': 5.0,
+    'output_bytes': 64 * 1024,
+    'file_bytes': 1024 * 1024
+}
+
+# Modules importés par le zygote avant tout fork (partagés par les exécutions)
+# Seuls modules importables par le code confiné
+WARM_MODULES = (
+    'collections', 'itertools', 'functools', 'math', 'random', 're', 'json', 'string', 'dataclasses', 'typing',
+    'statistics', 'datetime', 'heapq', 'bisect', 'fractions', 'decimal', 'operator', 'enum', 'copy', 'textwrap'
+)
+
+# Marge laissée au worker pour tuer lui-même un enfant trop long
+WALL_GRACE = 2.0
+
+CAN_FORK = hasattr(os, 'fork') and resource is not None
+
+# Utilisateur des exécutions quand le zygote tourne sous root
+UNPRIVILEGED_USER = 'nobody'
+
+# Constantes Linux (sched.h, mount.h, prctl.h, capability.h)
+CLONE_NEWNS = 0x00020000
+CLONE_NEWIPC = 0x08000000
+CLONE_NEWUSER = 0x10000000
+CLONE_NEWNET = 0x40000000
+MS_RDONLY = 0x1
+MS_NOSUID = 0x2
+MS_NODEV = 0x4
+MS_REMOUNT = 0x20
+MS_BIND = 0x1000
+MS_REC = 0x4000
+MS_PRIVATE = 0x40000
+PR_SET_NO_NEW_PRIVS = 38
+LINUX_CAPABILITY_VERSION_3 = 0x20080522
+
+
+# ============================================
+# CÔTÉ WORKER
+# ============================================
+
+class _LimitedOutput(io.TextIOBase):
+    """Sortie texte tronquée au-delà de `limit` octets"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.size = 0
+        self.parts = []
+        self.truncated = False
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        if self.size < self.limit:
+            chunk = text[:self.limit - self.size]
+            self.parts.append(chunk)
+            self.size += len(chunk)
+        if len(text) and self.size >= self.limit:
+            self.truncated = True
+        return len(text)
+
+    def getvalue(self):
+        return ''.join(self.parts) + ('\n[... sortie tronquée]' if self.truncated else '')
+
+
+def _apply_limits(limits):
+    if resource is None:
+        return
+    cpu = int(limits['cpu_seconds'])
+    # Soft : SIGXCPU (arrêt) ; hard une seconde plus tard : SIGKILL
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+    memory = int(limits['memory_mb']) * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+    resource.setrlimit(resource.RLIMIT_FSIZE, (limits['file_bytes'], limits['file_bytes']))
+    if hasattr(resource, 'RLIMIT_NPROC'):
+        # Ni fork ni sous-processus depuis le code utilisateur
+        resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+    if hasattr(resource, 'RLIMIT_CORE'):
+        resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+
+
+def _check(result, what):
+    if result != 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, f"{what}: {os.strerror(errno)}")
+
+
+def _write_proc(path, text):
+    with open(path, 'w') as f:
+        f.write(text)
+
+
+def _isolate(root, user):
+    """
+    Confine le processus courant (enfant forké) : ni réseau, ni fichiers de
+    l'hôte, ni privilèges ; lève OSError si un mécanisme est indisponible
+    """
+    if _libc is None:
+        raise OSError("confinement disponible sous Linux uniquement")
+    uid, gid = os.geteuid(), os.getegid()
+    flags = CLONE_NEWNET | CLONE_NEWIPC | CLONE_NEWNS
+    if uid != 0:
+        # Sans root : namespace utilisateur où seul l'utilisateur courant est mappé
+        flags |= CLONE_NEWUSER
+    _check(_libc.unshare(flags), 'unshare')
+    if uid != 0:
+        _write_proc('/proc/self/setgroups', 'deny')
+        _write_proc('/proc/self/uid_map', f"{uid} {uid} 1")
+        _write_proc('/proc/self/gid_map', f"{gid} {gid} 1")
+
+    # Racine vide en lecture seule, sans effet sur les montages de l'hôte
+    _check(_libc.mount(None, b'/', None, MS_REC | MS_PRIVATE, None), 'mount private')
+    path = os.fsencode(root)
+    _check(_libc.mount(path, path, None, MS_BIND, None), 'mount bind')
+    _check(_libc.mount(None, path, None, MS_REMOUNT | MS_BIND | MS_RDONLY | MS_NOSUID | MS_NODEV, None), 'mount ro')
+    os.chroot(root)
+    os.chdir('/')
+
+    if uid == 0:
+        os.setgroups([])
+        os.setresgid(user[1], user[1], user[1])
+        os.setresuid(user[0], user[0], user[0])
+    else:
+        # Capacités obtenues avec le namespace (dont CAP_SYS_CHROOT) : toutes retirées
+        header = (ctypes.c_uint32 * 2)(LINUX_CAPABILITY_VERSION_3, 0)
+        _check(_libc.capset(header, (ctypes.c_uint32 * 6)()), 'capset')
+    _check(_libc.prctl(PR_SET_NO_NEW_PRIVS, 1, 0, 0, 0), 'prctl')
+
+
+def _unprivileged_user():
+    """(uid, gid) de `UNPRIVILEGED_USER`"""
+    try:
+        import pwd
+        entry = pwd.getpwnam(UNPRIVILEGED_USER)
+        return entry.pw_uid, entry.pw_gid
+    except (ImportError, KeyError):
+        return 65534, 65534
+
+
+def _probe_isolation(root, user):
+    """Vrai si un enfant peut être confiné (essai dans un enfant jetable)"""
+    if not CAN_FORK or _libc is None:
+        return False
+    pid = os.fork()
+    if pid == 0:
+        status = 1
+        try:
+            _isolate(root, user)
+            status = 0
+        except BaseException:
+            pass
+        finally:
+            os._exit(status)
+    _, status = os.waitpid(pid, 0)
+    return os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+
+
+def _execute(code, stdin, limits):
+    """Exécute `code` dans ce processus ; retourne le résultat sérialisable"""
+    stdout = _LimitedOutput(limits['output_bytes'])
+    stderr = _LimitedOutput(limits['output_bytes'])
+    result = {'ok': True, 'error': None}
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    old_stdin = sys.stdin
+    sys.stdin = io.StringIO(stdin or '')
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            exec(compile(code, '<tuteur>', 'exec'), {'__name__': '__main__', '__builtins__': __builtins__})
+    except SystemExit as e:
+        result['ok'] = e.code in (None, 0)
+        if not result['ok']:
+            result['error'] = f"SystemExit: {e.code}"
+    except BaseException as e:
+        result['ok'] = False
+        result['error'] = f"{type(e).__name__}: {e}"
+        if isinstance(e, MemoryError):
+            result['limit'] = 'memory'
+        # Pile limitée au code soumis (sans les cadres du worker)
+        frames = [frame for frame in traceback.extract_tb(e.__traceback__) if frame.filename == '<tuteur>']
+        stderr.write(''.join(traceback.format_list(frames)) + result['error'] + '\n')
+    finally:
+        sys.stdin = old_stdin
+    result.update({
+        'stdout': stdout.getvalue(),
+        'stderr': stderr.getvalue(),
+        'duration': round(time.perf_counter() - started, 4),
+        'cpu': round(time.process_time() - cpu_started, 4)
+    })
+    return result
+
+
+def _kill_group(pgid):
+    try:
+        os.killpg(pgid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _run_forked(code, stdin, limits, isolation=None):
+    """
+    Exécute dans un enfant forké, limité et surveillé par le zygote
+    `isolation` : (racine, utilisateur) du confinement ; un échec l'interrompt
+    """
+    read_fd, write_fd = os.pipe()
+    started = time.perf_counter()
+    pid = os.fork()
+    if pid == 0:
+        status = 0
+        try:
+            os.close(read_fd)
+            # Groupe de processus propre : ses éventuels descendants partent avec lui
+            os.setpgid(0, 0)
+            # Le canal de contrôle (fd 0/1) est hors d'atteinte du code utilisateur
+            devnull = os.open(os.devnull, os.O_RDWR)
+            for fd in (0, 1, 2):
+                os.dup2(devnull, fd)
+            if isolation is not None:
+                _isolate(*isolation)
+            _apply_limits(limits)
+            payload = json.dumps(_execute(code, stdin, limits)).encode('utf-8')
+            with os.fdopen(write_fd, 'wb') as pipe:
+                pipe.write(payload)
+        except BaseException:
+            status = 1
+        finally:
+            os._exit(status)
+
+    os.close(write_fd)
+    chunks = []
+    deadline = started + limits['wall_seconds']
+    timed_out = False
+    with os.fdopen(read_fd, 'rb') as pipe:
+        selector = selectors.DefaultSelector()
+        selector.register(pipe, selectors.EVENT_READ)
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 or not selector.select(remaining):
+                timed_out = True
+                break
+            chunk = os.read(pipe.fileno(), 65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        selector.close()
+
+    # Fin de sortie ≠ fin de l'enfant (il peut fermer le tube puis continuer)
+    while not timed_out:
+        waited, status = os.waitpid(pid, os.WNOHANG)
+        if waited:
+            break
+        if time.perf_counter() >= deadline:
+            timed_out = True
+        else:
+            time.sleep(0.002)
+    if timed_out:
+        _kill_group(pid)
+        _, status = os.waitpid(pid, 0)
+    else:
+        # Descendants éventuels encore vivants
+        _kill_group(pid)
+    duration = round(time.perf_counter() - started, 4)
+
+    if timed_out:
+        return {'ok': False, 'error': 'timeout', 'limit': 'wall', 'stdout': '', 'stderr': '', 'duration': duration}
+    if chunks:
+        try:
+            return json.loads(b''.join(chunks))
+        except ValueError:
+            pass
+    # Enfant arrêté avant d'avoir répondu : SIGXCPU puis SIGKILL = limite CPU
+    killed_by = os.WTERMSIG(status) if os.WIFSIGNALED(status) else None
+    if killed_by in (signal.SIGXCPU, signal.SIGKILL):
+        return {'ok': False, 'error': 'limite cpu atteinte', 'limit': 'cpu', 'stdout': '', 'stderr': '', 'duration': duration}
+    reason = f"signal {killed_by}" if killed_by else f"code {os.WEXITSTATUS(status)}"
+    return {'ok': False, 'error': f"execution interrompue ({reason})", 'stdout': '', 'stderr': '', 'duration': duration}
+
+
+def _worker_main():
+    """Boucle du worker : un travail JSON par ligne sur stdin, une réponse par ligne sur stdout"""
+    for name in WARM_MODULES:
+        try:
+            __import__(name)
+        except ImportError:
+            pass
+    control_out = sys.stdout
+    control_in = sys.stdin
+    # Racine des enfants confinés : dossier vide, non modifiable
+    root = os.path.join(os.getcwd(), 'root')
+    os.makedirs(root, exist_ok=True)
+    os.chmod(root, 0o555)
+    user = _unprivileged_user()
+    isolation = (root, user) if _probe_isolation(root, user) else None
+    control_out.write(json.dumps({'ready': True, 'fork': CAN_FORK, 'isolated': isolation is not None}) + '\n')
+    control_out.flush()
+
+    for line in control_in:
+        try:
+            job = json.loads(line)
+        except ValueError:
+            continue
+        limits = dict(DEFAULT_LIMITS, **job.get('limits', {}))
+        if CAN_FORK:
+            result = _run_forked(job['code'], job.get('stdin', ''), limits, isolation)
+        else:
+            result = _execute(job['code'], job.get('stdin', ''), limits)
+            sys.stdout, sys.stderr = control_out, sys.__stderr__
+        result['id'] = job.get('id')
+        control_out.write(json.dumps(result) + '\n')
+        control_out.flush()
+
+
+# ============================================
+# CÔTÉ SERVEUR (pool)
+# ============================================
+
+class SandboxBusy(Exception):
+    """Aucun worker libre dans le délai imparti"""
+
+
+def _worker_env():
+    # Environnement minimal : ni secrets ni configuration de l'application
+    env = {'PATH': os.environ.get('PATH', ''), 'PYTHONIOENCODING': 'utf-8'}
+    if 'SYSTEMROOT' in os.environ:
+        # Requis par l'interpréteur sous Windows
+        env['SYSTEMROOT'] = os.environ['SYSTEMROOT']
+    return env
+
+
+class _Worker:
+    """Processus worker et thread lisant ses réponses"""
+
+    def __init__(self, cwd):
+        kwargs = {}
+        if os.name == 'posix':
+            kwargs['start_new_session'] = True
+        else:
+            kwargs['creationflags'] = getattr(subprocess, 'CREATE_NEW_PROCESS_GROUP', 0)
+        self.process = subprocess.Popen(
+            [sys.executable, '-I', '-u', os.path.abspath(__file__)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            cwd=cwd, env=_worker_env(),
+            text=True, encoding='utf-8', bufsize=1, **kwargs
+        )
+        self.responses = queue.Queue()
+        self.jobs = 0
+        self.fork = True
+        self.isolated = False
+        self._reader = threading.Thread(target=self._read, name=f"sandbox-{self.process.pid}", daemon=True)
+        self._reader.start()
+
+    def _read(self):
+        for line in self.process.stdout:
+            try:
+                self.responses.put(json.loads(line))
+            except ValueError:
+                continue
+        self.responses.put(None)
+
+    def wait_ready(self, timeout):
+        message = self.responses.get(timeout=timeout)
+        if not message or not message.get('ready'):
+            raise RuntimeError("worker sandbox non demarre")
+        self.fork = message.get('fork', False)
+        self.isolated = message.get('isolated', False)
+
+    def send(self, job):
+        self.process.stdin.write(json.dumps(job) + '\n')
+        self.process.stdin.flush()
+        self.jobs += 1
+
+    def kill(self):
+        try:
+            if os.name == 'posix':
+                os.killpg(self.process.pid, signal.SIGKILL)
+            else:
+                self.process.kill()
+        except (ProcessLookupError, PermissionError, OSError):
+            pass
+        try:
+            self.process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            pass
+
+
+# Délai avant de retenter le lancement d'un worker, doublé à chaque échec
+RESPAWN_MIN_DELAY = 1.0
+RESPAWN_MAX_DELAY = 60.0
+
+
+class SandboxPool:
+    """
+    Pool de workers, démarrés à l'avance et réutilisés. Un worker remplacé
+    dont la relance échoue est compté manquant ; les appels suivants à `run`
+    retentent la relance, avec un délai croissant entre deux essais
+    """
+
+    def __init__(self, size=2, limits=None, max_jobs=500, queue_timeout=10.0):
+        self.size = size
+        self.limits = dict(DEFAULT_LIMITS, **(limits or {}))
+        self.max_jobs = max_jobs
+        self.queue_timeout = queue_timeout
+        self.workdir = tempfile.mkdtemp(prefix='geopolis-sandbox-')
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._ids = 0
+        self._closed = False
+        self.counters = {'runs': 0, 'errors': 0, 'timeouts': 0, 'restarts': 0, 'spawn_failures': 0}
+        self._missing = 0
+        self._retry_at = 0.0
+        self._backoff = RESPAWN_MIN_DELAY
+        self._spawning = threading.Lock()
+        # Faux dès qu'un worker n'a pas pu confiner ses enfants
+        self.isolated = True
+        for _ in range(size):
+            self._idle.put(self._spawn())
+
+    def _spawn(self):
+        worker = _Worker(self.workdir)
+        try:
+            worker.wait_ready(timeout=30)
+        except (queue.Empty, RuntimeError) as e:
+            worker.kill()
+            raise RuntimeError(f"Sandbox indisponible: {e}")
+        if not worker.isolated:
+            self.isolated = False
+            if hasattr(os, 'geteuid') and os.geteuid() == 0:
+                worker.kill()
+                raise RuntimeError("Sandbox refusee : serveur lance en root sans confinement (namespaces/chroot indisponibles)")
+            logger.warning("[!] Sandbox non confinee : le code s'execute avec les droits du serveur (fichiers, reseau)")
+        if not worker.fork:
+            logger.warning("[!] Sandbox sans fork/resource : seule la limite de temps reel s'applique")
+        return worker
+
+    def _replace(self, worker):
+        worker.kill()
+        with self._lock:
+            self.counters['restarts'] += 1
+            self._missing += 1
+        self._refill()
+
+    def _refill(self):
+        """Relance les workers manquants ; après un échec, pas de nouvel essai avant le délai"""
+        if self._closed or not self._missing or time.monotonic() < self._retry_at:
+            return
+        if not self._spawning.acquire(blocking=False):
+            # Relance déjà en cours dans un autre thread
+            return
+        try:
+            while self._missing and not self._closed:
+                try:
+                    worker = self._spawn()
+                except Exception as e:
+                    with self._lock:
+                        self.counters['spawn_failures'] += 1
+                    self._retry_at = time.monotonic() + self._backoff
+                    logger.error(f"[!] Worker sandbox non relance ({self._missing} manquant(s), nouvel essai dans {self._backoff:.0f}s): {e}")
+                    self._backoff = min(self._backoff * 2, RESPAWN_MAX_DELAY)
+                    return
+                self._backoff = RESPAWN_MIN_DELAY
+                if self._closed:
+                    worker.kill()
+                    return
+                with self._lock:
+                    self._missing -= 1
+                self._idle.put(worker)
+        finally:
+            self._spawning.release()
+
+    def run(self, code, stdin='', **limits):
+        """Exécute `code` dans un worker libre ; SandboxBusy si aucun ne se libère"""
+        job_limits = dict(self.limits, **{key: value for key, value in limits.items() if value is not None})
+        self._refill()
+        if self._missing >= self.size:
+            # Aucun worker et relance en échec : inutile d'attendre la file
+            raise SandboxBusy("Sandbox indisponible (relance des workers en echec)")
+        try:
+            worker = self._idle.get(timeout=self.queue_timeout)
+        except queue.Empty:
+            raise SandboxBusy(f"{self.size} exécution(s) déjà en cours")
+
+        with self._lock:
+            self._ids += 1
+            job_id = self._ids
+            self.counters['runs'] += 1
+
+        try:
+            worker.send({'id': job_id, 'code': code, 'stdin': stdin, 'limits': job_limits})
+            # Le worker applique lui-même le délai ; au-delà de la marge, il est bloqué
+            result = worker.responses.get(timeout=job_limits['wall_seconds'] + WALL_GRACE)
+        except (queue.Empty, OSError, ValueError):
+            result = None
+
+        if result is None:
+            # Worker mort (limite mémoire du worker) ou bloqué (Windows, boucle infinie)
+            result = {'ok': False, 'error': 'timeout', 'limit': 'wall', 'stdout': '', 'stderr': ''}
+            self._replace(worker)
+        elif not worker.fork or worker.jobs >= self.max_jobs:
+            # Sans fork, l'état laissé par le code utilisateur imposerait un worker neuf
+            self._replace(worker)
+        else:
+            self._idle.put(worker)
+
+        with self._lock:
+            if not result.get('ok'):
+                self.counters['errors'] += 1
+            if result.get('limit') == 'wall':
+                self.counters['timeouts'] += 1
+        result.pop('id', None)
+        return result
+
+    def stats(self):
+        with self._lock:
+            return dict(
+                self.counters, size=self.size, idle=self._idle.qsize(), missing=self._missing,
+                limits=self.limits, isolated=self.isolated
+            )
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().kill()
+            except queue.Empty:
+                break
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool(config=None):
+    """Pool partagé du processus, démarré au premier appel avec la configuration de l'app"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                config = config or {}
+                limits = {
+                    'cpu_seconds': config.get('SANDBOX_CPU_SECONDS'),
+                    'memory_mb': config.get('SANDBOX_MEMORY_MB'),
+                    'wall_seconds': config.get('SANDBOX_WALL_SECONDS')
+                }
+                _pool = SandboxPool(
+                    size=config.get('SANDBOX_WORKERS', 2),
+                    limits={key: value for key, value in limits.items() if value is not None}
+                )
+                atexit.register(_pool.close)
+                logger.info(f"[OK] Sandbox: {_pool.size} worker(s) {_pool.limits}")
+    return _pool
+
+
+@on_fork
+def _reset_after_fork():
+    # Les workers appartiennent au processus qui les a lancés
+    global _pool, _pool_lock
+    _pool = None
+    _pool_lock = threading.Lock()
+
+
+if __name__ == '__main__':
+    _worker_main()
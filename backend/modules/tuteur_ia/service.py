@@ -0,0 +1,800 @@
+"""
+Module Tuteur IA - Analyse statique locale du code Python
+
+Le code est parsé une seule fois (`ast.parse`) ; chaque instruction de
+premier niveau est ensuite parcourue une seule fois par `_Checker`, qui
+applique toutes les vérifications pendant la même visite :
+
+- noms inutilisés (imports, variables locales) ;
+- complexité cyclomatique et taille des fonctions ;
+- bugs évidents (défauts mutables, `except:` nu, `== None`, `is` sur un
+  littéral, `assert` sur un tuple, clés de dict dupliquées, code inatteignable...).
+
+Les vérifications qui portent sur tout le module (imports jamais utilisés)
+sont faites ensuite, à partir des rapports par instruction. Les corrections
+sûres (`is None`, `except Exception:`, imports inutiles) produisent `fixed_code`.
+
+Les rapports sont mis en cache par bloc de premier niveau (définition de
+fonction ou de classe, instruction isolée), sous l'empreinte de leur source
+normalisée et avec des numéros de ligne relatifs : lors d'une nouvelle
+soumission, seuls les blocs modifiés sont reparsés et réanalysés, les autres
+sont simplement décalés puis fusionnés.
+"""
+
+import ast
+import builtins
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict
+
+from backend.core.runtime import on_fork
+
+logger = logging.getLogger(__name__)
+
+# Seuils des avertissements
+MAX_COMPLEXITY = 10
+MAX_FUNCTION_LINES = 60
+MAX_ARGUMENTS = 6
+
+SHADOWED_BUILTINS = frozenset(
+    name for name in dir(builtins)
+    if not name.startswith('_') and not name[0].isupper() and name not in ('copyright', 'credits', 'license', 'exit', 'quit')
+)
+
+TERMINATORS = (ast.Return, ast.Raise, ast.Continue, ast.Break)
+MUTABLE_DEFAULTS = (ast.List, ast.Dict, ast.Set, ast.ListComp, ast.DictComp, ast.SetComp)
+IDENTIFIER = re.compile(r'[A-Za-z_]\w*')
+
+# Blocs de premier niveau gardés en cache (un bloc = une définition ou une instruction)
+ANALYSIS_CACHE_SIZE = 4096
+
+# Début d'instruction en colonne 0 (les suites `else:`, `except:`... prolongent le bloc)
+BLOCK_START = re.compile(r'(?!(?:else|elif|except|finally)\b)[^\W\d]|@')
+# Blocs consécutifs fusionnés au plus pour retrouver une instruction coupée
+MAX_BLOCK_MERGE = 8
+# Lexique minimal du découpage : commentaires, chaînes (échappements compris), parenthèses
+LEXEMES = re.compile(r'[#"\'()\[\]{}]')
+# Fin d'une chaîne ouverte par la clé (triple : sur plusieurs lignes possibles)
+STRING_END = {
+    '"""': re.compile(r'(?:\\.|[^\\])*?"""'),
+    "'''": re.compile(r"(?:\\.|[^\\])*?'''"),
+    '"': re.compile(r'(?:\\.|[^\\"])*"'),
+    "'": re.compile(r"(?:\\.|[^\\'])*'")
+}
+TRAILING_BLANK = re.compile(r'(?:\n[ \t\r\f]*)+$')
+
+# Ordre d'affichage : erreurs d'abord
+SEVERITIES = ('error', 'warning', 'info')
+
+# Conseil associé à chaque type de problème (une fois par type)
+ADVICE = {
+    'unused-import': "Supprimer les imports inutilisés (chargement plus rapide, dépendances plus claires).",
+    'unused-variable': "Supprimer les variables jamais lues, ou les préfixer par `_` si elles sont volontaires.",
+    'complexity': "Découper les fonctions trop complexes en sous-fonctions nommées.",
+    'long-function': "Extraire des sous-fonctions des fonctions trop longues.",
+    'too-many-arguments': "Regrouper les paramètres liés dans un objet ou un dictionnaire.",
+    'mutable-default': "Utiliser `None` comme valeur par défaut et créer la liste/le dict dans la fonction.",
+    'bare-except': "Attraper des exceptions précises (au minimum `except Exception:`).",
+    'silent-except': "Journaliser ou traiter l'exception plutôt que de l'ignorer.",
+    'comparison-none': "Comparer à `None` avec `is` / `is not`.",
+    'comparison-bool': "Tester directement la valeur (`if x:`) plutôt que de la comparer à `True`/`False`.",
+    'is-literal': "Comparer les valeurs avec `==` : `is` compare l'identité des objets.",
+    'assert-tuple': "Retirer les parenthèses de `assert` : un tuple non vide est toujours vrai.",
+    'duplicate-key': "Supprimer les clés dupliquées : seule la dernière valeur est conservée.",
+    'unreachable': "Supprimer le code situé après `return`, `raise`, `break` ou `continue`.",
+    'self-comparison': "Vérifier la comparaison d'une expression avec elle-même.",
+    'fstring-placeholder': "Retirer le préfixe `f` des chaînes sans `{}`.",
+    'builtin-shadowing': "Renommer les variables qui masquent une fonction native.",
+    'eval-exec': "Éviter `eval`/`exec` : préférer `ast.literal_eval` ou une table de fonctions.",
+    'missing-docstring': "Documenter les fonctions et classes publiques.",
+    'syntax-error': "Corriger l'erreur de syntaxe avant toute autre analyse."
+}
+
+
+# ============================================
+# PORTÉES
+# ============================================
+
+class _Scope:
+    __slots__ = ('kind', 'imports', 'bindings', 'loads', 'declared', 'dynamic')
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.imports = {}       # nom -> (ligne, colonne, instruction)
+        self.bindings = {}      # nom -> (ligne, colonne) des affectations simples
+        self.loads = set()      # noms lus ici ou dans une portée imbriquée
+        self.declared = set()   # global / nonlocal
+        self.dynamic = False    # locals(), vars(), eval, exec : usage invisible
+
+
+# ============================================
+# VISITEUR
+# ============================================
+
+class _Checker(ast.NodeVisitor):
+    """Parcours unique d'une instruction de premier niveau"""
+
+    def __init__(self):
+        self.issues = []
+        self.edits = []         # (ligne, début, fin, texte attendu, remplacement), en octets UTF-8
+        self.functions = []
+        self.classes = 0
+        self.module = _Scope('module')
+        self._scopes = [self.module]
+        self._complexity = []
+
+    # --- parcours ---
+
+    def visit(self, node):
+        # Méthode résolue une fois par type de nœud (NodeVisitor la cherche à chaque nœud)
+        cls = node.__class__
+        method = _DISPATCH.get(cls)
+        if method is None:
+            method = _DISPATCH[cls] = getattr(_Checker, f"visit_{cls.__name__}", _Checker.generic_visit)
+        return method(self, node)
+
+    def generic_visit(self, node):
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if isinstance(value, list):
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        self.visit(item)
+            elif isinstance(value, ast.AST):
+                self.visit(value)
+
+    def _skip(self, node):
+        pass
+
+    # Feuilles : rien à vérifier ni à parcourir
+    visit_Constant = _skip
+    visit_Load = _skip
+    visit_Store = _skip
+    visit_Del = _skip
+
+    # --- utilitaires ---
+
+    def _issue(self, node, code, severity, message):
+        self.issues.append({
+            'line': getattr(node, 'lineno', 0),
+            'column': getattr(node, 'col_offset', 0),
+            'severity': severity,
+            'code': code,
+            'message': message
+        })
+
+    def _branch(self, count=1):
+        if self._complexity:
+            self._complexity[-1] += count
+
+    def _check_body(self, statements):
+        for statement, following in zip(statements, statements[1:]):
+            if isinstance(statement, TERMINATORS):
+                self._issue(following, 'unreachable', 'warning', "Code inatteignable")
+                break
+
+    def _check_docstring(self, node, kind):
+        # Fonctions imbriquées exclues : détails d'implémentation
+        nested = any(scope.kind == 'function' for scope in self._scopes)
+        if not node.name.startswith('_') and not nested and ast.get_docstring(node) is None:
+            self._issue(node, 'missing-docstring', 'info', f"{kind} `{node.name}` sans docstring")
+
+    def _check_shadowing(self, node, name):
+        if name in SHADOWED_BUILTINS:
+            self._issue(node, 'builtin-shadowing', 'info', f"`{name}` masque la fonction native du même nom")
+
+    def _annotation(self, node):
+        # Annotation en chaîne ('Optional[Path]') : ses identifiants comptent comme lus
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            self._scopes[-1].loads.update(IDENTIFIER.findall(node.value))
+        elif node is not None:
+            self.visit(node)
+
+    def _close_scope(self):
+        scope = self._scopes.pop()
+        if self._scopes:
+            self._scopes[-1].loads |= scope.loads
+        if scope.kind != 'function' or scope.dynamic:
+            return scope
+        for name, (line, column, _) in scope.imports.items():
+            if name not in scope.loads:
+                self.issues.append(_unused_import(name, line, column))
+        for name, (line, column) in scope.bindings.items():
+            if name not in scope.loads and name not in scope.declared and not name.startswith('_'):
+                self.issues.append({
+                    'line': line, 'column': column, 'severity': 'warning',
+                    'code': 'unused-variable', 'message': f"Variable `{name}` affectée mais jamais utilisée"
+                })
+        return scope
+
+    # --- portées ---
+
+    def _visit_function(self, node):
+        for decorator in node.decorator_list:
+            self.visit(decorator)
+        arguments = node.args
+        for default in arguments.defaults + [d for d in arguments.kw_defaults if d is not None]:
+            if isinstance(default, MUTABLE_DEFAULTS) or (
+                isinstance(default, ast.Call) and isinstance(default.func, ast.Name) and default.func.id in ('list', 'dict', 'set')
+            ):
+                self._issue(default, 'mutable-default', 'warning',
+                            f"Valeur par défaut mutable dans `{node.name}` : partagée entre les appels")
+            self.visit(default)
+
+        all_args = arguments.posonlyargs + arguments.args + arguments.kwonlyargs
+        for arg in all_args + [a for a in (arguments.vararg, arguments.kwarg) if a is not None]:
+            self._annotation(arg.annotation)
+        self._annotation(node.returns)
+
+        positional = [a.arg for a in all_args if a.arg not in ('self', 'cls')]
+        if len(positional) > MAX_ARGUMENTS:
+            self._issue(node, 'too-many-arguments', 'info',
+                        f"`{node.name}` prend {len(positional)} paramètres (max conseillé {MAX_ARGUMENTS})")
+        self._check_docstring(node, 'Fonction')
+        self._check_shadowing(node, node.name)
+
+        self._scopes.append(_Scope('function'))
+        self._complexity.append(1)
+        self._check_body(node.body)
+        for statement in node.body:
+            self.visit(statement)
+        complexity = self._complexity.pop()
+        self._close_scope()
+
+        length = (node.end_lineno or node.lineno) - node.lineno + 1
+        self.functions.append({'name': node.name, 'line': node.lineno, 'complexity': complexity, 'lines': length})
+        if complexity > MAX_COMPLEXITY:
+            self._issue(node, 'complexity', 'warning',
+                        f"`{node.name}` a une complexité cyclomatique de {complexity} (max conseillé {MAX_COMPLEXITY})")
+        if length > MAX_FUNCTION_LINES:
+            self._issue(node, 'long-function', 'info',
+                        f"`{node.name}` fait {length} lignes (max conseillé {MAX_FUNCTION_LINES})")
+
+    visit_FunctionDef = _visit_function
+    visit_AsyncFunctionDef = _visit_function
+
+    def visit_ClassDef(self, node):
+        for expression in node.decorator_list + node.bases + [k.value for k in node.keywords]:
+            self.visit(expression)
+        self.classes += 1
+        self._check_docstring(node, 'Classe')
+        self._scopes.append(_Scope('class'))
+        self._check_body(node.body)
+        for statement in node.body:
+            self.visit(statement)
+        self._close_scope()
+
+    def visit_Global(self, node):
+        self._scopes[-1].declared.update(node.names)
+
+    visit_Nonlocal = visit_Global
+
+    # --- noms ---
+
+    def _visit_import(self, node):
+        scope = self._scopes[-1]
+        for alias in node.names:
+            if alias.name == '*' or getattr(node, 'module', None) == '__future__':
+                continue
+            name = alias.asname or alias.name.split('.')[0]
+            scope.imports[name] = (node.lineno, node.col_offset, (node.lineno, node.end_lineno, len(node.names)))
+
+    visit_Import = _visit_import
+    visit_ImportFrom = _visit_import
+
+    def visit_Name(self, node):
+        if not isinstance(node.ctx, ast.Store):
+            self._scopes[-1].loads.add(node.id)
+
+    def visit_Assign(self, node):
+        scope = self._scopes[-1]
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                self._check_shadowing(target, target.id)
+                if len(node.targets) == 1 and scope.kind == 'function':
+                    scope.bindings.setdefault(target.id, (target.lineno, target.col_offset))
+                if target.id == '__all__' and isinstance(node.value, (ast.List, ast.Tuple)):
+                    scope.loads.update(
+                        element.value for element in node.value.elts
+                        if isinstance(element, ast.Constant) and isinstance(element.value, str)
+                    )
+        self.generic_visit(node)
+
+    def visit_AnnAssign(self, node):
+        self._annotation(node.annotation)
+        self.visit(node.target)
+        if node.value is not None:
+            self.visit(node.value)
+
+    def visit_Call(self, node):
+        if isinstance(node.func, ast.Name):
+            name = node.func.id
+            if name in ('locals', 'vars') and not node.args:
+                self._scopes[-1].dynamic = True
+            elif name in ('eval', 'exec'):
+                self._scopes[-1].dynamic = True
+                self._issue(node, 'eval-exec', 'warning', f"Appel à `{name}` : exécution de code arbitraire")
+        self.generic_visit(node)
+
+    # --- complexité ---
+
+    def visit_If(self, node):
+        self._branch()
+        self._check_body(node.body)
+        self._check_body(node.orelse)
+        self.generic_visit(node)
+
+    def _visit_loop(self, node):
+        self._branch()
+        self._check_body(node.body)
+        self.generic_visit(node)
+
+    visit_For = _visit_loop
+    visit_AsyncFor = _visit_loop
+    visit_While = _visit_loop
+
+    def visit_IfExp(self, node):
+        self._branch()
+        self.generic_visit(node)
+
+    def visit_BoolOp(self, node):
+        self._branch(len(node.values) - 1)
+        self.generic_visit(node)
+
+    def visit_comprehension(self, node):
+        self._branch(1 + len(node.ifs))
+        self.generic_visit(node)
+
+    def visit_match_case(self, node):
+        self._branch()
+        self.generic_visit(node)
+
+    def visit_Try(self, node):
+        self._check_body(node.body)
+        self._check_body(node.finalbody)
+        self.generic_visit(node)
+
+    visit_TryStar = visit_Try
+
+    def visit_With(self, node):
+        self._check_body(node.body)
+        self.generic_visit(node)
+
+    visit_AsyncWith = visit_With
+
+    def visit_ExceptHandler(self, node):
+        self._branch()
+        self._check_body(node.body)
+        if node.type is None:
+            self._issue(node, 'bare-except', 'warning', "`except:` nu : attrape aussi KeyboardInterrupt et SystemExit")
+            end = node.col_offset + len('except')
+            self.edits.append((node.lineno, end, end, '', ' Exception'))
+        silent_type = node.type is None or (isinstance(node.type, ast.Name) and node.type.id in ('Exception', 'BaseException'))
+        if silent_type and len(node.body) == 1 and isinstance(node.body[0], ast.Pass):
+            self._issue(node, 'silent-except', 'warning', "Exception ignorée silencieusement")
+        self.generic_visit(node)
+
+    # --- bugs évidents ---
+
+    def visit_Compare(self, node):
+        left = node.left
+        for operator, right in zip(node.ops, node.comparators):
+            if isinstance(operator, (ast.Eq, ast.NotEq)) and isinstance(right, ast.Constant):
+                if right.value is None:
+                    symbol, fixed = ('==', 'is') if isinstance(operator, ast.Eq) else ('!=', 'is not')
+                    self._issue(node, 'comparison-none', 'warning', f"Comparaison à None avec `{symbol}`")
+                    if left.end_lineno == right.lineno:
+                        self.edits.append((right.lineno, left.end_col_offset, right.col_offset, symbol, f" {fixed} "))
+                elif isinstance(right.value, bool):
+                    self._issue(node, 'comparison-bool', 'info', f"Comparaison explicite à {right.value}")
+            elif isinstance(operator, (ast.Is, ast.IsNot)) and isinstance(right, ast.Constant) \
+                    and right.value is not None and not isinstance(right.value, bool) and right.value is not Ellipsis:
+                self._issue(node, 'is-literal', 'error', "`is` utilisé avec un littéral : résultat imprévisible")
+            if isinstance(left, ast.Name) and isinstance(right, ast.Name) and left.id == right.id:
+                self._issue(node, 'self-comparison', 'warning', f"`{left.id}` est comparé à lui-même")
+            left = right
+        self.generic_visit(node)
+
+    def visit_Assert(self, node):
+        if isinstance(node.test, ast.Tuple) and node.test.elts:
+            self._issue(node, 'assert-tuple', 'error', "`assert` sur un tuple : toujours vrai")
+        self.generic_visit(node)
+
+    def visit_Dict(self, node):
+        seen = set()
+        for key in node.keys:
+            if isinstance(key, ast.Constant):
+                marker = (type(key.value), key.value)
+                if marker in seen:
+                    self._issue(key, 'duplicate-key', 'warning', f"Clé {key.value!r} dupliquée dans un dict")
+                seen.add(marker)
+        self.generic_visit(node)
+
+    def visit_JoinedStr(self, node):
+        if not any(isinstance(value, ast.FormattedValue) for value in node.values):
+            self._issue(node, 'fstring-placeholder', 'info', "f-string sans expression `{}`")
+        self.generic_visit(node)
+
+    def visit_FormattedValue(self, node):
+        self.visit(node.value)
+        # La spécification de format (`:.2f`) est une JoinedStr sans expression : pas un défaut
+        if node.format_spec is not None:
+            for value in node.format_spec.values:
+                self.visit(value)
+
+
+_DISPATCH = {}
+
+
+def _unused_import(name, line, column):
+    return {
+        'line': line, 'column': column, 'severity': 'warning',
+        'code': 'unused-import', 'message': f"Import `{name}` inutilisé"
+    }
+
+
+# ============================================
+# ANALYSE
+# ============================================
+
+def analyze_node(node):
+    """Rapport d'une instruction de premier niveau (un seul parcours)"""
+    checker = _Checker()
+    checker.visit(node)
+    kind = 'import' if isinstance(node, (ast.Import, ast.ImportFrom)) else 'raise' if isinstance(node, ast.Raise) else None
+    return {
+        'kind': kind,
+        'start': node.lineno,
+        'end': node.end_lineno,
+        'issues': checker.issues,
+        'edits': checker.edits,
+        'loads': checker.module.loads,
+        'imports': checker.module.imports,
+        'dynamic': checker.module.dynamic,
+        'functions': checker.functions,
+        'classes': checker.classes
+    }
+
+
+def _module_checks(reports):
+    """Vérifications portant sur tout le module : imports jamais lus, code après `raise`"""
+    loads = set()
+    for report in reports:
+        loads |= report['loads']
+    dynamic = any(report['dynamic'] for report in reports)
+
+    issues = []
+    for statement, following in zip(reports, reports[1:]):
+        if statement['kind'] == 'raise':
+            issues.append({
+                'line': following['start'], 'column': 0, 'severity': 'warning',
+                'code': 'unreachable', 'message': "Code inatteignable"
+            })
+            break
+
+    unused_by_statement = {}
+    for report in reports:
+        for name, (line, column, statement) in report['imports'].items():
+            if name not in loads and not dynamic:
+                issues.append(_unused_import(name, line, column))
+                unused_by_statement.setdefault(statement, set()).add(name)
+
+    # Instruction supprimée seulement si tous ses noms sont inutilisés et
+    # qu'elle tient sur une ligne (imports de premier niveau uniquement)
+    top_level = {(report['start'], report['end']) for report in reports if report['kind'] == 'import'}
+    removed = {
+        start for (start, end, count), names in unused_by_statement.items()
+        if start == end and (start, end) in top_level and len(names) == count
+    }
+    return issues, removed
+
+
+def _apply_edits(lines, edits, removed_lines=()):
+    """Applique les corrections (décalages en octets UTF-8, comme dans l'AST)"""
+    by_line = {}
+    for line, start, end, expected, replacement in edits:
+        by_line.setdefault(line, []).append((start, end, expected, replacement))
+
+    output = []
+    for number, text in enumerate(lines, 1):
+        if number in removed_lines:
+            if ';' in text:
+                output.append(text)
+            continue
+        if number in by_line:
+            raw = text.encode('utf-8')
+            for start, end, expected, replacement in sorted(by_line[number], reverse=True):
+                # Parenthèses ou commentaire entre les opérandes : on ne touche à rien
+                if raw[start:end].strip() != expected.encode('utf-8'):
+                    continue
+                raw = raw[:start] + replacement.encode('utf-8') + raw[end:]
+            text = raw.decode('utf-8')
+        output.append(text)
+    return '\n'.join(output)
+
+
+# ============================================
+# CACHE PAR DÉFINITION
+# ============================================
+
+class AnalysisCache:
+    """LRU des rapports de blocs, indexé par l'empreinte de leur source normalisée"""
+
+    def __init__(self, max_entries=ANALYSIS_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def reset(self):
+        self._lock = threading.Lock()
+
+
+analysis_cache = AnalysisCache()
+
+INVALID_BLOCK = object()
+
+
+def _scan_line(line, quote, depth):
+    """
+    État lexical `(chaîne triple ouverte, profondeur de parenthèses)` après
+    `line` : les délimiteurs dans les chaînes et les commentaires sont ignorés
+    """
+    pos = 0
+    if quote is not None:
+        end = STRING_END[quote].match(line, pos)
+        if end is None:
+            return quote, depth
+        pos = end.end()
+    elif not ('"' in line or "'" in line or '#' in line):
+        # Cas courant : ni chaîne ni commentaire, un simple compte suffit
+        opened = line.count('(') + line.count('[') + line.count('{')
+        closed = line.count(')') + line.count(']') + line.count('}')
+        return None, max(0, depth + opened - closed)
+    while True:
+        match = LEXEMES.search(line, pos)
+        if match is None:
+            return None, depth
+        char = match.group()
+        if char == '#':
+            return None, depth
+        if char in '([{':
+            depth += 1
+            pos = match.end()
+        elif char in ')]}':
+            depth = max(0, depth - 1)
+            pos = match.end()
+        else:
+            quote = char * 3 if line.startswith(char * 3, match.start()) else char
+            end = STRING_END[quote].match(line, match.start() + len(quote))
+            if end is None:
+                # Chaîne triple ouverte sur les lignes suivantes (simple non fermée : ligne ignorée)
+                return (quote if len(quote) == 3 else None), depth
+            pos = end.end()
+
+
+def split_blocks(lines):
+    """
+    Découpe le source en blocs de premier niveau : chaque ligne en colonne 0
+    qui commence une instruction (hors `else`/`except`...) ouvre un bloc ; les
+    décorateurs restent attachés à leur définition. Un lexique minimal (chaînes,
+    commentaires, parenthèses, `\\` final) écarte les lignes en colonne 0 qui
+    prolongent une chaîne triple ou une expression. Un découpage erroné rend
+    un bloc invalide : l'appelant le fusionne alors avec les suivants.
+    """
+    blocks = []
+    start = 0
+    decorated = False
+    quote = None
+    depth = 0
+    continued = False
+    for index, line in enumerate(lines):
+        if quote is None and depth == 0 and not continued and BLOCK_START.match(line):
+            if index > start and not decorated:
+                blocks.append((start, index))
+                start = index
+            decorated = line.startswith('@')
+        quote, depth = _scan_line(line, quote, depth)
+        continued = quote is None and line.endswith('\\') and '#' not in line
+    blocks.append((start, len(lines)))
+    return blocks
+
+
+def _normalize(text):
+    # Fins de ligne et lignes vides finales : sans effet sur l'analyse
+    return TRAILING_BLANK.sub('', text.replace('\r\n', '\n'))
+
+
+def _analyze_block(source):
+    """Rapport d'un bloc (numéros de ligne relatifs au bloc) ; SyntaxError si invalide"""
+    tree = ast.parse(source)
+    statements = [analyze_node(node) for node in tree.body]
+    edits = [edit for report in statements for edit in report['edits']]
+    if edits:
+        # Corrections validées une fois, sur le bloc seul
+        try:
+            ast.parse(_apply_edits(source.split('\n'), edits))
+        except SyntaxError:
+            logger.warning("Corrections automatiques abandonnees (code resultant invalide)")
+            for report in statements:
+                report['edits'] = []
+    return statements
+
+
+def _cached_block(source):
+    normalized = _normalize(source)
+    key = hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+    statements = analysis_cache.get(key)
+    if statements is None:
+        try:
+            statements = _analyze_block(normalized)
+        except SyntaxError:
+            # Bloc invalide mémorisé aussi : un docstring coupé le reste d'une soumission à l'autre
+            analysis_cache.set(key, INVALID_BLOCK)
+            raise
+        analysis_cache.set(key, statements)
+    elif statements is INVALID_BLOCK:
+        raise SyntaxError('bloc invalide')
+    return statements
+
+
+def _shifted(report, offset):
+    """Copie d'un rapport de bloc (le cache n'est jamais modifié) décalée de `offset` lignes"""
+    return dict(
+        report,
+        start=report['start'] + offset,
+        end=report['end'] + offset,
+        issues=[dict(issue, line=issue['line'] + offset) for issue in report['issues']],
+        edits=[(edit[0] + offset,) + edit[1:] for edit in report['edits']],
+        functions=[dict(function, line=function['line'] + offset) for function in report['functions']],
+        imports={
+            name: (line + offset, column, (start + offset, end + offset, count))
+            for name, (line, column, (start, end, count)) in report['imports'].items()
+        }
+    )
+
+
+def _collect_reports(lines):
+    """Rapports par instruction : blocs inchangés servis par le cache, les autres parsés seuls"""
+    blocks = split_blocks(lines)
+    reports = []
+    index = 0
+    while index < len(blocks):
+        start = blocks[index][0]
+        # Bloc invalide : coupé dans une chaîne multiligne, on le prolonge avec les suivants
+        for last in range(index, min(index + MAX_BLOCK_MERGE, len(blocks))):
+            try:
+                statements = _cached_block('\n'.join(lines[start:blocks[last][1]]))
+            except SyntaxError:
+                continue
+            break
+        else:
+            # Vraie erreur de syntaxe (ou découpage irrécupérable) : le fichier entier fait foi
+            return [_shifted(report, 0) for report in _analyze_block('\n'.join(lines))]
+        reports.extend(_shifted(report, start) for report in statements)
+        index = last + 1
+    return reports
+
+
+def _summary(line_count, issues, functions, classes):
+    counts = {severity: sum(1 for issue in issues if issue['severity'] == severity) for severity in SEVERITIES}
+    parts = [f"{line_count} lignes, {len(functions)} fonction(s), {classes} classe(s)."]
+    if functions:
+        worst = max(functions, key=lambda f: f['complexity'])
+        average = sum(f['complexity'] for f in functions) / len(functions)
+        parts.append(f"Complexité moyenne {average:.1f}, maximale {worst['complexity']} (`{worst['name']}`).")
+    if issues:
+        parts.append(f"{len(issues)} problème(s) : {counts['error']} erreur(s), {counts['warning']} avertissement(s), {counts['info']} remarque(s).")
+    else:
+        parts.append("Aucun problème détecté.")
+    return ' '.join(parts)
+
+
+def _suggestions(issues):
+    seen = []
+    for issue in issues:
+        if issue['code'] not in seen:
+            seen.append(issue['code'])
+    return [ADVICE[code] for code in seen if code in ADVICE]
+
+
+def analyze_python_code(code, provider='local'):
+    """
+    Analyse statique d'un code Python
+    Retourne backend, analysis (résumé), issues, suggestions et fixed_code
+    """
+    # Découpage sur '\n' seul : mêmes numéros de ligne que l'AST (splitlines coupe aussi sur \f)
+    lines = code.split('\n')
+    try:
+        reports = _collect_reports(lines)
+    except SyntaxError as e:
+        issue = {
+            'line': e.lineno or 0, 'column': (e.offset or 1) - 1, 'severity': 'error',
+            'code': 'syntax-error', 'message': f"Erreur de syntaxe : {e.msg}"
+        }
+        return {
+            'backend': 'local',
+            'analysis': f"Le code ne peut pas être analysé : {e.msg} (ligne {e.lineno}).",
+            'issues': [issue],
+            'suggestions': [ADVICE['syntax-error']],
+            'fixed_code': None
+        }
+
+    issues = [issue for report in reports for issue in report['issues']]
+    module_issues, removed_lines = _module_checks(reports)
+    issues.extend(module_issues)
+    issues.sort(key=lambda issue: (SEVERITIES.index(issue['severity']), issue['line'], issue['column']))
+
+    functions = [function for report in reports for function in report['functions']]
+    classes = sum(report['classes'] for report in reports)
+    edits = [edit for report in reports for edit in report['edits']]
+
+    fixed_code = None
+    if edits or removed_lines:
+        fixed_code = _apply_edits(lines, edits, removed_lines)
+        if fixed_code == code:
+            fixed_code = None
+
+    line_count = len(code.splitlines())
+    result = {
+        'backend': 'local',
+        'analysis': _summary(line_count, issues, functions, classes),
+        'issues': issues,
+        'suggestions': _suggestions(issues),
+        'fixed_code': fixed_code,
+        'metrics': {
+            'lines': line_count,
+            'functions': functions,
+            'classes': classes
+        }
+    }
+    if provider and provider != 'local':
+        _add_ai_review(result, code, issues, provider)
+    return result
+
+
+def _add_ai_review(result, code, issues, provider):
+    """Commentaire du fournisseur ajouté à l'analyse locale (qui reste seule en cas d'échec)"""
+    from backend.core.ai_manager import ProviderError, get_ai_manager
+    try:
+        review = get_ai_manager().review_code(code, issues, provider)
+    except ProviderError as e:
+        logger.warning(f"[!] Revue IA indisponible ({provider}): {e}")
+        result['analysis'] += f"\n\nRevue IA indisponible : {e}"
+        return
+    result['backend'] = provider
+    result['analysis'] += f"\n\n{review}"
+
+
+@on_fork
+def _reset_after_fork():
+    analysis_cache.reset()
@@ -0,0 +1,87 @@
+"""
+Benchmark : temps de démarrage à froid
+
+Chaque essai lance un interpréteur neuf (comme une instance autoscalée) et mesure :
+- import   : `from backend.core.app import create_app`
+- create   : `create_app()` (blueprints, logging, dossiers)
+- first    : première requête `/api/health` via le client de test
+
+    python -m benchmarks.bench_startup --runs 10
+    python -m benchmarks.bench_startup --imports     # 15 imports les plus coûteux
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+PROBE = r'''
+import json, logging, time
+t0 = time.perf_counter()
+from backend.core.app import create_app
+t1 = time.perf_counter()
+app = create_app({'LOG_LEVEL': 'WARNING'})
+t2 = time.perf_counter()
+app.test_client().get('/api/health')
+t3 = time.perf_counter()
+print(json.dumps({'import': t1 - t0, 'create': t2 - t1, 'first': t3 - t2}))
+'''
+
+
+def run_once():
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE],
+        cwd=BASE_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def summarize(samples):
+    summary = {}
+    for phase in ('import', 'create', 'first'):
+        values = sorted(s[phase] * 1000 for s in samples)
+        summary[phase] = {
+            'p50_ms': round(statistics.median(values), 1),
+            'max_ms': round(values[-1], 1)
+        }
+    totals = sorted(sum(s.values()) * 1000 for s in samples)
+    summary['total'] = {'p50_ms': round(statistics.median(totals), 1), 'max_ms': round(totals[-1], 1)}
+    return summary
+
+
+def top_imports(limit=15):
+    """Modules dont l'import cumulé est le plus long (`python -X importtime`)"""
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'from backend.core.app import create_app; create_app()'],
+        cwd=BASE_DIR, capture_output=True, text=True
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line.split('|')
+        rows.append((int(cumulative_us), name.rstrip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--imports', action='store_true', help='affiche les imports les plus coûteux')
+    args = parser.parse_args()
+
+    if args.imports:
+        for cumulative_us, name in top_imports():
+            print(f"{cumulative_us / 1000:8.1f} ms  {name}")
+        return
+
+    samples = [run_once() for _ in range(args.runs)]
+    print(json.dumps(summarize(samples), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+Données de test déterministes : corpus, flux RSS et réponses amont enregistrées
+
+Tout est généré à partir d'une graine fixe : deux exécutions mesurent
+exactement les mêmes entrées.
+"""
+
+import json
+import random
+from xml.sax.saxutils import escape
+
+VOCABULARY = (
+    'guerre conflit diplomatie sanction alliance tension inflation croissance commerce dette '
+    'marché économie manifestation grève réforme social protestation climat pollution énergie '
+    'écologie carbone intelligence numérique cyber innovation tech succès accord paix coopération '
+    'progrès victoire crise échec problème gouvernement ministre frontière élection sommet '
+    'négociation ressources sécurité population région président accord international '
+    'le la les des une un et ou dans pour avec sur par entre selon depuis après avant'
+).split()
+
+
+def make_text(words, seed=0):
+    rng = random.Random(seed)
+    return ' '.join(rng.choice(VOCABULARY) for _ in range(words))
+
+
+def make_rss_feed(items, seed=0):
+    """Flux RSS 2.0 de `items` articles"""
+    rng = random.Random(seed)
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<rss version="2.0"><channel>',
+        '<title>GEOPOLIS Bench</title>',
+        '<link>http://bench.local/</link>',
+        '<description>Flux de test</description>'
+    ]
+    for i in range(items):
+        parts.append(
+            '<item>'
+            f'<title>{escape(make_text(8, seed=rng.random()))}</title>'
+            f'<link>http://bench.local/articles/{i}</link>'
+            f'<description>{escape(make_text(60, seed=rng.random()))}</description>'
+            f'<pubDate>Mon, 0{1 + i % 9} Jan 2024 12:00:00 GMT</pubDate>'
+            '</item>'
+        )
+    parts.append('</channel></rss>')
+    return '\n'.join(parts).encode('utf-8')
+
+
+# ============================================
+# RÉPONSES AMONT (forme des APIs réelles)
+# ============================================
+
+def celestrak_gp(count, prefix='SAT', seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            'OBJECT_NAME': f"{rng.choice(['STARLINK', 'GPS', 'COSMOS', 'ONEWEB', 'GALILEO', prefix])}-{i}",
+            'OBJECT_ID': f"2024-{i:03d}A",
+            'NORAD_CAT_ID': 40000 + i,
+            'MEAN_MOTION': round(rng.uniform(1.0, 16.0), 8),
+            'ECCENTRICITY': round(rng.uniform(0, 0.02), 7),
+            'INCLINATION': round(rng.uniform(0, 98), 4),
+            'EPOCH': '2024-01-01T00:00:00'
+        }
+        for i in range(count)
+    ]
+
+
+def donki_notifications(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            'messageType': rng.choice(['FLR', 'CME', 'GST', 'SEP', 'Report']),
+            'messageID': f"2024-01-01T00:00:00-{i}",
+            'messageIssueTime': '2024-01-01T00:00Z',
+            'messageBody': make_text(40, seed=i)
+        }
+        for i in range(count)
+    ]
+
+
+def iss_now():
+    return {
+        'message': 'success',
+        'timestamp': 1704067200,
+        'iss_position': {'latitude': '12.3456', 'longitude': '-45.6789'}
+    }
+
+
+def apod():
+    return {
+        'title': 'Nébuleuse de test',
+        'date': '2024-01-01',
+        'explanation': make_text(120),
+        'url': 'http://bench.local/apod.jpg',
+        'media_type': 'image',
+        'copyright': 'GEOPOLIS'
+    }
+
+
+def launches(count=10):
+    return {
+        'count': count,
+        'results': [
+            {
+                'name': f"Lanceur {i} | Mission {i}",
+                'launch_service_provider': {'name': 'Agence'},
+                'rocket': {'configuration': {'name': 'Fusée'}},
+                'pad': {'name': f"Pas {i}", 'location': {'name': 'Base'}},
+                'window_start': '2024-01-01T00:00:00Z',
+                'status': {'name': 'Go'}
+            }
+            for i in range(count)
+        ]
+    }
+
+
+def upstream_routes(satellites=500, debris=500, events=50):
+    """Table `/<hôte>/<chemin>` -> (statut, type, corps) des APIs utilisées par les plugins"""
+    def js(obj):
+        return (200, 'application/json', json.dumps(obj).encode('utf-8'))
+
+    return {
+        '/celestrak.org/NORAD/elements/gp.php?GROUP=active': js(celestrak_gp(satellites)),
+        '/celestrak.org/NORAD/elements/gp.php?GROUP=debris': js(celestrak_gp(debris, prefix='DEB', seed=1)),
+        '/api.nasa.gov/DONKI/notifications': js(donki_notifications(events)),
+        '/api.nasa.gov/planetary/apod': js(apod()),
+        '/api.open-notify.org/iss-now.json': js(iss_now()),
+        '/lldev.thespacedevs.com/2.2.0/launch/upcoming/': js(launches())
+    }
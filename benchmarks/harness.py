@@ -0,0 +1,113 @@
+"""
+Outils communs des benchmarks : mesure, résumé et comparaison à une référence
+
+Chaque cas est mesuré en deux passes :
+- chronométrage (`perf_counter`) sur `iterations` appels après `warmup` appels ;
+- un appel supplémentaire sous `tracemalloc` pour le pic mémoire
+  (séparé pour ne pas fausser les temps).
+"""
+
+import json
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+DEFAULT_BASELINE = RESULTS_DIR / 'baseline.json'
+
+# Écart relatif toléré avant de signaler une régression
+DEFAULT_TOLERANCE = 0.25
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(name, func, iterations=50, warmup=3, units=1):
+    """
+    Mesure `func()` ; `units` = éléments traités par appel (mots, articles,
+    requêtes) pour exprimer le débit en éléments/s
+    """
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    total = sum(timings)
+    return {
+        'name': name,
+        'iterations': iterations,
+        'throughput': round(iterations * units / total, 1) if total else 0.0,
+        'p50_ms': round(statistics.median(timings) * 1000, 3),
+        'p99_ms': round(percentile(timings, 99) * 1000, 3),
+        'peak_kib': round(peak / 1024, 1)
+    }
+
+
+# ============================================
+# RÉFÉRENCES
+# ============================================
+
+def load_baseline(path=DEFAULT_BASELINE):
+    path = Path(path)
+    if not path.exists():
+        return {}
+    return {r['name']: r for r in json.loads(path.read_text(encoding='utf-8'))['results']}
+
+
+def save_baseline(results, path=DEFAULT_BASELINE):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    document = {'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'results': results}
+    path.write_text(json.dumps(document, indent=2, ensure_ascii=False), encoding='utf-8')
+    return path
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Liste des régressions : (cas, métrique, référence, actuel, écart relatif)"""
+    regressions = []
+    for result in results:
+        reference = baseline.get(result['name'])
+        if reference is None:
+            continue
+        # Plus haut = pire pour les latences et la mémoire, plus bas = pire pour le débit
+        for metric, worse_if_higher in (('p50_ms', True), ('p99_ms', True), ('peak_kib', True), ('throughput', False)):
+            before, after = reference.get(metric), result.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            if (change > tolerance) if worse_if_higher else (change < -tolerance):
+                regressions.append((result['name'], metric, before, after, change))
+    return regressions
+
+
+def format_table(results, baseline=None):
+    baseline = baseline or {}
+    lines = [f"{'cas':<56} {'débit/s':>12} {'p50 ms':>10} {'p99 ms':>10} {'pic KiB':>10}  {'Δp50':>7}"]
+    for r in results:
+        reference = baseline.get(r['name'])
+        delta = ''
+        if reference and reference.get('p50_ms'):
+            delta = f"{(r['p50_ms'] - reference['p50_ms']) / reference['p50_ms']:+.0%}"
+        lines.append(
+            f"{r['name']:<56} {r['throughput']:>12,.1f} {r['p50_ms']:>10.3f} {r['p99_ms']:>10.3f} {r['peak_kib']:>10.1f}  {delta:>7}"
+        )
+    return '\n'.join(lines)
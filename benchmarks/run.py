@@ -0,0 +1,243 @@
+"""
+Benchmarks des chemins critiques (hors ligne)
+
+Suites :
+- analysis : `analyze_text_content` sur des corpus de 100 à 100 000 mots
+             (sans cache, plus une lecture du cache de résultats) ;
+- rss      : `parse_rss_feed` / `parse_rss_fallback` sur des flux locaux ;
+- plugins  : `run()` de chaque plugin, APIs amont servies par le simulateur local ;
+- flask    : débit de bout en bout via le client WSGI de Flask.
+
+    python -m benchmarks.run                       # toutes les suites
+    python -m benchmarks.run --suite analysis rss --quick
+    python -m benchmarks.run --save                # enregistre la référence
+    python -m benchmarks.run --compare             # code 1 si régression
+    python -m benchmarks.run --suite plugins --profile degraded
+
+Référence par défaut : benchmarks/results/baseline.json (propre à la machine).
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+from contextlib import contextmanager
+
+from .fixtures import make_rss_feed, make_text, upstream_routes
+from .harness import (
+    BASE_DIR, DEFAULT_BASELINE, DEFAULT_TOLERANCE,
+    compare, format_table, load_baseline, measure, save_baseline
+)
+
+from backend.modules.plugins.simulator import PROFILES, UpstreamSimulator
+
+CORPUS_SIZES = (100, 1000, 10000, 100000)
+FEED_SIZES = (20, 200, 2000)
+# Lot de la classification TF-IDF
+TFIDF_BATCH = 1000
+ARTICLE_WORDS = 200
+
+# Paramètres spécifiques par plugin (sinon payload vide)
+PLUGIN_PAYLOADS = {
+    'nasa-space-activity': [{'activity_type': 'iss'}, {'activity_type': 'apod'}, {'activity_type': 'launches'}]
+}
+
+
+def _iterations(base, quick):
+    return max(3, base // 10) if quick else base
+
+
+@contextmanager
+def redirect_upstreams(base_url):
+    """Envoie tous les appels amont des plugins vers le simulateur"""
+    from backend.modules.plugins.upstream import session
+
+    session.configure({'*': base_url})
+    try:
+        yield
+    finally:
+        session.configure(None)
+
+
+# ============================================
+# SUITES
+# ============================================
+
+def bench_analysis(ctx):
+    from backend.modules.analyse_thematique import classifier
+    from backend.modules.analyse_thematique.service import analyze_text_content, clear_analysis_cache
+
+    def analyze_uncached(text):
+        # Le même texte est analysé à chaque itération : sans vidage, on ne
+        # mesurerait que des lectures du cache de résultats
+        clear_analysis_cache()
+        return analyze_text_content(text)
+
+    results = []
+    for words in CORPUS_SIZES:
+        text = make_text(words)
+        iterations = _iterations(max(5, 200_000 // words), ctx['quick'])
+        results.append(measure(
+            f"analysis/analyze_text_content/{words}w",
+            lambda: analyze_uncached(text),
+            iterations=iterations,
+            units=words
+        ))
+
+    # Texte déjà analysé avec la même taxonomie : coût d'une lecture du cache
+    text = make_text(CORPUS_SIZES[-1])
+    clear_analysis_cache()
+    results.append(measure(
+        f"analysis/analyze_text_content[cache]/{CORPUS_SIZES[-1]}w",
+        lambda: analyze_text_content(text),
+        iterations=_iterations(200, ctx['quick']),
+        units=CORPUS_SIZES[-1]
+    ))
+
+    # Classification TF-IDF d'un lot d'articles (débit en articles/s)
+    articles = [make_text(ARTICLE_WORDS, seed=seed) for seed in range(TFIDF_BATCH)]
+    results.append(measure(
+        f"analysis/classify_texts[{classifier.BACKEND}]/{TFIDF_BATCH}x{ARTICLE_WORDS}w",
+        lambda: classifier.classify_texts(articles),
+        iterations=_iterations(20, ctx['quick']),
+        units=TFIDF_BATCH
+    ))
+    return results
+
+
+def bench_rss(ctx):
+    from backend.modules.analyse_thematique import service
+
+    try:
+        import feedparser  # noqa: F401
+        parsers = [('parse_rss_feed', service.parse_rss_feed), ('parse_rss_fallback', service.parse_rss_fallback)]
+    except ImportError:
+        # Sans feedparser, parse_rss_feed délègue au fallback : une seule mesure
+        parsers = [('parse_rss_fallback', service.parse_rss_fallback)]
+
+    server = ctx['server']
+    results = []
+    for items in FEED_SIZES:
+        server.add(f"/feeds/{items}.xml", make_rss_feed(items), content_type='application/rss+xml')
+        url = f"{server.url}/feeds/{items}.xml"
+        for name, parse in parsers:
+            results.append(measure(
+                f"rss/{name}/{items}items",
+                lambda: parse(url, limit=None),
+                iterations=_iterations(max(5, 4000 // items), ctx['quick']),
+                units=items
+            ))
+    return results
+
+
+def bench_plugins(ctx):
+    from backend.modules.plugins.manager import get_manager
+
+    manager = get_manager()
+    results = []
+    with redirect_upstreams(ctx['server'].url):
+        for entry in manager.list_plugins():
+            plugin_id = entry['id']
+            try:
+                plugin = manager.get_plugin(plugin_id)
+            except Exception as e:
+                print(f"[SKIP] {plugin_id}: {e}", file=sys.stderr)
+                continue
+            for payload in PLUGIN_PAYLOADS.get(plugin_id, [{}]):
+                suffix = '/' + '-'.join(str(v) for v in payload.values()) if payload else ''
+                results.append(measure(
+                    f"plugins/{plugin_id}{suffix}",
+                    lambda: plugin.run(dict(payload)),
+                    iterations=_iterations(30, ctx['quick'])
+                ))
+    return results
+
+
+def bench_flask(ctx):
+    from backend.core.app import create_app
+
+    app = create_app({'LOG_LEVEL': 'WARNING'})
+    client = app.test_client()
+    text = make_text(1000)
+    ctx['server'].add('/feeds/flask.xml', make_rss_feed(200), content_type='application/rss+xml')
+    feed_url = f"{ctx['server'].url}/feeds/flask.xml"
+
+    cases = [
+        ('flask/GET /api/health', lambda: client.get('/api/health')),
+        ('flask/POST /api/analyse/text (1000w)', lambda: client.post('/api/analyse/text', json={'text': text})),
+        ('flask/POST /api/analyse/rss (200 items)', lambda: client.post('/api/analyse/rss', json={'url': feed_url, 'limit': 200})),
+        ('flask/POST /api/plugins/space-activity/run (cache)',
+         lambda: client.post('/api/plugins/space-activity/run', json={})),
+        ('flask/POST /api/plugins/space-activity/run?refresh=1',
+         lambda: client.post('/api/plugins/space-activity/run?refresh=1', json={}))
+    ]
+
+    results = []
+    with redirect_upstreams(ctx['server'].url):
+        for name, call in cases:
+            results.append(measure(name, call, iterations=_iterations(200, ctx['quick'])))
+    return results
+
+
+SUITES = {
+    'analysis': bench_analysis,
+    'rss': bench_rss,
+    'plugins': bench_plugins,
+    'flask': bench_flask
+}
+
+
+# ============================================
+# POINT D'ENTRÉE
+# ============================================
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--suite', nargs='+', choices=sorted(SUITES), default=list(SUITES))
+    parser.add_argument('--quick', action='store_true', help='10x moins d\'itérations')
+    parser.add_argument('--save', action='store_true', help='enregistre les résultats comme référence')
+    parser.add_argument('--compare', action='store_true', help='échoue (code 1) en cas de régression')
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE))
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='fast',
+                        help='profil du simulateur amont (latence, erreurs, taille)')
+    parser.add_argument('--json', action='store_true', help='sortie JSON brute')
+    args = parser.parse_args()
+
+    # Les plugins et la config sont cherchés relativement à la racine du projet
+    os.chdir(BASE_DIR)
+    # Les journaux (fallback RSS, plugins) ne doivent ni polluer la sortie ni peser sur les mesures
+    logging.disable(logging.ERROR)
+
+    results = []
+    with UpstreamSimulator(upstream_routes(), profile=args.profile, seed=0) as server:
+        ctx = {'server': server, 'quick': args.quick}
+        for name in args.suite:
+            results.extend(SUITES[name](ctx))
+
+    baseline = load_baseline(args.baseline)
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+    else:
+        print(format_table(results, baseline))
+
+    if args.save:
+        path = save_baseline(results, args.baseline)
+        print(f"\nReference enregistree: {path}")
+
+    if args.compare:
+        if not baseline:
+            print(f"\nAucune reference ({args.baseline}) : lancer d'abord avec --save", file=sys.stderr)
+            return 2
+        regressions = compare(results, baseline, args.tolerance)
+        for name, metric, before, after, change in regressions:
+            print(f"[REGRESSION] {name} {metric}: {before} -> {after} ({change:+.0%})", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"\nAucune regression (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
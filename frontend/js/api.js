@@ -1,7 +1,95 @@
 // Client API centralisé
+// Cache des réponses GET : mémoire, et IndexedDB (persiste entre rechargements)
+// pour les seuls endpoints de PERSISTED ; /config, /health... restent en mémoire.
+// - Cache-Control: no-store -> jamais mis en cache ; max-age=N -> frais N secondes
+// - sinon l'entrée est servie immédiatement puis revalidée en arrière-plan
+//   (If-None-Match -> 304 si rien n'a changé), tant qu'elle a moins de staleTTL
+// - les GET identiques en cours sont partagés (une seule requête réseau)
+// Endpoints dont la réponse peut être écrite sur disque (liste explicite)
+const PERSISTED = ['/info', '/plugins/list'];
+
+class ResponseCache {
+    constructor(dbName = 'geopolis-api', maxEntries = 200) {
+        this.memory = new Map();
+        this.maxEntries = maxEntries;
+        this.db = this.openDB(dbName);
+    }
+    
+    openDB(dbName) {
+        if (!window.indexedDB) return Promise.resolve(null);
+        return new Promise(resolve => {
+            try {
+                // Version 2 : repart d'un magasin vide (la v1 persistait tous les GET)
+                const request = indexedDB.open(dbName, 2);
+                request.onupgradeneeded = () => {
+                    const db = request.result;
+                    if (db.objectStoreNames.contains('responses')) db.deleteObjectStore('responses');
+                    db.createObjectStore('responses');
+                };
+                request.onsuccess = () => resolve(request.result);
+                request.onerror = () => resolve(null);
+            } catch (e) {
+                resolve(null);
+            }
+        });
+    }
+    
+    async store(mode) {
+        const db = await this.db;
+        return db ? db.transaction('responses', mode).objectStore('responses') : null;
+    }
+    
+    async get(key) {
+        if (this.memory.has(key)) return this.memory.get(key);
+        const store = await this.store('readonly');
+        if (!store) return null;
+        return new Promise(resolve => {
+            const request = store.get(key);
+            request.onsuccess = () => {
+                if (request.result) this.remember(key, request.result);
+                resolve(request.result || null);
+            };
+            request.onerror = () => resolve(null);
+        });
+    }
+    
+    remember(key, entry) {
+        this.memory.delete(key);
+        this.memory.set(key, entry);
+        if (this.memory.size > this.maxEntries) {
+            this.memory.delete(this.memory.keys().next().value);
+        }
+    }
+    
+    async set(key, entry, persist = false) {
+        this.remember(key, entry);
+        if (!persist) return;
+        const store = await this.store('readwrite');
+        if (store) store.put(entry, key);
+    }
+    
+    async delete(prefix) {
+        for (const key of [...this.memory.keys()]) {
+            if (key.startsWith(prefix)) this.memory.delete(key);
+        }
+        const store = await this.store('readwrite');
+        if (!store) return;
+        const request = store.openCursor();
+        request.onsuccess = () => {
+            const cursor = request.result;
+            if (!cursor) return;
+            if (String(cursor.key).startsWith(prefix)) cursor.delete();
+            cursor.continue();
+        };
+    }
+}
+
 class API {
-    constructor(baseURL = '/api') {
+    constructor(baseURL = '/api', staleTTL = 5 * 60 * 1000) {
         this.baseURL = baseURL;
+        this.staleTTL = staleTTL;
+        this.cache = new ResponseCache();
+        this.inflight = new Map();
     }
     
     async request(endpoint, options = {}) {
@@ -29,9 +117,85 @@ class API {
         }
     }
     
-    // GET
-    get(endpoint) {
-        return this.request(endpoint, { method: 'GET' });
+    // Durée de fraîcheur annoncée par le serveur (null = ne pas stocker)
+    freshness(response) {
+        const header = response.headers.get('Cache-Control') || '';
+        if (header.includes('no-store')) return null;
+        const maxAge = header.match(/max-age=(\d+)/);
+        return maxAge && !header.includes('no-cache') ? parseInt(maxAge[1], 10) * 1000 : 0;
+    }
+    
+    // Réponse de `endpoint` autorisée sur disque (chemin exact, sans la query)
+    persists(endpoint) {
+        return PERSISTED.includes(endpoint.split('?')[0]);
+    }
+    
+    // GET réseau (conditionnel si une version est en cache), partagé entre appelants
+    fetchAndStore(endpoint, cached) {
+        const url = `${this.baseURL}${endpoint}`;
+        if (this.inflight.has(url)) return this.inflight.get(url);
+        
+        const headers = { 'Accept': 'application/json' };
+        if (cached && cached.etag) headers['If-None-Match'] = cached.etag;
+        
+        const promise = fetch(url, { method: 'GET', headers })
+            .then(async response => {
+                const freshFor = this.freshness(response);
+                const persist = freshFor !== null && this.persists(endpoint);
+                const now = Date.now();
+                if (response.status === 304 && cached) {
+                    const entry = { ...cached, stored: now, expires: now + (freshFor || 0) };
+                    if (freshFor !== null) await this.cache.set(url, entry, persist);
+                    return entry.data;
+                }
+                const data = await response.json();
+                if (!response.ok) {
+                    throw new Error(data.error || `HTTP ${response.status}`);
+                }
+                if (freshFor !== null) {
+                    await this.cache.set(url, {
+                        data,
+                        etag: response.headers.get('ETag'),
+                        stored: now,
+                        expires: now + freshFor
+                    }, persist);
+                } else {
+                    // no-store : l'éventuelle version précédente est oubliée aussi
+                    await this.cache.delete(url);
+                }
+                return data;
+            })
+            .catch(error => {
+                console.error(`API Error [${endpoint}]:`, error);
+                throw error;
+            })
+            .finally(() => this.inflight.delete(url));
+        
+        this.inflight.set(url, promise);
+        return promise;
+    }
+    
+    // GET avec cache ; { fresh: true } impose une réponse revalidée
+    async get(endpoint, { fresh = false } = {}) {
+        const url = `${this.baseURL}${endpoint}`;
+        if (this.inflight.has(url)) return this.inflight.get(url);
+        
+        const cached = await this.cache.get(url);
+        const now = Date.now();
+        if (cached && now < cached.expires) {
+            return cached.data;
+        }
+        if (cached && !fresh && now - cached.stored < this.staleTTL) {
+            // Réponse immédiate, revalidation en arrière-plan
+            this.fetchAndStore(endpoint, cached).catch(() => {});
+            return cached.data;
+        }
+        return this.fetchAndStore(endpoint, cached);
+    }
+    
+    // Oublie les réponses en cache dont l'URL commence par `endpoint`
+    invalidate(endpoint = '') {
+        return this.cache.delete(`${this.baseURL}${endpoint}`);
     }
     
     // POST
@@ -44,7 +208,7 @@ class API {
     
     // Endpoints spécifiques
     health() {
-        return this.get('/health');
+        return this.get('/health', { fresh: true });
     }
     
     info() {
@@ -65,6 +229,19 @@ class API {
         return this.post('/tuteur/analyze', { code, provider });
     }
     
+    // Exécution côté serveur : jeton éventuel (SANDBOX_TOKEN) lu dans sessionStorage
+    runCode(code, stdin = '') {
+        const token = sessionStorage.getItem('geopolis.sandboxToken');
+        return this.request('/tuteur/run', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                ...(token ? { 'X-Geopolis-Sandbox-Token': token } : {})
+            },
+            body: JSON.stringify({ code, stdin })
+        });
+    }
+    
     // Plugins
     listPlugins() {
         return this.get('/plugins/list');
@@ -29,9 +29,8 @@ class App {
             this.navigateTo(hash);
         });
         
-        // Status check
-        this.checkStatus();
-        setInterval(() => this.checkStatus(), 30000);
+        // Status : poussé par le serveur (SSE), interrogation en repli
+        this.connectEvents();
         
         // Load initial view
         const initialView = window.location.hash.substring(1) || 'dashboard';
@@ -63,14 +62,83 @@ class App {
         window.location.hash = viewName;
     }
     
+    connectEvents() {
+        if (!window.EventSource) {
+            this.checkStatus();
+            setInterval(() => this.checkStatus(), 30000);
+            return;
+        }
+        
+        // Reconnexion automatique du navigateur, avec rejeu via Last-Event-ID
+        const resume = this.lastEventId ? `?last_id=${this.lastEventId}` : '';
+        const source = new EventSource(`/api/events${resume}`);
+        for (const type of ['health', 'plugin', 'articles']) {
+            source.addEventListener(type, (e) => {
+                this.lastEventId = e.lastEventId ? parseInt(e.lastEventId, 10) : this.lastEventId;
+                this.handleEvent(type, JSON.parse(e.data));
+            });
+        }
+        source.onerror = () => {
+            if (source.readyState === EventSource.CLOSED) {
+                // Flux refusé (503 : plafond du serveur atteint) : interrogation périodique
+                this.events = null;
+                this.pollEvents(this.lastEventId ?? null);
+            } else {
+                this.showStatus(null);
+            }
+        };
+        this.events = source;
+    }
+    
+    async pollEvents(lastId) {
+        let delay = 15000;
+        try {
+            const query = lastId === null ? '' : `?last_id=${lastId}`;
+            const data = await api.request(`/events/poll${query}`, { cache: 'no-store' });
+            this.showStatus(data.health);
+            data.events.forEach(event => this.handleEvent(event.type, event.data));
+            this.lastEventId = lastId = data.last_id;
+            delay = data.interval_ms || delay;
+            if (data.stream_available) {
+                // Place libérée : retour au flux, qui rejoue depuis lastEventId
+                return this.connectEvents();
+            }
+        } catch (error) {
+            this.showStatus(null);
+        }
+        setTimeout(() => this.pollEvents(lastId), delay);
+    }
+    
+    handleEvent(type, data) {
+        if (type === 'health') {
+            this.showStatus(data);
+            return;
+        }
+        if (type === 'plugin') api.invalidate('/plugins');
+        this.emit(type, data);
+    }
+    
+    emit(type, detail) {
+        // Les vues écoutent window 'geopolis:<type>'
+        window.dispatchEvent(new CustomEvent(`geopolis:${type}`, { detail }));
+    }
+    
+    showStatus(data) {
+        const status = document.getElementById('status');
+        if (!data) {
+            status.innerHTML = `<div style="color: #ff6b6b;">✗ Déconnecté</div>`;
+        } else if (data.status === 'degraded') {
+            status.innerHTML = `<div style="color: #ffd166;">⚠ Dégradé v${data.version}</div>`;
+        } else {
+            status.innerHTML = `<div style="color: rgba(255,255,255,0.9);">✓ Connecté v${data.version}</div>`;
+        }
+    }
+    
     async checkStatus() {
         try {
-            const data = await api.health();
-            document.getElementById('status').innerHTML = 
-                `<div style="color: rgba(255,255,255,0.9);">✓ Connecté v${data.version}</div>`;
+            this.showStatus(await api.health());
         } catch (error) {
-            document.getElementById('status').innerHTML = 
-                `<div style="color: #ff6b6b;">✗ Déconnecté</div>`;
+            this.showStatus(null);
         }
     }
 }
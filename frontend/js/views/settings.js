@@ -74,6 +74,7 @@ class SettingsView {
         
         try {
             await api.post('/config', config);
+            api.invalidate('/config');
             resultDiv.innerHTML = '<div class="alert alert-success">✓ Configuration sauvegardée</div>';
             
             // Effacer les champs de clés
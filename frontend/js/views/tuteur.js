@@ -15,6 +15,7 @@ class TuteurView {
                 </select>
                 
                 <button class="btn" onclick="this.analyzeCode()">🔍 Analyser le code</button>
+                <button class="btn" onclick="window.runCode()">▶ Exécuter</button>
                 
                 <div id="codeResult"></div>
             </div>
@@ -23,6 +24,35 @@ class TuteurView {
     
     mount() {
         window.analyzeCode = () => this.handleAnalyzeCode();
+        window.runCode = () => this.handleRunCode();
+    }
+    
+    async handleRunCode() {
+        const code = document.getElementById('codeInput').value;
+        const resultDiv = document.getElementById('codeResult');
+        
+        if (!code.trim()) {
+            resultDiv.innerHTML = '<div class="alert alert-warning">Veuillez entrer du code</div>';
+            return;
+        }
+        
+        resultDiv.innerHTML = '<div class="loading"><div class="spinner"></div>Exécution en cours...</div>';
+        
+        try {
+            const data = await api.runCode(code);
+            let html = data.ok
+                ? `<div class="alert alert-success">✓ Exécuté en ${(data.duration * 1000).toFixed(0)} ms</div>`
+                : `<div class="alert alert-error">❌ ${this.escape(data.error || 'Échec')}</div>`;
+            if (data.stdout) {
+                html += `<h3 style="margin-top: 20px;">Sortie :</h3><pre class="result-box">${this.escape(data.stdout)}</pre>`;
+            }
+            if (data.stderr) {
+                html += `<h3 style="margin-top: 20px;">Erreurs :</h3><pre class="result-box">${this.escape(data.stderr)}</pre>`;
+            }
+            resultDiv.innerHTML = html;
+        } catch (e) {
+            resultDiv.innerHTML = `<div class="alert alert-error">❌ Erreur: ${e.message}</div>`;
+        }
     }
     
     async handleAnalyzeCode() {
@@ -43,13 +73,30 @@ class TuteurView {
             let html = `<div class="alert alert-success">✓ Analyse terminée (Backend: ${data.backend})</div>`;
             
             if (data.analysis) {
-                html += `<div class="result-box">${data.analysis}</div>`;
+                html += `<div class="result-box">${this.escape(data.analysis)}</div>`;
+            }
+            
+            if (data.issues && data.issues.length) {
+                const icons = { error: '❌', warning: '⚠️', info: 'ℹ️' };
+                html += `
+                    <h3 style="margin-top: 20px;">Problèmes :</h3>
+                    <div class="result-box">${data.issues.map(issue =>
+                        `${icons[issue.severity] || ''} Ligne ${issue.line} : ${this.escape(issue.message)}`
+                    ).join('<br>')}</div>
+                `;
+            }
+            
+            if (data.suggestions && data.suggestions.length) {
+                html += `
+                    <h3 style="margin-top: 20px;">Suggestions :</h3>
+                    <div class="result-box">${data.suggestions.map(s => '• ' + this.escape(s)).join('<br>')}</div>
+                `;
             }
             
             if (data.fixed_code) {
                 html += `
                     <h3 style="margin-top: 20px;">Code corrigé :</h3>
-                    <div class="result-box">${data.fixed_code}</div>
+                    <pre class="result-box">${this.escape(data.fixed_code)}</pre>
                 `;
             }
             
@@ -58,4 +105,10 @@ class TuteurView {
             resultDiv.innerHTML = `<div class="alert alert-error">❌ Erreur: ${e.message}</div>`;
         }
     }
+    
+    escape(text) {
+        const div = document.createElement('div');
+        div.textContent = text;
+        return div.innerHTML;
+    }
 }
@@ -0,0 +1,47 @@
+"""
+Configuration gunicorn pour GEOPOLIS
+
+    gunicorn -c gunicorn.conf.py wsgi:application
+
+Toutes les valeurs sont surchargeables par variables d'environnement.
+"""
+
+import multiprocessing
+import os
+
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', '5000')}"
+
+# Un worker par cœur (x2 + 1, recommandation gunicorn) ; WEB_CONCURRENCY prioritaire
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+
+# Threads par worker : les plugins passent l'essentiel de leur temps en attente réseau.
+# Chaque client de /api/events garde un thread : au plus EVENTS_MAX_STREAMS flux par
+# worker (par défaut THREADS / 2), les suivants passent en interrogation
+# (/api/events/poll). Pour des centaines d'onglets : worker asynchrone
+# (GUNICORN_WORKER_CLASS=gevent, paquet gevent de requirements.txt). Les événements
+# passent par db/events.sqlite : tous les workers les voient.
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('THREADS', 4))
+
+timeout = int(os.environ.get('WORKER_TIMEOUT', 60))
+graceful_timeout = 30
+keepalive = 5
+
+# Recyclage périodique des workers (fuites mémoire des dépendances)
+max_requests = int(os.environ.get('MAX_REQUESTS', 2000))
+max_requests_jitter = 200
+
+# Application chargée une fois dans le maître puis partagée par fork ;
+# l'état par processus est réinitialisé par backend.core.runtime
+preload_app = os.environ.get('PRELOAD_APP', 'True').lower() == 'true'
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('LOG_LEVEL', 'info').lower()
+
+
+def on_starting(server):
+    """Bundles du frontend construits une fois, dans le maître, avant les workers"""
+    from pathlib import Path
+    from backend.core.assets import ensure_assets
+    ensure_assets(Path(__file__).resolve().parent / 'frontend')
@@ -99,8 +99,8 @@ print("[3/7] Génération du frontend SPA...")
 
 try:
     from backend.core.frontend_generator import generate_frontend
-    generate_frontend()
-    print("  [OK] Frontend généré")
+    manifest = generate_frontend()
+    print(f"  [OK] Frontend généré ({len(manifest['changed'])} fichier(s) modifié(s))")
 except Exception as e:
     print(f"  [!] Erreur: {e}")
     print("  [INFO] Le frontend sera généré au premier démarrage")
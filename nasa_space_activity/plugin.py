@@ -9,6 +9,12 @@ import requests
 from datetime import datetime
 import json
 
+try:
+    # Couche HTTP instrumentée de GEOPOLIS (absente en mode standalone)
+    from backend.modules.plugins.upstream import session as http
+except ImportError:
+    http = requests
+
 class Plugin:
     """Plugin NASA Space Activity pour GEOPOLIS"""
     
@@ -48,7 +54,7 @@ class Plugin:
     def _get_iss_position(self):
         """Recupere la position actuelle de l'ISS"""
         try:
-            response = requests.get(self.base_urls['iss'], timeout=10)
+            response = http.get(self.base_urls['iss'], timeout=10)
             response.raise_for_status()
             data = response.json()
             
@@ -80,7 +86,7 @@ class Plugin:
             api_key = self.settings.get('api_keys', {}).get('nasa', 'DEMO_KEY')
             params = {'api_key': api_key}
             
-            response = requests.get(self.base_urls['apod'], params=params, timeout=15)
+            response = http.get(self.base_urls['apod'], params=params, timeout=15)
             response.raise_for_status()
             data = response.json()
             
@@ -114,7 +120,7 @@ class Plugin:
     def _get_upcoming_launches(self):
         """Recupere les prochains lancements spatiaux"""
         try:
-            response = requests.get(self.base_urls['launches'], timeout=15)
+            response = http.get(self.base_urls['launches'], timeout=15)
             response.raise_for_status()
             data = response.json()
             
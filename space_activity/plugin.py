@@ -6,13 +6,62 @@ APIs: CelesTrak (gratuit), Space-Track (gratuit), NASA APIs (gratuit)
 """
 
 import requests
+import codecs
 import json
 import logging
 from datetime import datetime, timedelta
+from itertools import islice
 import math
 
+try:
+    # Couche HTTP instrumentée de GEOPOLIS (absente en mode standalone)
+    from backend.modules.plugins.upstream import session as http
+except ImportError:
+    http = requests
+
 logger = logging.getLogger(__name__)
 
+# Objets renvoyés dans `data`
+DATA_LIMIT = 30
+# Objets lus dans les catalogues CelesTrak (plusieurs Mo : lus au fil de l'eau)
+SATELLITE_LIMIT = 20
+DEBRIS_LIMIT = 15
+
+
+def iter_json_array(response, chunk_size=65536):
+    """
+    Éléments d'un tableau JSON lus au fil de la réponse (`stream=True`) :
+    s'arrêter tôt évite de télécharger et de décoder le reste du corps
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    started = False
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        buffer += utf8.decode(chunk)
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos == len(buffer):
+                break
+            if not started:
+                if buffer[pos] != '[':
+                    raise ValueError("Tableau JSON attendu")
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == ']':
+                return
+            try:
+                item, pos = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                # Élément incomplet : attendre la suite
+                break
+            yield item
+        buffer = buffer[pos:]
+    raise ValueError("Tableau JSON tronqué")
+
 class Plugin:
     """Suivi activité spatiale avec données RÉELLES"""
     
@@ -48,26 +97,10 @@ class Plugin:
             # Fusion et analyse
             data = self._merge_and_analyze(satellites_data, debris_data, events_data, iss_data)
             
-            metrics = {
-                'satellites_actifs': len(satellites_data),
-                'debris_recenses': len(debris_data),
-                'phenomenes_actifs': len(events_data),
-                'risque_collision': self._calculate_collision_risk(debris_data),
-                'iss_altitude': iss_data.get('altitude', 0),
-                'derniere_maj': datetime.now().isoformat(),
-                'sources_reelles': ['CelesTrak', 'NASA', 'Space-Track']
-            }
-            
-            return {
-                'status': 'success',
-                'plugin': self.name,
-                'timestamp': datetime.now().isoformat(),
-                'data': data[:30],  # Top 30
-                'metrics': metrics,
-                'carte_config': self._generate_map_config(satellites_data, debris_data, iss_data),
-                'alertes': self._generate_alerts(events_data, debris_data),
-                'message': f'Surveillance de {len(satellites_data)} satellites et {len(debris_data)} débris'
-            }
+            return dict(
+                self._envelope(satellites_data, debris_data, events_data, iss_data),
+                data=data[:DATA_LIMIT]
+            )
             
         except Exception as e:
             logger.error(f"Erreur space-activity: {e}")
@@ -77,20 +110,69 @@ class Plugin:
                 'message': f'Erreur: {str(e)}'
             }
     
+    def iter_data(self, payload=None):
+        """
+        Mêmes lignes que `data` de `run`, produites au fil des sources : les
+        satellites partent avant l'interrogation des débris ; le reste de
+        l'enveloppe (métriques, carte, alertes) est retourné à la fin
+        """
+        count = 0
+        
+        satellites_data = self._fetch_active_satellites()
+        for sat in satellites_data:
+            if count >= DATA_LIMIT:
+                break
+            yield self._satellite_row(sat)
+            count += 1
+        
+        debris_data = self._fetch_space_debris()
+        for deb in debris_data:
+            if count >= DATA_LIMIT:
+                break
+            yield self._debris_row(deb)
+            count += 1
+        
+        events_data = self._fetch_space_events()
+        iss_data = self._fetch_iss_position()
+        if count < DATA_LIMIT:
+            yield self._iss_row(iss_data)
+        
+        return self._envelope(satellites_data, debris_data, events_data, iss_data)
+    
+    def _envelope(self, satellites_data, debris_data, events_data, iss_data):
+        """Résultat hors `data` : métriques, carte et alertes"""
+        metrics = {
+            'satellites_actifs': len(satellites_data),
+            'debris_recenses': len(debris_data),
+            'phenomenes_actifs': len(events_data),
+            'risque_collision': self._calculate_collision_risk(debris_data),
+            'iss_altitude': iss_data.get('altitude', 0),
+            'derniere_maj': datetime.now().isoformat(),
+            'sources_reelles': ['CelesTrak', 'NASA', 'Space-Track']
+        }
+        
+        return {
+            'status': 'success',
+            'plugin': self.name,
+            'timestamp': datetime.now().isoformat(),
+            'metrics': metrics,
+            'carte_config': self._generate_map_config(satellites_data, debris_data, iss_data),
+            'alertes': self._generate_alerts(events_data, debris_data),
+            'message': f'Surveillance de {len(satellites_data)} satellites et {len(debris_data)} débris'
+        }
+    
     def _fetch_active_satellites(self):
         """Récupère satellites actifs via CelesTrak"""
         try:
             # CelesTrak - données TLE gratuites
             url = f"{self.celestrak_base}/gp.php?GROUP=active&FORMAT=json"
             
-            response = requests.get(url, timeout=15)
-            
-            if response.status_code == 200:
-                data = response.json()
-                return self._process_satellite_data(data)
-            else:
-                logger.warning(f"CelesTrak error: {response.status_code}")
-                return self._get_satellites_fallback()
+            with http.get(url, timeout=15, stream=True) as response:
+                if response.status_code == 200:
+                    return self._process_satellite_data(islice(iter_json_array(response), SATELLITE_LIMIT))
+                else:
+                    logger.warning(f"CelesTrak error: {response.status_code}")
+                    return self._get_satellites_fallback()
                 
         except Exception as e:
             logger.error(f"Satellites error: {e}")
@@ -103,13 +185,11 @@ class Plugin:
             # Fallback vers CelesTrak debris
             url = f"{self.celestrak_base}/gp.php?GROUP=debris&FORMAT=json"
             
-            response = requests.get(url, timeout=15)
-            
-            if response.status_code == 200:
-                data = response.json()
-                return self._process_debris_data(data)
-            else:
-                return self._get_debris_fallback()
+            with http.get(url, timeout=15, stream=True) as response:
+                if response.status_code == 200:
+                    return self._process_debris_data(islice(iter_json_array(response), DEBRIS_LIMIT))
+                else:
+                    return self._get_debris_fallback()
                 
         except Exception as e:
             logger.warning(f"Debris error: {e}")
@@ -126,7 +206,7 @@ class Plugin:
                 'endDate': datetime.now().strftime('%Y-%m-%d')
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = http.get(url, params=params, timeout=10)
             
             if response.status_code == 200:
                 data = response.json()
@@ -144,7 +224,7 @@ class Plugin:
             # ISS current location
             url = "http://api.open-notify.org/iss-now.json"
             
-            response = requests.get(url, timeout=5)
+            response = http.get(url, timeout=5)
             
             if response.status_code == 200:
                 data = response.json()
@@ -167,7 +247,7 @@ class Plugin:
         """Traite données satellites"""
         processed = []
         
-        for sat in raw_data[:20]:  # Limité pour performance
+        for sat in islice(raw_data, SATELLITE_LIMIT):  # Limité pour performance
             processed.append({
                 'nom': sat.get('OBJECT_NAME', 'Satellite Inconnu'),
                 'id': sat.get('OBJECT_ID', ''),
@@ -188,7 +268,7 @@ class Plugin:
         """Traite données débris"""
         processed = []
         
-        for debris in raw_data[:15]:  # Limité
+        for debris in islice(raw_data, DEBRIS_LIMIT):  # Limité
             processed.append({
                 'id': debris.get('OBJECT_ID', ''),
                 'type': 'Débris',
@@ -220,35 +300,36 @@ class Plugin:
     
     def _merge_and_analyze(self, satellites, debris, events, iss):
         """Fusion et analyse données spatiales"""
-        merged = []
-        
-        # Satellites
-        for sat in satellites:
-            merged.append({
-                'type_objet': 'satellite',
-                'nom': sat['nom'],
-                'categorie': sat['type'],
-                'orbite': sat['orbite'],
-                'altitude_km': sat['altitude'],
-                'etat': sat['etat'],
-                'pays': sat['pays'],
-                'risque': 'Faible'
-            })
-        
-        # Débris
-        for deb in debris:
-            merged.append({
-                'type_objet': 'debris',
-                'nom': f"Débris {deb['id']}",
-                'categorie': 'Débris orbital',
-                'orbite': deb['orbite'],
-                'altitude_km': deb['altitude'],
-                'taille': deb['taille_estimee'],
-                'risque': deb['risque']
-            })
-        
-        # ISS
-        merged.append({
+        merged = [self._satellite_row(sat) for sat in satellites]
+        merged.extend(self._debris_row(deb) for deb in debris)
+        merged.append(self._iss_row(iss))
+        return merged
+    
+    def _satellite_row(self, sat):
+        return {
+            'type_objet': 'satellite',
+            'nom': sat['nom'],
+            'categorie': sat['type'],
+            'orbite': sat['orbite'],
+            'altitude_km': sat['altitude'],
+            'etat': sat['etat'],
+            'pays': sat['pays'],
+            'risque': 'Faible'
+        }
+    
+    def _debris_row(self, deb):
+        return {
+            'type_objet': 'debris',
+            'nom': f"Débris {deb['id']}",
+            'categorie': 'Débris orbital',
+            'orbite': deb['orbite'],
+            'altitude_km': deb['altitude'],
+            'taille': deb['taille_estimee'],
+            'risque': deb['risque']
+        }
+    
+    def _iss_row(self, iss):
+        return {
             'type_objet': 'station',
             'nom': 'ISS - Station Spatiale Internationale',
             'categorie': 'Station habitée',
@@ -260,9 +341,7 @@ class Plugin:
             },
             'etat': 'Occupée',
             'risque': 'Surveillance'
-        })
-        
-        return merged
+        }
     
     def _calculate_collision_risk(self, debris_data):
         """Calcule risque collision global"""
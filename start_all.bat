@@ -3,7 +3,7 @@ echo === GEOPOLIS startup script (Windows) ===
 if not exist data\logs mkdir data\logs
 
 echo [1/3] Starting Flask backend...
-start "Flask Backend" cmd /c "python backend\core\app.py > data\logs\flask.log 2>&1"
+start "Flask Backend" cmd /c "python wsgi.py > data\logs\flask.log 2>&1"
 
 echo [2/3] Waiting for Flask to respond...
 setlocal enabledelayedexpansion
@@ -3,7 +3,12 @@ echo "=== GEOPOLIS startup script (Linux/Render) ==="
 mkdir -p data/logs
 
 echo "[1/3] Starting Flask backend..."
-nohup python3 backend/core/app.py > data/logs/flask.log 2>&1 &
+if command -v gunicorn > /dev/null; then
+    nohup gunicorn -c gunicorn.conf.py wsgi:application > data/logs/flask.log 2>&1 &
+else
+    echo "gunicorn not found, falling back to the development server"
+    nohup python3 app.py > data/logs/flask.log 2>&1 &
+fi
 FLASK_PID=$!
 echo "Flask PID: $FLASK_PID"
 
@@ -0,0 +1,49 @@
+"""
+Rotation des logs : taille et échéance dans le même intervalle
+"""
+
+import logging
+
+from backend.core.logs import SizedTimedRotatingFileHandler
+
+
+def _record(i):
+    return logging.makeLogRecord({'msg': f"record {i:03d} " + 'x' * 40})
+
+
+def _handler(path, backup_count):
+    handler = SizedTimedRotatingFileHandler(
+        path, max_bytes=200, when='midnight', backupCount=backup_count,
+        encoding='utf-8', delay=True
+    )
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    return handler
+
+
+def test_size_rollovers_keep_every_record(tmp_path):
+    handler = _handler(tmp_path / 'g.log', backup_count=10)
+    # 3 enregistrements de 52 octets par fichier de 200 : 3 rotations par taille
+    for i in range(12):
+        handler.emit(_record(i))
+    handler.close()
+
+    files = sorted(tmp_path.iterdir())
+    backups = [path.name for path in files if path.name != 'g.log']
+    assert len(backups) == 3
+    assert all(name.startswith('g.log.') and name.rsplit('.', 1)[1].isdigit() for name in backups)
+
+    text = ''.join(path.read_text(encoding='utf-8') for path in files)
+    assert all(f"record {i:03d}" in text for i in range(12))
+    assert all(path.stat().st_size <= 200 for path in files)
+
+
+def test_size_rollovers_prune_oldest_backups(tmp_path):
+    handler = _handler(tmp_path / 'g.log', backup_count=2)
+    for i in range(12):
+        handler.emit(_record(i))
+    handler.close()
+
+    kept = sorted(path.name for path in tmp_path.iterdir() if path.name != 'g.log')
+    assert [name.rsplit('.', 1)[1] for name in kept] == ['2', '3']
+    assert "record 006" in (tmp_path / kept[-1]).read_text(encoding='utf-8')
+    assert "record 011" in (tmp_path / 'g.log').read_text(encoding='utf-8')
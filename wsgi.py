@@ -0,0 +1,30 @@
+"""
+GEOPOLIS - Point d'entrée production (WSGI)
+
+    gunicorn -c gunicorn.conf.py wsgi:application     (Linux, multi-workers)
+    waitress-serve --threads=8 wsgi:application       (Windows)
+    python wsgi.py                                    (waitress si installé)
+"""
+
+import os
+
+from backend.core.app import create_app
+
+application = create_app()
+
+if __name__ == '__main__':
+    host = os.environ.get('HOST', '0.0.0.0')
+    port = int(os.environ.get('PORT', 5000))
+    threads = int(os.environ.get('THREADS', 8))
+
+    # Processus unique : les bundles sont construits ici, une fois
+    from backend.core.assets import ensure_assets
+    ensure_assets(application.static_folder)
+
+    try:
+        from waitress import serve
+    except ImportError:
+        print("[!] waitress non installe - serveur de developpement Flask (pip install waitress)")
+        application.run(host=host, port=port, debug=False, threaded=True, use_reloader=False)
+    else:
+        serve(application, host=host, port=port, threads=threads)